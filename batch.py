@@ -0,0 +1,98 @@
+import argparse
+import hashlib
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+from i8080 import I8080Chip
+from machine import FILE_PATH, FPS, load_rom, run_frames
+from memory_map import invaders_memory
+
+# inputs are (frame, port1) pairs, state is a save_state() blob to start
+# from instead of power-on, mapped runs on the memory map
+Scenario = namedtuple(
+    'Scenario', 'name rom frames inputs state engine mapped',
+    defaults=(FILE_PATH, 60, (), None, 'blocks', False))
+
+VIDEO_START = 0x2400
+VIDEO_END = 0x4000
+
+
+@lru_cache(maxsize=None)
+def _rom_image(path):
+    # Loaded once per worker process
+    return bytes(load_rom(path))
+
+
+def run_scenario(scenario):
+    # Runs in a worker. The result carries the raw 1bpp video RAM rather
+    # than the converted frame to keep it small to pickle.
+    if scenario.mapped:
+        chip = I8080Chip(invaders_memory(scenario.rom))
+    else:
+        chip = I8080Chip(bytearray(_rom_image(scenario.rom)))
+    if scenario.state is not None:
+        chip.load_state(scenario.state)
+    start = time.perf_counter()
+    cycles = run_frames(chip, scenario.frames, scenario.inputs,
+                        scenario.engine)
+    seconds = time.perf_counter() - start
+    return {
+        'name': scenario.name,
+        'frames': scenario.frames,
+        'cycles': cycles,
+        'instructions': chip.count,
+        'seconds': seconds,
+        'pc': chip.pc,
+        'ram_md5': hashlib.md5(chip.ram).hexdigest(),
+        'video_ram': bytes(chip.ram[VIDEO_START:VIDEO_END]),
+    }
+
+
+def run_batch(scenarios, workers=None):
+    # Yields the results as the sessions finish, not in submission order
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_scenario, scenario)
+                   for scenario in scenarios]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run attract mode sessions across a process pool, '
+                    'session n inserts a coin at frame n')
+    parser.add_argument('sessions', type=int, nargs='?',
+                        default=os.cpu_count())
+    parser.add_argument('--seconds', type=float, default=60,
+                        help='emulated seconds per session')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--rom', default=FILE_PATH)
+    parser.add_argument('--mapped', action='store_true',
+                        help='use the memory map with ROM protection and '
+                             'RAM mirrors')
+    args = parser.parse_args()
+
+    frames = int(args.seconds * FPS)
+    idle = 8  # port1 bit 3 always reads 1
+    coin = idle | I8080Chip.COIN_KEY
+    scenarios = [
+        Scenario(f'session {n}', args.rom, frames,
+                 ((n, coin), (n + 5, idle)), mapped=args.mapped)
+        for n in range(args.sessions)
+    ]
+    start = time.perf_counter()
+    total = 0
+    for result in run_batch(scenarios, args.workers):
+        total += result['frames']
+        print(f"{result['name']:<12} {result['seconds']:6.2f}s "
+              f"{result['ram_md5']}")
+    elapsed = time.perf_counter() - start
+    print(f'{args.sessions} sessions in {elapsed:.2f}s, '
+          f'{total / FPS / elapsed:.1f}x real time overall')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from machine import CYCLE_PER_SEC, ENGINES, FILE_PATH, FPS, create_chip, \
+    run_frame
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * p / 100))
+    return ordered[index]
+
+
+def git_commit():
+    try:
+        out = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def bench(seconds, engine='blocks', convert=False, path=FILE_PATH, warmup=0,
+          mapped=False):
+    chip = create_chip(path, mapped=mapped)
+    for _ in range(warmup):
+        run_frame(chip, engine)
+        if convert:
+            chip.convert()
+
+    # A fixed number of emulated frames, so runs on the same commit do the
+    # same work however fast the host is
+    frames = max(1, round(seconds * FPS))
+    count = chip.count
+    cycles = 0
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame_start = time.perf_counter()
+        cycles += run_frame(chip, engine)
+        if convert:
+            chip.convert()
+        latencies.append(time.perf_counter() - frame_start)
+    elapsed = time.perf_counter() - start
+    instructions = chip.count - count
+
+    ms = [latency * 1000 for latency in latencies]
+    return {
+        'engine': engine,
+        'convert': convert,
+        'mapped': mapped,
+        'commit': git_commit(),
+        'python': sys.version.split()[0],
+        'seconds': frames / FPS,
+        'wall_seconds': elapsed,
+        'frames': frames,
+        'instructions': instructions,
+        'cycles': cycles,
+        'instructions_per_sec': instructions / elapsed,
+        'emulated_mhz': cycles / elapsed / 1e6,
+        'realtime_factor': cycles / elapsed / CYCLE_PER_SEC,
+        'frame_ms': {
+            'p50': percentile(ms, 50),
+            'p90': percentile(ms, 90),
+            'p99': percentile(ms, 99),
+            'max': max(ms),
+        },
+    }
+
+
+def report(result):
+    frame_ms = result['frame_ms']
+    print(f"engine        {result['engine']}"
+          f"{' + convert' if result['convert'] else ''}")
+    print(f"frames        {result['frames']}"
+          f" ({result['seconds']:.2f}s emulated)"
+          f" in {result['wall_seconds']:.2f}s")
+    print(f"instr/sec     {result['instructions_per_sec']:,.0f}")
+    print(f"emulated      {result['emulated_mhz']:.2f} MHz")
+    print(f"real-time     {result['realtime_factor']:.2f}x")
+    print(f"frame ms      p50 {frame_ms['p50']:.3f}  p90 {frame_ms['p90']:.3f}"
+          f"  p99 {frame_ms['p99']:.3f}  max {frame_ms['max']:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless emulator benchmark')
+    parser.add_argument('seconds', type=float, nargs='?', default=5,
+                        help='emulated seconds to measure, run as a fixed '
+                             'number of frames')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='blocks')
+    parser.add_argument('--convert', action='store_true',
+                        help='convert the framebuffer every frame')
+    parser.add_argument('--mapped', action='store_true',
+                        help='use the memory map with ROM protection and '
+                             'RAM mirrors')
+    parser.add_argument('--warmup', type=int, default=60,
+                        help='frames to run before measuring')
+    parser.add_argument('--rom', default=FILE_PATH)
+    parser.add_argument('--json', metavar='PATH',
+                        help='write the result as JSON, - for stdout')
+    args = parser.parse_args()
+
+    result = bench(args.seconds, args.engine, args.convert, args.rom,
+                   args.warmup, args.mapped)
+    if args.json == '-':
+        json.dump(result, sys.stdout, indent=2)
+        print()
+        return
+    report(result)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+import re
+from bisect import bisect_left
+from itertools import accumulate
+
+from core_ops import BODIES, SIZES, ENDS_BLOCK
+from dead_flags import drop_dead_flags
+from fast_core import INDENT, NAMESPACE
+
+STATE = ('a', 'b', 'c', 'd', 'e', 'h', 'l', 'sp', 'f', 'ie', 'count')
+MAX_BLOCK_LENGTH = 32
+PAGE_SHIFT = 8
+PAGE_COUNT = 0x10000 >> PAGE_SHIFT
+HLT = 0x76
+
+WRITE = re.compile(r'^(\s*)ram\[(.+)\] = (.+)$')
+PC = re.compile(r'\bpc\b')
+ASSIGN = re.compile(r'^\s*([a-z, ]+?) [-+&|^]?= ')
+# Anything with side effects outside the registers and the memory reads
+NOT_IDLE = re.compile(
+    r'\b(port_readers|port_writers|halt|chip|ie|cycles|print)\b')
+REGISTERS = ('a', 'b', 'c', 'd', 'e', 'h', 'l', 'sp', 'f')
+
+
+class BlockTranslator:
+    # Translates the basic block starting at pc into one Python function,
+    # the functions are cached by start address until a write hits a page
+    # holding translated code.
+    def __init__(self, chip):
+        self.chip = chip
+        # The memory the cached blocks were made for
+        self.ram = chip.ram
+        self.blocks = {}
+        self.code_pages = [set() for _ in range(PAGE_COUNT)]
+        self.idle_skip = True
+
+    def run(self, cycle_budget):
+        # Stops on the same instruction as run(): a block the budget runs
+        # out inside is replaced by its head up to that instruction.
+        chip = self.chip
+        if chip.ram is not self.ram or chip.code_stale:
+            # Swapped, e.g. while address profiling, or written by another
+            # engine
+            self.invalidate_all()
+            self.ram = chip.ram
+            chip.code_stale = False
+        pending = chip.interrupt_enable and chip.interrupt_index is not None
+        if chip.halted and not pending:
+            return cycle_budget
+        st = [
+            chip.a, chip.b, chip.c, chip.d, chip.e, chip.high, chip.low,
+            chip.sp, chip._pack_flags(), chip.interrupt_enable, chip.count,
+        ]
+        pc = chip.pc
+        cycles = 0
+        if pending:
+            pc = self._interrupt(st, pc)
+            cycles = chip.CYCLES[0xc7]
+        blocks = self.blocks
+        while cycles < cycle_budget:
+            block = blocks.get(pc)
+            if block is None:
+                block = self.translate(pc)
+            left = cycle_budget - cycles
+            if block.split >= left:
+                block = self.head(block, left)
+            pc, spent = block(st, left)
+            cycles += spent
+        chip.a, chip.b, chip.c, chip.d, chip.e, chip.high, chip.low, \
+            chip.sp, flags, chip.interrupt_enable, chip.count = st
+        chip._unpack_flags(flags)
+        chip.pc = pc
+        return cycles
+
+    def invalidate(self, address):
+        page = self.code_pages[(address & 0xffff) >> PAGE_SHIFT]
+        for start in list(page):
+            self._drop(start)
+
+    def invalidate_all(self):
+        for start in list(self.blocks):
+            self._drop(start)
+
+    def head(self, block, budget):
+        # The instructions of block run() gets to with budget cycles left,
+        # cached next to the block
+        length = bisect_left(block.totals, budget) + 1
+        head = self.blocks.get((block.start, length))
+        if head is None:
+            head = self.translate(block.start, length)
+        return head
+
+    def translate(self, start, length=None):
+        # length cuts a head off the block, before its last instruction
+        ram = self.chip.ram
+        instructions = []
+        pc = start
+        while True:
+            opcode = ram[pc]
+            instructions.append((pc, opcode))
+            pc += SIZES[opcode]
+            if ENDS_BLOCK[opcode] or len(instructions) == MAX_BLOCK_LENGTH \
+                    or len(instructions) == length:
+                break
+        source = self.block_source(ram, instructions, pc)
+        namespace = dict(NAMESPACE)
+        exec(compile(source, f'<block {start:#06x}>', 'exec'), namespace)
+        block = namespace['make'](
+            ram, self.chip, self.chip.ports.readers, self.chip.ports.writers,
+            self.chip.i0x76, self.code_pages, self.invalidate)
+        block.start = start
+        block.end = pc
+        # Cycles run after each instruction, the last one only is
+        # conditional. A budget of split or less runs out before it.
+        block.totals = list(accumulate(
+            self.chip.CYCLES[opcode] for _, opcode in instructions))
+        block.split = block.totals[-2] if len(instructions) > 1 else 0
+        key = start if length is None else (start, length)
+        self.blocks[key] = block
+        for page in self._pages(start, pc):
+            self.code_pages[page].add(key)
+        return block
+
+    def block_source(self, ram, instructions, end):
+        cycles = sum(self.chip.CYCLES[opcode] for _, opcode in instructions)
+        bodies = [
+            [
+                line.replace('ram[pc + 1]', f'{ram[address + 2]:#04x}')
+                    .replace('ram[pc]', f'{ram[address + 1]:#04x}')
+                for line in BODIES[opcode]
+            ]
+            for address, opcode in instructions
+        ]
+        # Flags overwritten before anything reads them are dropped
+        bodies = list(zip([address for address, _ in instructions],
+                          drop_dead_flags(bodies)))
+
+        # A block jumping back to its own start loops inside the function
+        # until it exits or the budget is spent.
+        start, opcode = instructions[0]
+        address, last_opcode = instructions[-1]
+        target = ram[address + 1] | (ram[address + 2] << 8)
+        loop = (last_opcode == 0xc3 or (last_opcode & 0xc7) == 0xc2) and \
+            target == start
+        indent = INDENT * 3 if loop else INDENT * 2
+        idle = loop and self.idle_skip and self._idle_candidate(bodies)
+
+        lines = [
+            'def make(ram, chip, port_readers, port_writers, halt,',
+            '         code_pages, invalidate):',
+            f'{INDENT}def block(st, budget):',
+            f'{INDENT * 2}{", ".join(STATE)} = st',
+        ]
+        if loop:
+            lines += [
+                f'{INDENT * 2}cycles = 0',
+                f'{INDENT * 2}while True:',
+            ]
+            if idle:
+                lines.append(f'{indent}entry = {idle}')
+            lines.append(f'{indent}cycles += {cycles}')
+        else:
+            lines.append(f'{INDENT * 2}cycles = {cycles}')
+        lines.append(f'{indent}count += {len(instructions)}')
+        for index, (address, body) in enumerate(bodies):
+            last = index == len(bodies) - 1
+            if not last:
+                body = [line for line in body if not line.startswith('pc +=')]
+            if any(PC.search(line) for line in body):
+                body = [f'pc = {address + 1:#06x}'] + body
+            elif last:
+                body = body + [f'pc = {end:#06x}']
+            for line in body:
+                for out in self._hook_write(line):
+                    lines.append(f'{indent}{out}')
+        # Another iteration only if the budget cannot run out inside it
+        split = cycles - self.chip.CYCLES[last_opcode]
+        if loop:
+            lines += [
+                f'{indent}if pc != {start:#06x} or '
+                f'cycles + {split} >= budget:',
+                f'{indent}{INDENT}break',
+            ]
+        if idle:
+            # An iteration that left the registers as they were repeats
+            # until the budget, i.e. the next event, runs out: nothing
+            # else can write the memory it reads in the meantime.
+            lines += [
+                f'{indent}if {idle} == entry:',
+                f'{indent}{INDENT}skip = (budget - cycles - {split}'
+                f' + {cycles - 1}) // {cycles}',
+                f'{indent}{INDENT}cycles += skip * {cycles}',
+                f'{indent}{INDENT}count += skip * {len(instructions)}',
+                f'{indent}{INDENT}break',
+            ]
+        if last_opcode == HLT:
+            # The rest of the budget goes idle
+            lines.append(f'{INDENT * 2}cycles = max(cycles, budget)')
+        lines += [
+            f'{INDENT * 2}st[:] = {", ".join(STATE)}',
+            f'{INDENT * 2}return pc, cycles',
+            f'{INDENT}return block',
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def _idle_candidate(self, bodies):
+        # A loop without memory writes or I/O, returns the registers it
+        # writes as a tuple expression or None
+        written = set()
+        for _, body in bodies:
+            for line in body:
+                if WRITE.match(line) or NOT_IDLE.search(line):
+                    return None
+                match = ASSIGN.match(line)
+                if match:
+                    written.update(match.group(1).split(', '))
+        registers = [name for name in REGISTERS if name in written]
+        if len(registers) == 1:
+            return f'({registers[0]},)'
+        return f'({", ".join(registers)})'
+
+    def _hook_write(self, line):
+        match = WRITE.match(line)
+        if match is None:
+            return [line]
+        indent, address, _ = match.groups()
+        # Zeroing the budget also ends a block looping on itself, the new
+        # code is picked up from the next block on.
+        return [
+            line,
+            f'{indent}if code_pages[(({address}) & 0xffff) >> {PAGE_SHIFT}]:',
+            f'{indent}{INDENT}invalidate({address})',
+            f'{indent}{INDENT}budget = 0',
+        ]
+
+    def _drop(self, key):
+        block = self.blocks.pop(key)
+        for page in self._pages(block.start, block.end):
+            self.code_pages[page].discard(key)
+
+    def _pages(self, start, end):
+        last = min((end - 1) >> PAGE_SHIFT, PAGE_COUNT - 1)
+        return range(start >> PAGE_SHIFT, last + 1)
+
+    def _interrupt(self, st, pc):
+        chip = self.chip
+        sp = st[7]
+        chip.ram[sp - 1] = pc >> 8
+        chip.ram[sp - 2] = pc & 0xff
+        for address in (sp - 1, sp - 2):
+            if self.code_pages[(address & 0xffff) >> PAGE_SHIFT]:
+                self.invalidate(address)
+        st[7] = sp - 2
+        pc = chip.interrupt_index * 8
+        chip.interrupt_index = None
+        chip.halted = False
+        return pc
@@ -0,0 +1,2031 @@
+# Auto generated by generate.py from opcode_gen/opcode_data.txt, do not edit.
+# One tuple of source lines per opcode, see fast_core.py, plus the
+# instruction sizes, whether the opcode ends a basic block, the mnemonics
+# and the fused bodies of the hot opcode sequences.
+BODIES = [
+    # 0x00 NOP
+    (),
+    # 0x01 LXI B,D16
+    (
+        'c = ram[pc]',
+        'b = ram[pc + 1]',
+        'pc += 2',
+    ),
+    # 0x02 STAX B
+    (
+        'ram[(b << 8) | c] = a',
+    ),
+    # 0x03 INX B
+    (
+        'val = ((b << 8) | c) + 1',
+        'c = val & 0xff',
+        'b = (val >> 8) & 0xff',
+    ),
+    # 0x04 INR B
+    (
+        'val = b + 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'b = val & 0xff',
+    ),
+    # 0x05 DCR B
+    (
+        'val = b - 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'b = val & 0xff',
+    ),
+    # 0x06 MVI B,D8
+    (
+        'b = ram[pc]',
+        'pc += 1',
+    ),
+    # 0x07 RLC
+    (
+        'bit7 = a >> 7',
+        'f = (f & ~CY_FLAG) | bit7',
+        'a = ((a << 1) | bit7) & 0xff',
+    ),
+    # 0x08 -
+    ("print('Not used instruction')",),
+    # 0x09 DAD B
+    (
+        'val = ((h << 8) | l) + ((b << 8) | c)',
+        'f = (f & ~CY_FLAG) | (val >> 16)',
+        'l = val & 0xff',
+        'h = (val >> 8) & 0xff',
+    ),
+    # 0x0a LDAX B
+    (
+        'a = ram[(b << 8) | c]',
+    ),
+    # 0x0b DCX B
+    (
+        'val = ((b << 8) | c) - 1',
+        'c = val & 0xff',
+        'b = (val >> 8) & 0xff',
+    ),
+    # 0x0c INR C
+    (
+        'val = c + 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'c = val & 0xff',
+    ),
+    # 0x0d DCR C
+    (
+        'val = c - 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'c = val & 0xff',
+    ),
+    # 0x0e MVI C,D8
+    (
+        'c = ram[pc]',
+        'pc += 1',
+    ),
+    # 0x0f RRC
+    (
+        'bit0 = a & 0x01',
+        'f = (f & ~CY_FLAG) | bit0',
+        'a = (a >> 1) | (bit0 << 7)',
+    ),
+    # 0x10 -
+    ("print('Not used instruction')",),
+    # 0x11 LXI D,D16
+    (
+        'e = ram[pc]',
+        'd = ram[pc + 1]',
+        'pc += 2',
+    ),
+    # 0x12 STAX D
+    (
+        'ram[(d << 8) | e] = a',
+    ),
+    # 0x13 INX D
+    (
+        'val = ((d << 8) | e) + 1',
+        'e = val & 0xff',
+        'd = (val >> 8) & 0xff',
+    ),
+    # 0x14 INR D
+    (
+        'val = d + 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'd = val & 0xff',
+    ),
+    # 0x15 DCR D
+    (
+        'val = d - 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'd = val & 0xff',
+    ),
+    # 0x16 MVI D,D8
+    (
+        'd = ram[pc]',
+        'pc += 1',
+    ),
+    # 0x17 RAL
+    (
+        'bit7 = a >> 7',
+        'val = ((a << 1) & 0xff) | (f & CY_FLAG)',
+        'f = (f & ~CY_FLAG) | bit7',
+    ),
+    # 0x18 -
+    ("print('Not used instruction')",),
+    # 0x19 DAD D
+    (
+        'val = ((h << 8) | l) + ((d << 8) | e)',
+        'f = (f & ~CY_FLAG) | (val >> 16)',
+        'l = val & 0xff',
+        'h = (val >> 8) & 0xff',
+    ),
+    # 0x1a LDAX D
+    (
+        'a = ram[(d << 8) | e]',
+    ),
+    # 0x1b DCX D
+    (
+        'val = ((d << 8) | e) - 1',
+        'e = val & 0xff',
+        'd = (val >> 8) & 0xff',
+    ),
+    # 0x1c INR E
+    (
+        'val = e + 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'e = val & 0xff',
+    ),
+    # 0x1d DCR E
+    (
+        'val = e - 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'e = val & 0xff',
+    ),
+    # 0x1e MVI E,D8
+    (
+        'e = ram[pc]',
+        'pc += 1',
+    ),
+    # 0x1f RAR
+    (
+        'bit0 = a & 0x01',
+        'a = (a >> 1) | ((f & CY_FLAG) << 7)',
+        'f = (f & ~CY_FLAG) | bit0',
+    ),
+    # 0x20 -
+    ("print('Not used instruction')",),
+    # 0x21 LXI H,D16
+    (
+        'l = ram[pc]',
+        'h = ram[pc + 1]',
+        'pc += 2',
+    ),
+    # 0x22 SHLD adr
+    (
+        'adr = ram[pc] | (ram[pc + 1] << 8)',
+        'pc += 2',
+        'ram[adr] = l',
+        'ram[adr + 1] = h',
+    ),
+    # 0x23 INX H
+    (
+        'val = ((h << 8) | l) + 1',
+        'l = val & 0xff',
+        'h = (val >> 8) & 0xff',
+    ),
+    # 0x24 INR H
+    (
+        'val = h + 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'h = val & 0xff',
+    ),
+    # 0x25 DCR H
+    (
+        'val = h - 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'h = val & 0xff',
+    ),
+    # 0x26 MVI H,D8
+    (
+        'h = ram[pc]',
+        'pc += 1',
+    ),
+    # 0x27 DAA
+    (
+        'val = DAA[a | ((f & 0x11) << 8)]',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x28 -
+    ("print('Not used instruction')",),
+    # 0x29 DAD H
+    (
+        'val = ((h << 8) | l) << 1',
+        'f = (f & ~CY_FLAG) | (val >> 16)',
+        'l = val & 0xff',
+        'h = (val >> 8) & 0xff',
+    ),
+    # 0x2a LHLD adr
+    (
+        'adr = ram[pc] | (ram[pc + 1] << 8)',
+        'pc += 2',
+        'l = ram[adr]',
+        'h = ram[adr + 1]',
+    ),
+    # 0x2b DCX H
+    (
+        'val = ((h << 8) | l) - 1',
+        'l = val & 0xff',
+        'h = (val >> 8) & 0xff',
+    ),
+    # 0x2c INR L
+    (
+        'val = l + 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'l = val & 0xff',
+    ),
+    # 0x2d DCR L
+    (
+        'val = l - 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'l = val & 0xff',
+    ),
+    # 0x2e MVI L,D8
+    (
+        'l = ram[pc]',
+        'pc += 1',
+    ),
+    # 0x2f CMA
+    (
+        'a ^= 0xff',
+    ),
+    # 0x30 -
+    ("print('Not used instruction')",),
+    # 0x31 LXI SP,D16
+    (
+        'sp = ram[pc] | (ram[pc + 1] << 8)',
+        'pc += 2',
+    ),
+    # 0x32 STA adr
+    (
+        'adr = ram[pc] | (ram[pc + 1] << 8)',
+        'pc += 2',
+        'ram[adr] = a',
+    ),
+    # 0x33 INX SP
+    (
+        'sp = (sp + 1) & 0xff',
+    ),
+    # 0x34 INR M
+    (
+        'adr = (h << 8) | l',
+        'val = ram[adr] + 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'ram[adr] = val & 0xff',
+    ),
+    # 0x35 DCR M
+    (
+        'adr = (h << 8) | l',
+        'val = ram[adr] - 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'ram[adr] = val & 0xff',
+    ),
+    # 0x36 MVI M,D8
+    (
+        'ram[(h << 8) | l] = ram[pc]',
+        'pc += 1',
+    ),
+    # 0x37 STC
+    (
+        'f |= CY_FLAG',
+    ),
+    # 0x38 -
+    ("print('Not used instruction')",),
+    # 0x39 DAD SP
+    (
+        'val = ((h << 8) | l) + sp',
+        'f = (f & ~CY_FLAG) | (val >> 16)',
+        'l = val & 0xff',
+        'h = (val >> 8) & 0xff',
+    ),
+    # 0x3a LDA adr
+    (
+        'adr = ram[pc] | (ram[pc + 1] << 8)',
+        'pc += 2',
+        'a = ram[adr]',
+    ),
+    # 0x3b DCX SP
+    (
+        'sp = (sp - 1) & 0xff',
+    ),
+    # 0x3c INR A
+    (
+        'val = a + 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'a = val & 0xff',
+    ),
+    # 0x3d DCR A
+    (
+        'val = a - 1',
+        'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+        'a = val & 0xff',
+    ),
+    # 0x3e MVI A,D8
+    (
+        'a = ram[pc]',
+        'pc += 1',
+    ),
+    # 0x3f CMC
+    (
+        'f ^= CY_FLAG',
+    ),
+    # 0x40 MOV B,B
+    (),
+    # 0x41 MOV B,C
+    (
+        'b = c',
+    ),
+    # 0x42 MOV B,D
+    (
+        'b = d',
+    ),
+    # 0x43 MOV B,E
+    (
+        'b = e',
+    ),
+    # 0x44 MOV B,H
+    (
+        'b = h',
+    ),
+    # 0x45 MOV B,L
+    (
+        'b = l',
+    ),
+    # 0x46 MOV B,M
+    (
+        'b = ram[(h << 8) | l]',
+    ),
+    # 0x47 MOV B,A
+    (
+        'b = a',
+    ),
+    # 0x48 MOV C,B
+    (
+        'c = b',
+    ),
+    # 0x49 MOV C,C
+    (),
+    # 0x4a MOV C,D
+    (
+        'c = d',
+    ),
+    # 0x4b MOV C,E
+    (
+        'c = e',
+    ),
+    # 0x4c MOV C,H
+    (
+        'c = h',
+    ),
+    # 0x4d MOV C,L
+    (
+        'c = l',
+    ),
+    # 0x4e MOV C,M
+    (
+        'c = ram[(h << 8) | l]',
+    ),
+    # 0x4f MOV C,A
+    (
+        'c = a',
+    ),
+    # 0x50 MOV D,B
+    (
+        'd = b',
+    ),
+    # 0x51 MOV D,C
+    (
+        'd = c',
+    ),
+    # 0x52 MOV D,D
+    (),
+    # 0x53 MOV D,E
+    (
+        'd = e',
+    ),
+    # 0x54 MOV D,H
+    (
+        'd = h',
+    ),
+    # 0x55 MOV D,L
+    (
+        'd = l',
+    ),
+    # 0x56 MOV D,M
+    (
+        'd = ram[(h << 8) | l]',
+    ),
+    # 0x57 MOV D,A
+    (
+        'd = a',
+    ),
+    # 0x58 MOV E,B
+    (
+        'e = b',
+    ),
+    # 0x59 MOV E,C
+    (
+        'e = c',
+    ),
+    # 0x5a MOV E,D
+    (
+        'e = d',
+    ),
+    # 0x5b MOV E,E
+    (),
+    # 0x5c MOV E,H
+    (
+        'e = h',
+    ),
+    # 0x5d MOV E,L
+    (
+        'e = l',
+    ),
+    # 0x5e MOV E,M
+    (
+        'e = ram[(h << 8) | l]',
+    ),
+    # 0x5f MOV E,A
+    (
+        'e = a',
+    ),
+    # 0x60 MOV H,B
+    (
+        'h = b',
+    ),
+    # 0x61 MOV H,C
+    (
+        'h = c',
+    ),
+    # 0x62 MOV H,D
+    (
+        'h = d',
+    ),
+    # 0x63 MOV H,E
+    (
+        'h = e',
+    ),
+    # 0x64 MOV H,H
+    (),
+    # 0x65 MOV H,L
+    (
+        'h = l',
+    ),
+    # 0x66 MOV H,M
+    (
+        'h = ram[(h << 8) | l]',
+    ),
+    # 0x67 MOV H,A
+    (
+        'h = a',
+    ),
+    # 0x68 MOV L,B
+    (
+        'l = b',
+    ),
+    # 0x69 MOV L,C
+    (
+        'l = c',
+    ),
+    # 0x6a MOV L,D
+    (
+        'l = d',
+    ),
+    # 0x6b MOV L,E
+    (
+        'l = e',
+    ),
+    # 0x6c MOV L,H
+    (
+        'l = h',
+    ),
+    # 0x6d MOV L,L
+    (),
+    # 0x6e MOV L,M
+    (
+        'l = ram[(h << 8) | l]',
+    ),
+    # 0x6f MOV L,A
+    (
+        'l = a',
+    ),
+    # 0x70 MOV M,B
+    (
+        'ram[(h << 8) | l] = b',
+    ),
+    # 0x71 MOV M,C
+    (
+        'ram[(h << 8) | l] = c',
+    ),
+    # 0x72 MOV M,D
+    (
+        'ram[(h << 8) | l] = d',
+    ),
+    # 0x73 MOV M,E
+    (
+        'ram[(h << 8) | l] = e',
+    ),
+    # 0x74 MOV M,H
+    (
+        'ram[(h << 8) | l] = h',
+    ),
+    # 0x75 MOV M,L
+    (
+        'ram[(h << 8) | l] = l',
+    ),
+    # 0x76 HLT
+    (
+        'halt()',
+    ),
+    # 0x77 MOV M,A
+    (
+        'ram[(h << 8) | l] = a',
+    ),
+    # 0x78 MOV A,B
+    (
+        'a = b',
+    ),
+    # 0x79 MOV A,C
+    (
+        'a = c',
+    ),
+    # 0x7a MOV A,D
+    (
+        'a = d',
+    ),
+    # 0x7b MOV A,E
+    (
+        'a = e',
+    ),
+    # 0x7c MOV A,H
+    (
+        'a = h',
+    ),
+    # 0x7d MOV A,L
+    (
+        'a = l',
+    ),
+    # 0x7e MOV A,M
+    (
+        'a = ram[(h << 8) | l]',
+    ),
+    # 0x7f MOV A,A
+    (),
+    # 0x80 ADD B
+    (
+        'val = a + b',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x81 ADD C
+    (
+        'val = a + c',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x82 ADD D
+    (
+        'val = a + d',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x83 ADD E
+    (
+        'val = a + e',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x84 ADD H
+    (
+        'val = a + h',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x85 ADD L
+    (
+        'val = a + l',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x86 ADD M
+    (
+        'val = a + ram[(h << 8) | l]',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x87 ADD A
+    (
+        'val = a + a',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x88 ADC B
+    (
+        'val = a + b + (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x89 ADC C
+    (
+        'val = a + c + (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x8a ADC D
+    (
+        'val = a + d + (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x8b ADC E
+    (
+        'val = a + e + (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x8c ADC H
+    (
+        'val = a + h + (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x8d ADC L
+    (
+        'val = a + l + (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x8e ADC M
+    (
+        'val = a + ram[(h << 8) | l] + (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x8f ADC A
+    (
+        'val = a + a + (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x90 SUB B
+    (
+        'val = a - b',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x91 SUB C
+    (
+        'val = a - c',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x92 SUB D
+    (
+        'val = a - d',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x93 SUB E
+    (
+        'val = a - e',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x94 SUB H
+    (
+        'val = a - h',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x95 SUB L
+    (
+        'val = a - l',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x96 SUB M
+    (
+        'val = a - ram[(h << 8) | l]',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x97 SUB A
+    (
+        'val = a - a',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x98 SBB B
+    (
+        'val = a - b - (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x99 SBB C
+    (
+        'val = a - c - (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x9a SBB D
+    (
+        'val = a - d - (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x9b SBB E
+    (
+        'val = a - e - (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x9c SBB H
+    (
+        'val = a - h - (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x9d SBB L
+    (
+        'val = a - l - (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x9e SBB M
+    (
+        'val = a - ram[(h << 8) | l] - (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0x9f SBB A
+    (
+        'val = a - a - (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+    ),
+    # 0xa0 ANA B
+    (
+        'a &= b',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xa1 ANA C
+    (
+        'a &= c',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xa2 ANA D
+    (
+        'a &= d',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xa3 ANA E
+    (
+        'a &= e',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xa4 ANA H
+    (
+        'a &= h',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xa5 ANA L
+    (
+        'a &= l',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xa6 ANA M
+    (
+        'a &= ram[(h << 8) | l]',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xa7 ANA A
+    (
+        'a &= a',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xa8 XRA B
+    (
+        'a ^= b',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xa9 XRA C
+    (
+        'a ^= c',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xaa XRA D
+    (
+        'a ^= d',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xab XRA E
+    (
+        'a ^= e',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xac XRA H
+    (
+        'a ^= h',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xad XRA L
+    (
+        'a ^= l',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xae XRA M
+    (
+        'a ^= ram[(h << 8) | l]',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xaf XRA A
+    (
+        'a ^= a',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xb0 ORA B
+    (
+        'a |= b',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xb1 ORA C
+    (
+        'a |= c',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xb2 ORA D
+    (
+        'a |= d',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xb3 ORA E
+    (
+        'a |= e',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xb4 ORA H
+    (
+        'a |= h',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xb5 ORA L
+    (
+        'a |= l',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xb6 ORA M
+    (
+        'a |= ram[(h << 8) | l]',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xb7 ORA A
+    (
+        'a |= a',
+        'f = LOGIC_PSW[a]',
+    ),
+    # 0xb8 CMP B
+    (
+        'val = a - b',
+        'f = ARITH_PSW[val & 0x1ff]',
+    ),
+    # 0xb9 CMP C
+    (
+        'val = a - c',
+        'f = ARITH_PSW[val & 0x1ff]',
+    ),
+    # 0xba CMP D
+    (
+        'val = a - d',
+        'f = ARITH_PSW[val & 0x1ff]',
+    ),
+    # 0xbb CMP E
+    (
+        'val = a - e',
+        'f = ARITH_PSW[val & 0x1ff]',
+    ),
+    # 0xbc CMP H
+    (
+        'val = a - h',
+        'f = ARITH_PSW[val & 0x1ff]',
+    ),
+    # 0xbd CMP L
+    (
+        'val = a - l',
+        'f = ARITH_PSW[val & 0x1ff]',
+    ),
+    # 0xbe CMP M
+    (
+        'val = a - ram[(h << 8) | l]',
+        'f = ARITH_PSW[val & 0x1ff]',
+    ),
+    # 0xbf CMP A
+    (
+        'val = a - a',
+        'f = ARITH_PSW[val & 0x1ff]',
+    ),
+    # 0xc0 RNZ
+    (
+        'if not f & Z_FLAG:',
+        '    pc = ram[sp] | (ram[sp + 1] << 8)',
+        '    sp += 2',
+        'else:',
+        '    cycles -= 6',
+    ),
+    # 0xc1 POP B
+    (
+        'c = ram[sp]',
+        'b = ram[sp + 1]',
+        'sp += 2',
+    ),
+    # 0xc2 JNZ adr
+    (
+        'if not f & Z_FLAG:',
+        '    pc = ram[pc] | (ram[pc + 1] << 8)',
+        'else:',
+        '    pc += 2',
+    ),
+    # 0xc3 JMP adr
+    (
+        'pc = ram[pc] | (ram[pc + 1] << 8)',
+    ),
+    # 0xc4 CNZ adr
+    (
+        'if not f & Z_FLAG:',
+        '    adr = ram[pc] | (ram[pc + 1] << 8)',
+        '    pc += 2',
+        '    ram[sp - 1] = pc >> 8',
+        '    ram[sp - 2] = pc & 0xff',
+        '    sp -= 2',
+        '    pc = adr',
+        'else:',
+        '    pc += 2',
+        '    cycles -= 6',
+    ),
+    # 0xc5 PUSH B
+    (
+        'ram[sp - 2] = c',
+        'ram[sp - 1] = b',
+        'sp -= 2',
+    ),
+    # 0xc6 ADI D8
+    (
+        'val = a + ram[pc]',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+        'pc += 1',
+    ),
+    # 0xc7 RST 0
+    (
+        'ram[sp - 1] = pc >> 8',
+        'ram[sp - 2] = pc & 0xff',
+        'sp -= 2',
+        'pc = 0x00',
+    ),
+    # 0xc8 RZ
+    (
+        'if f & Z_FLAG:',
+        '    pc = ram[sp] | (ram[sp + 1] << 8)',
+        '    sp += 2',
+        'else:',
+        '    cycles -= 6',
+    ),
+    # 0xc9 RET
+    (
+        'pc = ram[sp] | (ram[sp + 1] << 8)',
+        'sp += 2',
+    ),
+    # 0xca JZ adr
+    (
+        'if f & Z_FLAG:',
+        '    pc = ram[pc] | (ram[pc + 1] << 8)',
+        'else:',
+        '    pc += 2',
+    ),
+    # 0xcb -
+    ("print('Not used instruction')",),
+    # 0xcc CZ adr
+    (
+        'if f & Z_FLAG:',
+        '    adr = ram[pc] | (ram[pc + 1] << 8)',
+        '    pc += 2',
+        '    ram[sp - 1] = pc >> 8',
+        '    ram[sp - 2] = pc & 0xff',
+        '    sp -= 2',
+        '    pc = adr',
+        'else:',
+        '    pc += 2',
+        '    cycles -= 6',
+    ),
+    # 0xcd CALL adr
+    (
+        'adr = ram[pc] | (ram[pc + 1] << 8)',
+        'pc += 2',
+        'ram[sp - 1] = pc >> 8',
+        'ram[sp - 2] = pc & 0xff',
+        'sp -= 2',
+        'pc = adr',
+    ),
+    # 0xce ACI D8
+    (
+        'val = a + ram[pc] + (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+        'pc += 1',
+    ),
+    # 0xcf RST 1
+    (
+        'ram[sp - 1] = pc >> 8',
+        'ram[sp - 2] = pc & 0xff',
+        'sp -= 2',
+        'pc = 0x08',
+    ),
+    # 0xd0 RNC
+    (
+        'if not f & CY_FLAG:',
+        '    pc = ram[sp] | (ram[sp + 1] << 8)',
+        '    sp += 2',
+        'else:',
+        '    cycles -= 6',
+    ),
+    # 0xd1 POP D
+    (
+        'e = ram[sp]',
+        'd = ram[sp + 1]',
+        'sp += 2',
+    ),
+    # 0xd2 JNC adr
+    (
+        'if not f & CY_FLAG:',
+        '    pc = ram[pc] | (ram[pc + 1] << 8)',
+        'else:',
+        '    pc += 2',
+    ),
+    # 0xd3 OUT D8
+    (
+        'port_writers[ram[pc]](a)',
+        'pc += 1',
+    ),
+    # 0xd4 CNC adr
+    (
+        'if not f & CY_FLAG:',
+        '    adr = ram[pc] | (ram[pc + 1] << 8)',
+        '    pc += 2',
+        '    ram[sp - 1] = pc >> 8',
+        '    ram[sp - 2] = pc & 0xff',
+        '    sp -= 2',
+        '    pc = adr',
+        'else:',
+        '    pc += 2',
+        '    cycles -= 6',
+    ),
+    # 0xd5 PUSH D
+    (
+        'ram[sp - 2] = e',
+        'ram[sp - 1] = d',
+        'sp -= 2',
+    ),
+    # 0xd6 SUI D8
+    (
+        'val = a - ram[pc]',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+        'pc += 1',
+    ),
+    # 0xd7 RST 2
+    (
+        'ram[sp - 1] = pc >> 8',
+        'ram[sp - 2] = pc & 0xff',
+        'sp -= 2',
+        'pc = 0x10',
+    ),
+    # 0xd8 RC
+    (
+        'if f & CY_FLAG:',
+        '    pc = ram[sp] | (ram[sp + 1] << 8)',
+        '    sp += 2',
+        'else:',
+        '    cycles -= 6',
+    ),
+    # 0xd9 -
+    ("print('Not used instruction')",),
+    # 0xda JC adr
+    (
+        'if f & CY_FLAG:',
+        '    pc = ram[pc] | (ram[pc + 1] << 8)',
+        'else:',
+        '    pc += 2',
+    ),
+    # 0xdb IN D8
+    (
+        'a = port_readers[ram[pc]]()',
+        'pc += 1',
+    ),
+    # 0xdc CC adr
+    (
+        'if f & CY_FLAG:',
+        '    adr = ram[pc] | (ram[pc + 1] << 8)',
+        '    pc += 2',
+        '    ram[sp - 1] = pc >> 8',
+        '    ram[sp - 2] = pc & 0xff',
+        '    sp -= 2',
+        '    pc = adr',
+        'else:',
+        '    pc += 2',
+        '    cycles -= 6',
+    ),
+    # 0xdd -
+    ("print('Not used instruction')",),
+    # 0xde SBI D8
+    (
+        'val = a - ram[pc] - (f & CY_FLAG)',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'a = val & 0xff',
+        'pc += 1',
+    ),
+    # 0xdf RST 3
+    (
+        'ram[sp - 1] = pc >> 8',
+        'ram[sp - 2] = pc & 0xff',
+        'sp -= 2',
+        'pc = 0x18',
+    ),
+    # 0xe0 RPO
+    (
+        'if not f & P_FLAG:',
+        '    pc = ram[sp] | (ram[sp + 1] << 8)',
+        '    sp += 2',
+        'else:',
+        '    cycles -= 6',
+    ),
+    # 0xe1 POP H
+    (
+        'l = ram[sp]',
+        'h = ram[sp + 1]',
+        'sp += 2',
+    ),
+    # 0xe2 JPO adr
+    (
+        'if not f & P_FLAG:',
+        '    pc = ram[pc] | (ram[pc + 1] << 8)',
+        'else:',
+        '    pc += 2',
+    ),
+    # 0xe3 XTHL
+    (
+        'val = ram[sp]',
+        'ram[sp] = l',
+        'l = val',
+        'val = ram[sp + 1]',
+        'ram[sp + 1] = h',
+        'h = val',
+    ),
+    # 0xe4 CPO adr
+    (
+        'if not f & P_FLAG:',
+        '    adr = ram[pc] | (ram[pc + 1] << 8)',
+        '    pc += 2',
+        '    ram[sp - 1] = pc >> 8',
+        '    ram[sp - 2] = pc & 0xff',
+        '    sp -= 2',
+        '    pc = adr',
+        'else:',
+        '    pc += 2',
+        '    cycles -= 6',
+    ),
+    # 0xe5 PUSH H
+    (
+        'ram[sp - 2] = l',
+        'ram[sp - 1] = h',
+        'sp -= 2',
+    ),
+    # 0xe6 ANI D8
+    (
+        'a &= ram[pc]',
+        'f = LOGIC_PSW[a]',
+        'pc += 1',
+    ),
+    # 0xe7 RST 4
+    (
+        'ram[sp - 1] = pc >> 8',
+        'ram[sp - 2] = pc & 0xff',
+        'sp -= 2',
+        'pc = 0x20',
+    ),
+    # 0xe8 RPE
+    (
+        'if f & P_FLAG:',
+        '    pc = ram[sp] | (ram[sp + 1] << 8)',
+        '    sp += 2',
+        'else:',
+        '    cycles -= 6',
+    ),
+    # 0xe9 PCHL
+    (
+        'pc = (h << 8) | l',
+    ),
+    # 0xea JPE adr
+    (
+        'if f & P_FLAG:',
+        '    pc = ram[pc] | (ram[pc + 1] << 8)',
+        'else:',
+        '    pc += 2',
+    ),
+    # 0xeb XCHG
+    (
+        'd, h = h, d',
+        'e, l = l, e',
+    ),
+    # 0xec CPE adr
+    (
+        'if f & P_FLAG:',
+        '    adr = ram[pc] | (ram[pc + 1] << 8)',
+        '    pc += 2',
+        '    ram[sp - 1] = pc >> 8',
+        '    ram[sp - 2] = pc & 0xff',
+        '    sp -= 2',
+        '    pc = adr',
+        'else:',
+        '    pc += 2',
+        '    cycles -= 6',
+    ),
+    # 0xed -
+    ("print('Not used instruction')",),
+    # 0xee XRI D8
+    (
+        'a ^= ram[pc]',
+        'f = LOGIC_PSW[a]',
+        'pc += 1',
+    ),
+    # 0xef RST 5
+    (
+        'ram[sp - 1] = pc >> 8',
+        'ram[sp - 2] = pc & 0xff',
+        'sp -= 2',
+        'pc = 0x28',
+    ),
+    # 0xf0 RP
+    (
+        'if not f & S_FLAG:',
+        '    pc = ram[sp] | (ram[sp + 1] << 8)',
+        '    sp += 2',
+        'else:',
+        '    cycles -= 6',
+    ),
+    # 0xf1 POP PSW
+    (
+        'f = ram[sp] & All_FLAG',
+        'a = ram[sp + 1]',
+        'sp += 2',
+    ),
+    # 0xf2 JP adr
+    (
+        'if not f & S_FLAG:',
+        '    pc = ram[pc] | (ram[pc + 1] << 8)',
+        'else:',
+        '    pc += 2',
+    ),
+    # 0xf3 DI
+    (
+        'ie = False',
+        "print('Disable interrupt')",
+    ),
+    # 0xf4 CP adr
+    (
+        'if not f & S_FLAG:',
+        '    adr = ram[pc] | (ram[pc + 1] << 8)',
+        '    pc += 2',
+        '    ram[sp - 1] = pc >> 8',
+        '    ram[sp - 2] = pc & 0xff',
+        '    sp -= 2',
+        '    pc = adr',
+        'else:',
+        '    pc += 2',
+        '    cycles -= 6',
+    ),
+    # 0xf5 PUSH PSW
+    (
+        'ram[sp - 2] = f',
+        'ram[sp - 1] = a',
+        'sp -= 2',
+    ),
+    # 0xf6 ORI D8
+    (
+        'a |= ram[pc]',
+        'f = LOGIC_PSW[a]',
+        'pc += 1',
+    ),
+    # 0xf7 RST 6
+    (
+        'ram[sp - 1] = pc >> 8',
+        'ram[sp - 2] = pc & 0xff',
+        'sp -= 2',
+        'pc = 0x30',
+    ),
+    # 0xf8 RM
+    (
+        'if f & S_FLAG:',
+        '    pc = ram[sp] | (ram[sp + 1] << 8)',
+        '    sp += 2',
+        'else:',
+        '    cycles -= 6',
+    ),
+    # 0xf9 SPHL
+    (
+        'sp = (h << 8) | l',
+    ),
+    # 0xfa JM adr
+    (
+        'if f & S_FLAG:',
+        '    pc = ram[pc] | (ram[pc + 1] << 8)',
+        'else:',
+        '    pc += 2',
+    ),
+    # 0xfb EI
+    (
+        'ie = True',
+        'index = chip.interrupt_index',
+        'if index is not None:',
+        '    chip.interrupt_index = None',
+        '    ram[sp - 1] = pc >> 8',
+        '    ram[sp - 2] = pc & 0xff',
+        '    sp -= 2',
+        '    pc = index * 8',
+        '    cycles += 11',
+    ),
+    # 0xfc CM adr
+    (
+        'if f & S_FLAG:',
+        '    adr = ram[pc] | (ram[pc + 1] << 8)',
+        '    pc += 2',
+        '    ram[sp - 1] = pc >> 8',
+        '    ram[sp - 2] = pc & 0xff',
+        '    sp -= 2',
+        '    pc = adr',
+        'else:',
+        '    pc += 2',
+        '    cycles -= 6',
+    ),
+    # 0xfd -
+    ("print('Not used instruction')",),
+    # 0xfe CPI D8
+    (
+        'val = a - ram[pc]',
+        'f = ARITH_PSW[val & 0x1ff]',
+        'pc += 1',
+    ),
+    # 0xff RST 7
+    (
+        'ram[sp - 1] = pc >> 8',
+        'ram[sp - 2] = pc & 0xff',
+        'sp -= 2',
+        'pc = 0x38',
+    ),
+]
+
+SIZES = [
+    1, 3, 1, 1, 1, 1, 2, 1, 1, 1, 1, 1, 1, 1, 2, 1,
+    1, 3, 1, 1, 1, 1, 2, 1, 1, 1, 1, 1, 1, 1, 2, 1,
+    1, 3, 3, 1, 1, 1, 2, 1, 1, 1, 3, 1, 1, 1, 2, 1,
+    1, 3, 3, 1, 1, 1, 2, 1, 1, 1, 3, 1, 1, 1, 2, 1,
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
+    1, 1, 3, 3, 3, 1, 2, 1, 1, 1, 3, 1, 3, 3, 2, 1,
+    1, 1, 3, 2, 3, 1, 2, 1, 1, 1, 3, 2, 3, 1, 2, 1,
+    1, 1, 3, 1, 3, 1, 2, 1, 1, 1, 3, 1, 3, 1, 2, 1,
+    1, 1, 3, 1, 3, 1, 2, 1, 1, 1, 3, 1, 3, 1, 2, 1,
+]
+ENDS_BLOCK = [
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    1, 0, 1, 1, 1, 0, 0, 1, 1, 1, 1, 0, 1, 1, 0, 1,
+    1, 0, 1, 0, 1, 0, 0, 1, 1, 0, 1, 0, 1, 0, 0, 1,
+    1, 0, 1, 0, 1, 0, 0, 1, 1, 1, 1, 0, 1, 0, 0, 1,
+    1, 0, 1, 0, 1, 0, 0, 1, 1, 0, 1, 1, 1, 0, 0, 1,
+]
+MNEMONICS = [
+    'NOP',
+    'LXI B,D16',
+    'STAX B',
+    'INX B',
+    'INR B',
+    'DCR B',
+    'MVI B,D8',
+    'RLC',
+    '-',
+    'DAD B',
+    'LDAX B',
+    'DCX B',
+    'INR C',
+    'DCR C',
+    'MVI C,D8',
+    'RRC',
+    '-',
+    'LXI D,D16',
+    'STAX D',
+    'INX D',
+    'INR D',
+    'DCR D',
+    'MVI D,D8',
+    'RAL',
+    '-',
+    'DAD D',
+    'LDAX D',
+    'DCX D',
+    'INR E',
+    'DCR E',
+    'MVI E,D8',
+    'RAR',
+    '-',
+    'LXI H,D16',
+    'SHLD adr',
+    'INX H',
+    'INR H',
+    'DCR H',
+    'MVI H,D8',
+    'DAA',
+    '-',
+    'DAD H',
+    'LHLD adr',
+    'DCX H',
+    'INR L',
+    'DCR L',
+    'MVI L,D8',
+    'CMA',
+    '-',
+    'LXI SP,D16',
+    'STA adr',
+    'INX SP',
+    'INR M',
+    'DCR M',
+    'MVI M,D8',
+    'STC',
+    '-',
+    'DAD SP',
+    'LDA adr',
+    'DCX SP',
+    'INR A',
+    'DCR A',
+    'MVI A,D8',
+    'CMC',
+    'MOV B,B',
+    'MOV B,C',
+    'MOV B,D',
+    'MOV B,E',
+    'MOV B,H',
+    'MOV B,L',
+    'MOV B,M',
+    'MOV B,A',
+    'MOV C,B',
+    'MOV C,C',
+    'MOV C,D',
+    'MOV C,E',
+    'MOV C,H',
+    'MOV C,L',
+    'MOV C,M',
+    'MOV C,A',
+    'MOV D,B',
+    'MOV D,C',
+    'MOV D,D',
+    'MOV D,E',
+    'MOV D,H',
+    'MOV D,L',
+    'MOV D,M',
+    'MOV D,A',
+    'MOV E,B',
+    'MOV E,C',
+    'MOV E,D',
+    'MOV E,E',
+    'MOV E,H',
+    'MOV E,L',
+    'MOV E,M',
+    'MOV E,A',
+    'MOV H,B',
+    'MOV H,C',
+    'MOV H,D',
+    'MOV H,E',
+    'MOV H,H',
+    'MOV H,L',
+    'MOV H,M',
+    'MOV H,A',
+    'MOV L,B',
+    'MOV L,C',
+    'MOV L,D',
+    'MOV L,E',
+    'MOV L,H',
+    'MOV L,L',
+    'MOV L,M',
+    'MOV L,A',
+    'MOV M,B',
+    'MOV M,C',
+    'MOV M,D',
+    'MOV M,E',
+    'MOV M,H',
+    'MOV M,L',
+    'HLT',
+    'MOV M,A',
+    'MOV A,B',
+    'MOV A,C',
+    'MOV A,D',
+    'MOV A,E',
+    'MOV A,H',
+    'MOV A,L',
+    'MOV A,M',
+    'MOV A,A',
+    'ADD B',
+    'ADD C',
+    'ADD D',
+    'ADD E',
+    'ADD H',
+    'ADD L',
+    'ADD M',
+    'ADD A',
+    'ADC B',
+    'ADC C',
+    'ADC D',
+    'ADC E',
+    'ADC H',
+    'ADC L',
+    'ADC M',
+    'ADC A',
+    'SUB B',
+    'SUB C',
+    'SUB D',
+    'SUB E',
+    'SUB H',
+    'SUB L',
+    'SUB M',
+    'SUB A',
+    'SBB B',
+    'SBB C',
+    'SBB D',
+    'SBB E',
+    'SBB H',
+    'SBB L',
+    'SBB M',
+    'SBB A',
+    'ANA B',
+    'ANA C',
+    'ANA D',
+    'ANA E',
+    'ANA H',
+    'ANA L',
+    'ANA M',
+    'ANA A',
+    'XRA B',
+    'XRA C',
+    'XRA D',
+    'XRA E',
+    'XRA H',
+    'XRA L',
+    'XRA M',
+    'XRA A',
+    'ORA B',
+    'ORA C',
+    'ORA D',
+    'ORA E',
+    'ORA H',
+    'ORA L',
+    'ORA M',
+    'ORA A',
+    'CMP B',
+    'CMP C',
+    'CMP D',
+    'CMP E',
+    'CMP H',
+    'CMP L',
+    'CMP M',
+    'CMP A',
+    'RNZ',
+    'POP B',
+    'JNZ adr',
+    'JMP adr',
+    'CNZ adr',
+    'PUSH B',
+    'ADI D8',
+    'RST 0',
+    'RZ',
+    'RET',
+    'JZ adr',
+    '-',
+    'CZ adr',
+    'CALL adr',
+    'ACI D8',
+    'RST 1',
+    'RNC',
+    'POP D',
+    'JNC adr',
+    'OUT D8',
+    'CNC adr',
+    'PUSH D',
+    'SUI D8',
+    'RST 2',
+    'RC',
+    '-',
+    'JC adr',
+    'IN D8',
+    'CC adr',
+    '-',
+    'SBI D8',
+    'RST 3',
+    'RPO',
+    'POP H',
+    'JPO adr',
+    'XTHL',
+    'CPO adr',
+    'PUSH H',
+    'ANI D8',
+    'RST 4',
+    'RPE',
+    'PCHL',
+    'JPE adr',
+    'XCHG',
+    'CPE adr',
+    '-',
+    'XRI D8',
+    'RST 5',
+    'RP',
+    'POP PSW',
+    'JP adr',
+    'DI',
+    'CP adr',
+    'PUSH PSW',
+    'ORI D8',
+    'RST 6',
+    'RM',
+    'SPHL',
+    'JM adr',
+    'EI',
+    'CM adr',
+    '-',
+    'CPI D8',
+    'RST 7',
+]
+FUSED = [
+    # LDA adr; DCR A; JNZ adr
+    (
+        (0x3a, 0x3d, 0xc2),
+        (
+            'adr = ram[pc] | (ram[pc + 1] << 8)',
+            'pc += 2',
+            'a = ram[adr]',
+            'pc += 1',
+            'val = a - 1',
+            'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+            'a = val & 0xff',
+            'pc += 1',
+            'if not f & Z_FLAG:',
+            '    pc = ram[pc] | (ram[pc + 1] << 8)',
+            'else:',
+            '    pc += 2',
+        ),
+    ),
+    # LDA adr; ANA A; JNZ adr
+    (
+        (0x3a, 0xa7, 0xc2),
+        (
+            'adr = ram[pc] | (ram[pc + 1] << 8)',
+            'pc += 2',
+            'a = ram[adr]',
+            'pc += 1',
+            'a &= a',
+            'f = LOGIC_PSW[a]',
+            'pc += 1',
+            'if not f & Z_FLAG:',
+            '    pc = ram[pc] | (ram[pc + 1] << 8)',
+            'else:',
+            '    pc += 2',
+        ),
+    ),
+    # MOV A,M; ANA A; JNZ adr
+    (
+        (0x7e, 0xa7, 0xc2),
+        (
+            'a = ram[(h << 8) | l]',
+            'pc += 1',
+            'a &= a',
+            'f = LOGIC_PSW[a]',
+            'pc += 1',
+            'if not f & Z_FLAG:',
+            '    pc = ram[pc] | (ram[pc + 1] << 8)',
+            'else:',
+            '    pc += 2',
+        ),
+    ),
+    # INX H; DCR B; JNZ adr
+    (
+        (0x23, 0x05, 0xc2),
+        (
+            'val = ((h << 8) | l) + 1',
+            'l = val & 0xff',
+            'h = (val >> 8) & 0xff',
+            'pc += 1',
+            'val = b - 1',
+            'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+            'b = val & 0xff',
+            'pc += 1',
+            'if not f & Z_FLAG:',
+            '    pc = ram[pc] | (ram[pc + 1] << 8)',
+            'else:',
+            '    pc += 2',
+        ),
+    ),
+    # OUT D8; LDA adr; ANA A; JZ adr
+    (
+        (0xd3, 0x3a, 0xa7, 0xca),
+        (
+            'port_writers[ram[pc]](a)',
+            'pc += 2',
+            'adr = ram[pc] | (ram[pc + 1] << 8)',
+            'pc += 2',
+            'a = ram[adr]',
+            'pc += 1',
+            'a &= a',
+            'f = LOGIC_PSW[a]',
+            'pc += 1',
+            'if f & Z_FLAG:',
+            '    pc = ram[pc] | (ram[pc + 1] << 8)',
+            'else:',
+            '    pc += 2',
+        ),
+    ),
+    # LDAX D; MOV M,A; INX H; INX D; DCR B; JNZ adr
+    (
+        (0x1a, 0x77, 0x23, 0x13, 0x05, 0xc2),
+        (
+            'a = ram[(d << 8) | e]',
+            'pc += 1',
+            'ram[(h << 8) | l] = a',
+            'pc += 1',
+            'val = ((h << 8) | l) + 1',
+            'l = val & 0xff',
+            'h = (val >> 8) & 0xff',
+            'pc += 1',
+            'val = ((d << 8) | e) + 1',
+            'e = val & 0xff',
+            'd = (val >> 8) & 0xff',
+            'pc += 1',
+            'val = b - 1',
+            'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+            'b = val & 0xff',
+            'pc += 1',
+            'if not f & Z_FLAG:',
+            '    pc = ram[pc] | (ram[pc + 1] << 8)',
+            'else:',
+            '    pc += 2',
+        ),
+    ),
+    # LXI B,D16; DAD B; POP B; DCR B; JNZ adr
+    (
+        (0x01, 0x09, 0xc1, 0x05, 0xc2),
+        (
+            'c = ram[pc]',
+            'b = ram[pc + 1]',
+            'pc += 3',
+            'val = ((h << 8) | l) + ((b << 8) | c)',
+            'f = (f & ~CY_FLAG) | (val >> 16)',
+            'l = val & 0xff',
+            'h = (val >> 8) & 0xff',
+            'pc += 1',
+            'c = ram[sp]',
+            'b = ram[sp + 1]',
+            'sp += 2',
+            'pc += 1',
+            'val = b - 1',
+            'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+            'b = val & 0xff',
+            'pc += 1',
+            'if not f & Z_FLAG:',
+            '    pc = ram[pc] | (ram[pc + 1] << 8)',
+            'else:',
+            '    pc += 2',
+        ),
+    ),
+    # MOV M,A; INX H; INX D; DCR B
+    (
+        (0x77, 0x23, 0x13, 0x05),
+        (
+            'ram[(h << 8) | l] = a',
+            'pc += 1',
+            'val = ((h << 8) | l) + 1',
+            'l = val & 0xff',
+            'h = (val >> 8) & 0xff',
+            'pc += 1',
+            'val = ((d << 8) | e) + 1',
+            'e = val & 0xff',
+            'd = (val >> 8) & 0xff',
+            'pc += 1',
+            'val = b - 1',
+            'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+            'b = val & 0xff',
+        ),
+    ),
+    # POP H; LXI B,D16; DAD B; POP B; DCR B; JNZ adr
+    (
+        (0xe1, 0x01, 0x09, 0xc1, 0x05, 0xc2),
+        (
+            'l = ram[sp]',
+            'h = ram[sp + 1]',
+            'sp += 2',
+            'pc += 1',
+            'c = ram[pc]',
+            'b = ram[pc + 1]',
+            'pc += 3',
+            'val = ((h << 8) | l) + ((b << 8) | c)',
+            'f = (f & ~CY_FLAG) | (val >> 16)',
+            'l = val & 0xff',
+            'h = (val >> 8) & 0xff',
+            'pc += 1',
+            'c = ram[sp]',
+            'b = ram[sp + 1]',
+            'sp += 2',
+            'pc += 1',
+            'val = b - 1',
+            'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+            'b = val & 0xff',
+            'pc += 1',
+            'if not f & Z_FLAG:',
+            '    pc = ram[pc] | (ram[pc + 1] << 8)',
+            'else:',
+            '    pc += 2',
+        ),
+    ),
+    # MOV M,A; INX H; INX D; XRA A; OUT D8; IN D8
+    (
+        (0x77, 0x23, 0x13, 0xaf, 0xd3, 0xdb),
+        (
+            'ram[(h << 8) | l] = a',
+            'pc += 1',
+            'val = ((h << 8) | l) + 1',
+            'l = val & 0xff',
+            'h = (val >> 8) & 0xff',
+            'pc += 1',
+            'val = ((d << 8) | e) + 1',
+            'e = val & 0xff',
+            'd = (val >> 8) & 0xff',
+            'pc += 1',
+            'a ^= a',
+            'f = LOGIC_PSW[a]',
+            'pc += 1',
+            'port_writers[ram[pc]](a)',
+            'pc += 2',
+            'a = port_readers[ram[pc]]()',
+            'pc += 1',
+        ),
+    ),
+    # MOV M,A; POP H; LXI B,D16; DAD B; POP B; DCR B
+    (
+        (0x77, 0xe1, 0x01, 0x09, 0xc1, 0x05),
+        (
+            'ram[(h << 8) | l] = a',
+            'pc += 1',
+            'l = ram[sp]',
+            'h = ram[sp + 1]',
+            'sp += 2',
+            'pc += 1',
+            'c = ram[pc]',
+            'b = ram[pc + 1]',
+            'pc += 3',
+            'val = ((h << 8) | l) + ((b << 8) | c)',
+            'f = (f & ~CY_FLAG) | (val >> 16)',
+            'l = val & 0xff',
+            'h = (val >> 8) & 0xff',
+            'pc += 1',
+            'c = ram[sp]',
+            'b = ram[sp + 1]',
+            'sp += 2',
+            'pc += 1',
+            'val = b - 1',
+            'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+            'b = val & 0xff',
+        ),
+    ),
+    # LDA adr; CPI D8
+    (
+        (0x3a, 0xfe),
+        (
+            'adr = ram[pc] | (ram[pc + 1] << 8)',
+            'pc += 2',
+            'a = ram[adr]',
+            'pc += 1',
+            'val = a - ram[pc]',
+            'f = ARITH_PSW[val & 0x1ff]',
+            'pc += 1',
+        ),
+    ),
+    # MVI M,D8; INX H; MOV A,L; ANI D8; CPI D8; JC adr
+    (
+        (0x36, 0x23, 0x7d, 0xe6, 0xfe, 0xda),
+        (
+            'ram[(h << 8) | l] = ram[pc]',
+            'pc += 2',
+            'val = ((h << 8) | l) + 1',
+            'l = val & 0xff',
+            'h = (val >> 8) & 0xff',
+            'pc += 1',
+            'a = l',
+            'pc += 1',
+            'a &= ram[pc]',
+            'pc += 2',
+            'val = a - ram[pc]',
+            'f = ARITH_PSW[val & 0x1ff]',
+            'pc += 2',
+            'if f & CY_FLAG:',
+            '    pc = ram[pc] | (ram[pc + 1] << 8)',
+            'else:',
+            '    pc += 2',
+        ),
+    ),
+    # PUSH B; PUSH H; LDAX D; OUT D8; IN D8
+    (
+        (0xc5, 0xe5, 0x1a, 0xd3, 0xdb),
+        (
+            'ram[sp - 2] = c',
+            'ram[sp - 1] = b',
+            'sp -= 2',
+            'pc += 1',
+            'ram[sp - 2] = l',
+            'ram[sp - 1] = h',
+            'sp -= 2',
+            'pc += 1',
+            'a = ram[(d << 8) | e]',
+            'pc += 1',
+            'port_writers[ram[pc]](a)',
+            'pc += 2',
+            'a = port_readers[ram[pc]]()',
+            'pc += 1',
+        ),
+    ),
+    # PUSH B; LDAX D; MOV M,A; INX D; LXI B,D16; DAD B
+    (
+        (0xc5, 0x1a, 0x77, 0x13, 0x01, 0x09),
+        (
+            'ram[sp - 2] = c',
+            'ram[sp - 1] = b',
+            'sp -= 2',
+            'pc += 1',
+            'a = ram[(d << 8) | e]',
+            'pc += 1',
+            'ram[(h << 8) | l] = a',
+            'pc += 1',
+            'val = ((d << 8) | e) + 1',
+            'e = val & 0xff',
+            'd = (val >> 8) & 0xff',
+            'pc += 1',
+            'c = ram[pc]',
+            'b = ram[pc + 1]',
+            'pc += 3',
+            'val = ((h << 8) | l) + ((b << 8) | c)',
+            'f = (f & ~CY_FLAG) | (val >> 16)',
+            'l = val & 0xff',
+            'h = (val >> 8) & 0xff',
+        ),
+    ),
+    # LDAX D; MOV M,A; INX D; LXI B,D16; DAD B; POP B
+    (
+        (0x1a, 0x77, 0x13, 0x01, 0x09, 0xc1),
+        (
+            'a = ram[(d << 8) | e]',
+            'pc += 1',
+            'ram[(h << 8) | l] = a',
+            'pc += 1',
+            'val = ((d << 8) | e) + 1',
+            'e = val & 0xff',
+            'd = (val >> 8) & 0xff',
+            'pc += 1',
+            'c = ram[pc]',
+            'b = ram[pc + 1]',
+            'pc += 3',
+            'val = ((h << 8) | l) + ((b << 8) | c)',
+            'f = (f & ~CY_FLAG) | (val >> 16)',
+            'l = val & 0xff',
+            'h = (val >> 8) & 0xff',
+            'pc += 1',
+            'c = ram[sp]',
+            'b = ram[sp + 1]',
+            'sp += 2',
+        ),
+    ),
+]
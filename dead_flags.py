@@ -0,0 +1,26 @@
+import re
+
+# Flag writes that replace f as a whole, the only ones that can be dropped
+FLAG_WRITE = re.compile(r'^f = (ARITH|LOGIC)_PSW\[[^\]]+\]$')
+FLAG = re.compile(r'\bf\b')
+
+
+def drop_dead_flags(bodies):
+    # bodies are the core bodies of straight-line instructions in order,
+    # flag writes overwritten before anything reads them are left out.
+    # The flags are live after the last body. Used by generate.py for the
+    # fused sequences and by block_core.py for the translated blocks.
+    flags_live = True
+    result = []
+    for body in reversed(bodies):
+        body = list(body)
+        flag_lines = [line for line in body if FLAG.search(line)]
+        if len(flag_lines) == 1 and FLAG_WRITE.match(flag_lines[0]):
+            if not flags_live:
+                body.remove(flag_lines[0])
+            flags_live = False
+        elif flag_lines:
+            flags_live = True
+        result.append(body)
+    result.reverse()
+    return result
@@ -0,0 +1,202 @@
+from core_ops import BODIES, FUSED, SIZES
+from flag_tables import ARITH_PSW, INC_DEC_PSW, LOGIC_PSW, DAA, \
+    S_FLAG, Z_FLAG, AC_FLAG, P_FLAG, CY_FLAG, All_FLAG
+
+INDENT = '    '
+STATE = ('a', 'b', 'c', 'd', 'e', 'h', 'l', 'sp', 'pc', 'f', 'ie', 'ram')
+NONLOCAL = f'nonlocal {", ".join(STATE)}'
+
+
+class Halted(Exception):
+    # Raised by HLT to leave the run loop
+    pass
+
+
+# Everything the handler bodies may reference besides the state
+NAMESPACE = {
+    'Halted': Halted,
+    'ARITH_PSW': ARITH_PSW,
+    'INC_DEC_PSW': INC_DEC_PSW,
+    'LOGIC_PSW': LOGIC_PSW,
+    'DAA': DAA,
+    'S_FLAG': S_FLAG,
+    'Z_FLAG': Z_FLAG,
+    'AC_FLAG': AC_FLAG,
+    'P_FLAG': P_FLAG,
+    'CY_FLAG': CY_FLAG,
+    'All_FLAG': All_FLAG,
+}
+
+FACTORY_HEAD = '''def make_core(chip):
+    a = b = c = d = e = h = l = sp = pc = f = 0
+    ie = True
+    ram = chip.ram
+    port_readers = chip.ports.readers
+    port_writers = chip.ports.writers
+
+    def load():
+        NONLOCAL
+        a = chip.a
+        b = chip.b
+        c = chip.c
+        d = chip.d
+        e = chip.e
+        h = chip.high
+        l = chip.low
+        sp = chip.sp
+        pc = chip.pc
+        f = chip._pack_flags()
+        ie = chip.interrupt_enable
+        ram = chip.ram
+
+    def store():
+        chip.a = a
+        chip.b = b
+        chip.c = c
+        chip.d = d
+        chip.e = e
+        chip.high = h
+        chip.low = l
+        chip.sp = sp
+        chip.pc = pc
+        chip._unpack_flags(f)
+        chip.interrupt_enable = ie
+
+    def interrupt():
+        NONLOCAL
+        index = chip.interrupt_index
+        if not ie or index is None:
+            return 0
+        chip.interrupt_index = None
+        chip.halted = False
+        if not 0 <= index < 8:
+            print('Invalid interrupt')
+            return 0
+        ram[sp - 1] = pc >> 8
+        ram[sp - 2] = pc & 0xff
+        sp -= 2
+        pc = index * 8
+        return RST_CYCLES
+
+    def halt():
+        raise Halted
+'''
+
+FACTORY_TAIL = '''
+    def run(budget):
+        NONLOCAL
+        load()
+        memory = ram
+        cycles = interrupt()
+        if chip.halted:
+            return budget
+        executed = 0
+        try:
+            # A fused sequence only runs while it cannot cross the budget,
+            # so it stops exactly where single steps would
+            fused_budget = budget - FUSED_MARGIN
+            handlers = fused
+            while cycles < fused_budget:
+                opcode = memory[pc]
+                pc += 1
+                cycles += handlers[opcode]()
+                executed += 1
+            handlers = ops
+            while cycles < budget:
+                opcode = memory[pc]
+                pc += 1
+                cycles += handlers[opcode]()
+                executed += 1
+        except Halted:
+            chip.halted = True
+            cycles = max(cycles + HLT_CYCLES, budget)
+            executed += 1
+        store()
+        chip.count += executed
+        return cycles
+
+    return run
+'''
+
+_factories = {}
+
+
+def _handler_source(opcode, cycles):
+    body = BODIES[opcode]
+    lines = [f'def op_{opcode:02x}():', f'{INDENT}{NONLOCAL}']
+    if any('cycles' in line for line in body):
+        lines.append(f'{INDENT}cycles = {cycles}')
+        lines += [INDENT + line for line in body]
+        lines.append(f'{INDENT}return cycles')
+    else:
+        lines += [INDENT + line for line in body]
+        lines.append(f'{INDENT}return {cycles}')
+    return lines
+
+
+def _fused_source(opcode, sequences, cycles):
+    # Longest sequence first, each checks the opcode bytes following the
+    # first instruction and falls back to the plain body
+    lines = [f'def fuse_{opcode:02x}():', f'{INDENT}{NONLOCAL}']
+    for opcodes, body in sorted(sequences, key=lambda s: -len(s[0])):
+        checks = []
+        offset = -1
+        for previous, following in zip(opcodes, opcodes[1:]):
+            offset += SIZES[previous]
+            index = f'pc + {offset}' if offset else 'pc'
+            checks.append(f'ram[{index}] == {following:#04x}')
+        lines.append(f'{INDENT}if {" and ".join(checks)}:')
+        lines.append(f'{INDENT * 2}chip.count += {len(opcodes) - 1}')
+        total = sum(cycles[op] for op in opcodes)
+        if any('cycles' in line for line in body):
+            lines.append(f'{INDENT * 2}cycles = {total}')
+            lines += [INDENT * 2 + line for line in body]
+            lines.append(f'{INDENT * 2}return cycles')
+        else:
+            lines += [INDENT * 2 + line for line in body]
+            lines.append(f'{INDENT * 2}return {total}')
+    lines += _handler_source(opcode, cycles[opcode])[2:]
+    return lines
+
+
+def _fused_margin(cycles):
+    # Most cycles a fused sequence runs before its last instruction
+    return max((sum(cycles[op] for op in opcodes[:-1])
+                for opcodes, _ in FUSED), default=0)
+
+
+def core_source(cycles):
+    source = FACTORY_HEAD.replace('NONLOCAL', NONLOCAL)
+    source = source.replace('RST_CYCLES', str(cycles[0xc7]))
+    for opcode in range(0x100):
+        source += '\n'
+        for line in _handler_source(opcode, cycles[opcode]):
+            source += f'{INDENT}{line}\n'
+    source += f'\n{INDENT}ops = [\n'
+    for opcode in range(0x100):
+        source += f'{INDENT * 2}op_{opcode:02x},\n'
+    source += f'{INDENT}]\n'
+    sequences = {}
+    for opcodes, body in FUSED:
+        sequences.setdefault(opcodes[0], []).append((opcodes, body))
+    for opcode in sorted(sequences):
+        source += '\n'
+        for line in _fused_source(opcode, sequences[opcode], cycles):
+            source += f'{INDENT}{line}\n'
+    source += f'\n{INDENT}fused = list(ops)\n'
+    for opcode in sorted(sequences):
+        source += f'{INDENT}fused[{opcode:#04x}] = fuse_{opcode:02x}\n'
+    source += FACTORY_TAIL.replace('NONLOCAL', NONLOCAL) \
+        .replace('HLT_CYCLES', str(cycles[0x76])) \
+        .replace('FUSED_MARGIN', str(_fused_margin(cycles)))
+    return source
+
+
+def make_core(chip):
+    key = tuple(chip.CYCLES)
+    if key not in _factories:
+        namespace = dict(NAMESPACE)
+        code = compile(core_source(key), '<fast_core>', 'exec')
+        exec(code, namespace)
+        _factories[key] = namespace['make_core']
+    return _factories[key](chip)
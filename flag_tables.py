@@ -0,0 +1,98 @@
+from array import array
+
+S_FLAG = 0x80
+Z_FLAG = 0x40
+AC_FLAG = 0x10
+P_FLAG = 0x04
+CY_FLAG = 0x01
+
+All_FLAG = Z_FLAG | S_FLAG | P_FLAG | CY_FLAG | AC_FLAG
+
+
+def _parity(val):
+    return bin(val & 0xff).count('1') % 2 == 0
+
+
+def _sign(val):
+    return (val & 0x80) == 0x80
+
+
+def _zero(val):
+    return (val & 0xff) == 0
+
+
+def _aux_carry(val):
+    return (val & 0b00011111) > 0x0f
+
+
+# (S, Z, AC, P, CY) indexed by the 9-bit result of add/sub/cmp.
+# For subtraction `val & 0x1ff` of a negative result has bit 8 set,
+# so the same table yields the borrow in CY.
+ARITH_FLAGS = [
+    (_sign(i), _zero(i), _aux_carry(i), _parity(i), i > 0xff)
+    for i in range(0x200)
+]
+
+# (S, Z, AC, P) indexed by the 8-bit result of inr/dcr, CY is untouched
+INC_DEC_FLAGS = [
+    (_sign(i), _zero(i), _aux_carry(i), _parity(i))
+    for i in range(0x100)
+]
+
+# (S, Z, AC, P, CY) indexed by the 8-bit result of ana/xra/ora
+LOGIC_FLAGS = [
+    (_sign(i), _zero(i), False, _parity(i), False)
+    for i in range(0x100)
+]
+
+
+def _pack(flags):
+    val = 0
+    for flag, mask in zip(flags, (S_FLAG, Z_FLAG, AC_FLAG, P_FLAG, CY_FLAG)):
+        if flag:
+            val |= mask
+    return val
+
+
+def _daa(a, cy, ac):
+    # As the chips always computed it: the +6 on the low nibble may set CY
+    # for the high one, the low nibble itself is kept as it was
+    low = a & 0x0f
+    if low or ac:
+        val = a + 6
+        cy = val > 0xff
+        a = val & 0xff
+    high = a >> 4
+    if high > 9 or cy:
+        high += 6
+    return (high << 4) | low
+
+
+# 9-bit DAA result indexed by A | (PSW & 0x11) << 8, i.e. CY in bit 8 and
+# AC in bit 12. The flags then come from ARITH_FLAGS like for an add.
+DAA = array('H', bytes(0x4000))
+for i in range(0x100):
+    for psw in (0, CY_FLAG, AC_FLAG, AC_FLAG | CY_FLAG):
+        DAA[i | (psw << 8)] = _daa(i, psw & CY_FLAG, psw & AC_FLAG)
+
+
+# Same tables with the flags packed into a PSW byte
+ARITH_PSW = [_pack(flags) for flags in ARITH_FLAGS]
+INC_DEC_PSW = [_pack(flags) for flags in INC_DEC_FLAGS]
+LOGIC_PSW = [_pack(flags) for flags in LOGIC_FLAGS]
+
+# Lazy flags keep the last result instead of the PSW, the high bits tell
+# which table materialises it. Arith results are stored unmasked, negative
+# ones land at the top of the table.
+LAZY_LOGIC = 0x200
+LAZY_INC_DEC = 0x400
+LAZY_VALUE = 0x800
+
+LAZY_PSW = [0] * 0x1000
+for i in range(0x200):
+    LAZY_PSW[i] = ARITH_PSW[i]
+    LAZY_PSW[LAZY_INC_DEC | i] = INC_DEC_PSW[i & 0xff] | (i >> 8)
+    LAZY_PSW[LAZY_VALUE | i] = i & 0xff
+for i in range(0x100):
+    LAZY_PSW[LAZY_LOGIC | i] = LOGIC_PSW[i]
+    LAZY_PSW[0xf00 | i] = ARITH_PSW[0x100 | i]
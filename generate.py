@@ -1,5 +1,61 @@
+import re
+
+from dead_flags import drop_dead_flags
+
 INDENT = '    '
 DECLARE_PTR_FROM_HIGH_LOW = 'ptr = (self.high << 8) | self.low'
+PLAIN_BACKEND = {
+    'arith': 'self.S, self.Z, self.AC, self.P, self.CY = '
+             'ARITH_FLAGS[val & 0x1ff]',
+    'inc_dec': 'self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]',
+    'logic': 'self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]',
+    'cy': 'self.CY',
+    'carry': 'self.CY',
+    'daa_index': 'self.a | (self.CY << 8) | (self.AC << 12)',
+    'flag': 'self.{}',
+    'set_cy': 'self.CY = {} == 1',
+    'stc': 'self.CY = True',
+    'cmc': 'self.CY = not self.CY',
+    'carry16': 'self.CY = val > 0xffff',
+    'push_psw': 'self.ram[self.sp - 2] = self._pack_flags()',
+    'pop_psw': 'self._unpack_flags(self.ram[self.sp])',
+}
+PACKED_BACKEND = {
+    'arith': 'self.flags = ARITH_PSW[val & 0x1ff]',
+    'inc_dec': 'self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]',
+    'logic': 'self.flags = LOGIC_PSW[val]',
+    'cy': 'self.flags & CY_FLAG',
+    'carry': '(self.flags & CY_FLAG)',
+    'daa_index': 'self.a | ((self.flags & 0x11) << 8)',
+    'flag': 'self.flags & {}_FLAG',
+    'set_cy': 'self.flags = (self.flags & ~CY_FLAG) | {}',
+    'stc': 'self.flags |= CY_FLAG',
+    'cmc': 'self.flags ^= CY_FLAG',
+    'carry16': 'self.flags = (self.flags & ~CY_FLAG) | (val >> 16)',
+    'push_psw': 'self.ram[self.sp - 2] = self.flags',
+    'pop_psw': 'self.flags = self.ram[self.sp] & All_FLAG',
+}
+LAZY_BACKEND = dict(
+    PACKED_BACKEND,
+    arith='self._lazy = val',
+    inc_dec='self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)',
+    logic='self._lazy = LAZY_LOGIC | val',
+)
+# Reads flags through the properties of the packed and lazy chips, so the
+# handlers serve all three
+PROFILED_BACKEND = dict(PLAIN_BACKEND, profile=True)
+backend = PLAIN_BACKEND
+# Condition codes as (negation, flag)
+FLAG_CONDITION = {
+    'NZ': ('not ', 'Z'),
+    'Z': ('', 'Z'),
+    'NC': ('not ', 'CY'),
+    'C': ('', 'CY'),
+    'PO': ('not ', 'P'),
+    'PE': ('', 'P'),
+    'P': ('not ', 'S'),
+    'M': ('', 'S'),
+}
 
 
 def h_l2high_low(s):
@@ -16,21 +72,34 @@ def operation_on_str(s, val):
 
 
 def to_function_str(data):
-    global not_implement_count
     opcode = data[0]
     desc = data[1]
     key = desc.split(' ')[0]
 
     handlers = {
+        'NOP': nop,
         'LXI': lxi,
         'STAX': stax,
         'INX': inx,
         'INR': inr,
         'DCR': dcr,
         'MVI': mvi,
+        'RLC': rlc,
+        'RRC': rrc,
+        'RAL': ral,
+        'RAR': rar,
         'DAD': dad,
         'LDAX': ldax,
         'DCX': dcx,
+        'SHLD': shld,
+        'LHLD': lhld,
+        'STA': sta,
+        'LDA': lda,
+        'DAA': daa,
+        'CMA': cma,
+        'STC': stc,
+        'CMC': cmc,
+        'HLT': hlt,
         'MOV': mov,
         'ADD': add,
         'ADC': adc,
@@ -40,23 +109,55 @@ def to_function_str(data):
         'XRA': xra,
         'ORA': ora,
         'CMP': cmp,
+        'ADI': add,
+        'ACI': adc,
+        'SUI': sub,
+        'SBI': sbb,
+        'ANI': ana,
+        'XRI': xra,
+        'ORI': ora,
+        'CPI': cmp,
         'POP': pop,
         'PUSH': push,
         'RST': rst,
+        'JMP': jmp,
+        'CALL': call,
+        'RET': ret,
+        'OUT': out,
+        'IN': port_in,
+        'XTHL': xthl,
+        'PCHL': pchl,
+        'SPHL': sphl,
+        'XCHG': xchg,
+        'DI': di,
+        'EI': ei,
     }
-    buffer = ''
-    buffer += f'# {desc}\n'
-    buffer += f'def i{opcode}(self):\n'
-    if key in handlers:
+    if key[0] in 'RJC' and key[1:] in FLAG_CONDITION:
+        code = conditional(key, opcode)
+    elif key in handlers:
         code = handlers[key](desc)
-        for line in code:
-            buffer += f'{INDENT}{line}\n'
-        buffer += '\n\n'
-        return True, buffer
     else:
-        buffer += f'{INDENT}pass\n'
-        buffer += '\n\n'
-        return False, buffer
+        raise Exception(f'Not expected, {desc}')
+    buffer = f'{INDENT}# {desc}\n'
+    buffer += f'{INDENT}def i{opcode}(self):\n'
+    for line in code:
+        buffer += f'{INDENT * 2}{line}\n'
+    return buffer
+
+
+def alu_operand(desc):
+    # Lines to run first and the operand expression for a register, M or
+    # the immediate byte
+    item = desc.split(' ')[1].lower()
+    if item == 'm':
+        return [DECLARE_PTR_FROM_HIGH_LOW], 'self.ram[ptr]'
+    if item == 'd8':
+        return [], 'self._read()'
+    return [], f'self.{h_l2high_low(item)}'
+
+
+def nop(desc):
+    return ['pass']
 
 
 def lxi(desc):
@@ -126,14 +227,14 @@ def inr(desc):
         code = [
             DECLARE_PTR_FROM_HIGH_LOW,
             'val = self.ram[ptr] + 1',
-            'self._update_arith_flag(val, Z_FLAG | S_FLAG | P_FLAG | AC_FLAG)',
+            backend['inc_dec'],
             f'self.ram[ptr] = val & 0xff',
         ]
     else:
         dst = h_l2high_low(dst)
         code = [
             f'val = self.{dst} + 1',
-            'self._update_arith_flag(val, Z_FLAG | S_FLAG | P_FLAG | AC_FLAG)',
+            backend['inc_dec'],
             f'self.{dst} = val & 0xff',
         ]
     return code
@@ -146,14 +247,14 @@ def dcr(desc):
         code = [
             DECLARE_PTR_FROM_HIGH_LOW,
             'val = self.ram[ptr] - 1',
-            'self._update_arith_flag(val, Z_FLAG | S_FLAG | P_FLAG | AC_FLAG)',
+            backend['inc_dec'],
             f'self.ram[ptr] = val & 0xff',
         ]
     else:
         dst = h_l2high_low(dst)
         code = [
             f'val = self.{dst} - 1',
-            'self._update_arith_flag(val, Z_FLAG | S_FLAG | P_FLAG | AC_FLAG)',
+            backend['inc_dec'],
             f'self.{dst} = val & 0xff',
         ]
     return code
@@ -194,7 +295,7 @@ def dad(desc):
             f'val += (self.{src} << 8) | self.{next}',
         ]
     post_common = [
-        'self.CY = val > 0xffff',
+        backend['carry16'],
         'self.low = val & 0xff',
         'self.high = (val >> 8) & 0xff',
     ]
@@ -258,176 +359,165 @@ def mov(desc):
 
 
 def add(desc):
-    add_item = desc.split(' ')[1]
-    add_item = add_item.lower()
-    if add_item == 'm':
-        code = [
-            DECLARE_PTR_FROM_HIGH_LOW,
-            'val = self.a + self.ram[ptr]',
-            'self._update_arith_flag(val, All_FLAG)',
-            'self.a = val & 0xff',
-        ]
-    else:
-        add_item = h_l2high_low(add_item)
-        code = [
-            f'val = self.a + self.{add_item}',
-            'self._update_arith_flag(val, All_FLAG)',
-            'self.a = val & 0xff',
-        ]
-    return code
+    code, operand = alu_operand(desc)
+    return code + [
+        f'val = self.a + {operand}',
+        backend['arith'],
+        'self.a = val & 0xff',
+    ]
 
 
 def adc(desc):
-    add_item = desc.split(' ')[1]
-    add_item = add_item.lower()
-    if add_item == 'm':
-        code = [
-            DECLARE_PTR_FROM_HIGH_LOW,
-            'val = self.a + self.ram[ptr]',
-            'if self.CY:',
-            f'{INDENT}val += 1',
-            'self._update_arith_flag(val, All_FLAG)',
-            'self.a = val & 0xff',
-        ]
-    else:
-        add_item = h_l2high_low(add_item)
-        code = [
-            f'val = self.a + self.{add_item}',
-            'if self.CY:',
-            f'{INDENT}val += 1',
-            'self._update_arith_flag(val, All_FLAG)',
-            'self.a = val & 0xff',
-        ]
-    return code
+    code, operand = alu_operand(desc)
+    return code + [
+        f'val = self.a + {operand} + {backend["carry"]}',
+        backend['arith'],
+        'self.a = val & 0xff',
+    ]
 
 
 def sub(desc):
-    sub_item = desc.split(' ')[1]
-    sub_item = sub_item.lower()
-    sub_item = h_l2high_low(sub_item)
-    if sub_item == 'm':
-        code = [
-            DECLARE_PTR_FROM_HIGH_LOW,
-            'val = self.a - self.ram[ptr]',
-            'self._update_arith_flag(val, All_FLAG)',
-            'self.CY = val < 0',
-            'self.a = val & 0xff',
-        ]
-    else:
-        sub_item = h_l2high_low(sub_item)
-        code = [
-            f'val = self.a - self.{sub_item}',
-            'self._update_arith_flag(val, All_FLAG)',
-            'self.CY = val < 0',
-            'self.a = val & 0xff',
-        ]
-    return code
+    code, operand = alu_operand(desc)
+    return code + [
+        f'val = self.a - {operand}',
+        backend['arith'],
+        'self.a = val & 0xff',
+    ]
 
 
 def sbb(desc):
-    sub_item = desc.split(' ')[1]
-    sub_item = sub_item.lower()
-    if sub_item == 'm':
-        code = [
-            DECLARE_PTR_FROM_HIGH_LOW,
-            'val = self.a - self.ram[ptr]',
-            'if self.CY:',
-            f'{INDENT}val -= 1',
-            'self._update_arith_flag(val, All_FLAG)',
-            'self.CY = val < 0',
-            'self.a = val & 0xff',
-        ]
-    else:
-        sub_item = h_l2high_low(sub_item)
-        code = [
-            f'val = self.a - self.{sub_item}',
-            'if self.CY:',
-            f'{INDENT}val -= 1',
-            'self._update_arith_flag(val, All_FLAG)',
-            'self.CY = val < 0',
-            'self.a = val & 0xff',
-        ]
-    return code
+    code, operand = alu_operand(desc)
+    return code + [
+        f'val = self.a - {operand} - {backend["carry"]}',
+        backend['arith'],
+        'self.a = val & 0xff',
+    ]
 
 
 def ana(desc):
-    and_item = desc.split(' ')[1]
-    and_item = and_item.lower()
-    if and_item == 'm':
-        code = [
-            DECLARE_PTR_FROM_HIGH_LOW,
-            'val = self.a & self.ram[ptr]',
-            'self._update_logic_flag(val, All_FLAG)',
-            'self.a = val & 0xff',
-        ]
-    else:
-        and_item = h_l2high_low(and_item)
-        code = [
-            f'val = self.a & self.{and_item}',
-            'self._update_logic_flag(val, All_FLAG)',
-            'self.a = val & 0xff',
-        ]
-    return code
+    code, operand = alu_operand(desc)
+    return code + [
+        f'val = self.a & {operand}',
+        backend['logic'],
+        'self.a = val & 0xff',
+    ]
 
 
 def xra(desc):
-    xor_item = desc.split(' ')[1]
-    xor_item = xor_item.lower()
-    if xor_item == 'm':
-        code = [
-            DECLARE_PTR_FROM_HIGH_LOW,
-            'val = self.a ^ self.ram[ptr]',
-            'self._update_logic_flag(val, All_FLAG)',
-            'self.a = val & 0xff',
-        ]
-    else:
-        xor_item = h_l2high_low(xor_item)
-        code = [
-            f'val = self.a ^ self.{xor_item}',
-            'self._update_logic_flag(val, All_FLAG)',
-            'self.a = val & 0xff',
-        ]
-    return code
+    code, operand = alu_operand(desc)
+    return code + [
+        f'val = self.a ^ {operand}',
+        backend['logic'],
+        'self.a = val & 0xff',
+    ]
 
 
 def ora(desc):
-    or_item = desc.split(' ')[1]
-    or_item = or_item.lower()
-    if or_item == 'm':
-        code = [
-            DECLARE_PTR_FROM_HIGH_LOW,
-            'val = self.a | self.ram[ptr]',
-            'self._update_logic_flag(val, All_FLAG)',
-            'self.a = val & 0xff',
-        ]
-    else:
-        or_item = h_l2high_low(or_item)
-        code = [
-            f'val = self.a | self.{or_item}',
-            'self._update_logic_flag(val, All_FLAG)',
-            'self.a = val & 0xff',
-        ]
-    return code
+    code, operand = alu_operand(desc)
+    return code + [
+        f'val = self.a | {operand}',
+        backend['logic'],
+        'self.a = val & 0xff',
+    ]
 
 
 def cmp(desc):
-    sub_item = desc.split(' ')[1]
-    sub_item = sub_item.lower()
-    if sub_item == 'm':
-        code = [
-            DECLARE_PTR_FROM_HIGH_LOW,
-            'val = self.a - self.ram[ptr]',
-            'self._update_arith_flag(val, All_FLAG)',
-            'self.CY = val < 0',
-        ]
-    else:
-        sub_item = h_l2high_low(sub_item)
-        code = [
-            f'val = self.a - self.{sub_item}',
-            'self._update_arith_flag(val, All_FLAG)',
-            'self.CY = val < 0',
-        ]
-    return code
+    code, operand = alu_operand(desc)
+    return code + [
+        f'val = self.a - {operand}',
+        backend['arith'],
+    ]
+
+
+def rlc(desc):
+    return [
+        'bit7 = self.a >> 7',
+        backend['set_cy'].format('bit7'),
+        'self.a = (self.a << 1 | bit7) & 0xff',
+    ]
+
+
+def rrc(desc):
+    return [
+        'bit0 = self.a & 0x01',
+        backend['set_cy'].format('bit0'),
+        'self.a = (self.a >> 1 | (bit0 << 7)) & 0xff',
+    ]
+
+
+def ral(desc):
+    # A is not written back, the cores keep this as well
+    return [
+        'bit7 = self.a >> 7',
+        'val = (self.a << 1) & 0xff',
+        f'if {backend["cy"]}:',
+        f'{INDENT}val |= 0x01',
+        backend['set_cy'].format('bit7'),
+    ]
+
+
+def rar(desc):
+    return [
+        'bit0 = self.a & 0x01',
+        'self.a = self.a >> 1',
+        f'if {backend["cy"]}:',
+        f'{INDENT}self.a |= 0x80',
+        backend['set_cy'].format('bit0'),
+    ]
+
+
+def shld(desc):
+    return [
+        'address = self._get_address16()',
+        'self.ram[address] = self.low',
+        'self.ram[address + 1] = self.high',
+    ]
+
+
+def lhld(desc):
+    return [
+        'address = self._get_address16()',
+        'self.low = self.ram[address]',
+        'self.high = self.ram[address + 1]',
+    ]
+
+
+def sta(desc):
+    return [
+        'address = self._get_address16()',
+        'self.ram[address] = self.a',
+    ]
+
+
+def lda(desc):
+    return [
+        'address = self._get_address16()',
+        'self.a = self.ram[address]',
+    ]
+
+
+def daa(desc):
+    return [
+        f'val = DAA[{backend["daa_index"]}]',
+        backend['arith'],
+        'self.a = val & 0xff',
+    ]
+
+
+def cma(desc):
+    return ['self.a ^= 0xff']
+
+
+def stc(desc):
+    return [backend['stc']]
+
+
+def cmc(desc):
+    return [backend['cmc']]
+
+
+def hlt(desc):
+    return ['self.halted = True']
 
 
 def pop(desc):
@@ -440,12 +530,7 @@ def pop(desc):
         ]
     elif item == 'psw':
         code = [
-            'val = self.ram[self.sp]',
-            'self.S = (val & S_FLAG) == S_FLAG',
-            'self.Z = (val & Z_FLAG) == Z_FLAG',
-            'self.AC = (val & AC_FLAG) == AC_FLAG',
-            'self.P = (val & P_FLAG) == P_FLAG',
-            'self.CY = (val & CY_FLAG) == CY_FLAG',
+            backend['pop_psw'],
             'self.a = self.ram[self.sp + 1]',
         ]
     else:
@@ -470,18 +555,7 @@ def push(desc):
         ]
     elif item == 'psw':
         code = [
-            'val = 0',
-            'if self.S:',
-            f'{INDENT}val |= S_FLAG',
-            'if self.Z:',
-            f'{INDENT}val |= Z_FLAG',
-            'if self.AC:',
-            f'{INDENT}val |= AC_FLAG',
-            'if self.P:',
-            f'{INDENT}val |= P_FLAG',
-            'if self.CY:',
-            f'{INDENT}val |= CY_FLAG',
-            'self.ram[self.sp - 2] = val',
+            backend['push_psw'],
             'self.ram[self.sp - 1] = self.a',
         ]
     else:
@@ -514,22 +588,579 @@ def rst(desc):
     raise Exception('Not expected in rst')
 
 
-output_buffer = ''
-to_implement = ''
+def jmp(desc):
+    return ['self.pc = self._get_address16()']
+
+
+def call(desc):
+    return ['self._call(self._get_address16())']
+
+
+def ret(desc):
+    return ['self._ret()']
+
+
+def conditional(key, opcode):
+    # Rcc and Ccc return False when not taken, see CYCLES_NOT_TAKEN
+    negation, flag = FLAG_CONDITION[key[1:]]
+    test = negation + backend['flag'].format(flag)
+    profiled = 'profile' in backend
+    if key[0] == 'J':
+        code = [
+            'address = self._get_address16()',
+            f'if {test}:',
+            f'{INDENT}self.pc = address',
+        ]
+        if profiled:
+            code += [
+                f'{INDENT}self.profile.taken[{opcode}] += 1',
+                'else:',
+                f'{INDENT}self.profile.not_taken[{opcode}] += 1',
+            ]
+        return code
+    if key[0] == 'R':
+        code = [f'if {test}:', f'{INDENT}self._ret()']
+    else:
+        code = [
+            'address = self._get_address16()',
+            f'if {test}:',
+            f'{INDENT}self._call(address)',
+        ]
+    if profiled:
+        code.append(f'{INDENT}self.profile.taken[{opcode}] += 1')
+    code.append('else:')
+    if profiled:
+        code.append(f'{INDENT}self.profile.not_taken[{opcode}] += 1')
+    code.append(f'{INDENT}return False')
+    return code
+
+
+def out(desc):
+    return ['self.ports.writers[self._read()](self.a)']
+
+
+def port_in(desc):
+    return ['self.a = self.ports.readers[self._read()]()']
+
+
+def xthl(desc):
+    return [
+        'val = self.ram[self.sp]',
+        'self.ram[self.sp] = self.low',
+        'self.low = val',
+        'val = self.ram[self.sp + 1]',
+        'self.ram[self.sp + 1] = self.high',
+        'self.high = val',
+    ]
+
+
+def pchl(desc):
+    return ['self.pc = (self.high << 8) | self.low']
+
+
+def sphl(desc):
+    return ['self.sp = (self.high << 8) | self.low']
+
+
+def xchg(desc):
+    return [
+        'self.d, self.high = self.high, self.d',
+        'self.e, self.low = self.low, self.e',
+    ]
+
+
+def di(desc):
+    return ['self.interrupt_enable = False', "print('Disable interrupt')"]
+
+
+def ei(desc):
+    return ['self.interrupt_enable = True']
+
+
+# Core backend -------------------------------------------------------------
+# Bodies for the closure core, state lives in the locals
+# a, b, c, d, e, h, l, sp, pc, f (packed flags) and ie.
+# Memory is always accessed as `ram[...]` without nested brackets,
+# conditional timing is expressed as `cycles -= 6` on the not-taken path.
+REG = {
+    'B': 'b', 'C': 'c', 'D': 'd', 'E': 'e', 'H': 'h', 'L': 'l', 'A': 'a',
+}
+PAIR = {
+    'B': ('b', 'c'),
+    'D': ('d', 'e'),
+    'H': ('h', 'l'),
+}
+CONDITION = {
+    'NZ': 'not f & Z_FLAG',
+    'Z': 'f & Z_FLAG',
+    'NC': 'not f & CY_FLAG',
+    'C': 'f & CY_FLAG',
+    'PO': 'not f & P_FLAG',
+    'PE': 'f & P_FLAG',
+    'P': 'not f & S_FLAG',
+    'M': 'f & S_FLAG',
+}
+HL = '(h << 8) | l'
+READ_ADR = 'adr = ram[pc] | (ram[pc + 1] << 8)'
+ARITH_OPERATORS = {
+    'ADD': '+',
+    'ADC': '+',
+    'SUB': '-',
+    'SBB': '-',
+    'CMP': '-',
+    'ADI': '+',
+    'ACI': '+',
+    'SUI': '-',
+    'SBI': '-',
+    'CPI': '-',
+}
+LOGIC_OPERATORS = {
+    'ANA': '&',
+    'XRA': '^',
+    'ORA': '|',
+    'ANI': '&',
+    'XRI': '^',
+    'ORI': '|',
+}
+
+
+def core_operand(item):
+    if item == 'M':
+        return f'ram[{HL}]'
+    return REG[item]
+
+
+def core_push_pc():
+    return [
+        'ram[sp - 1] = pc >> 8',
+        'ram[sp - 2] = pc & 0xff',
+        'sp -= 2',
+    ]
+
+
+def core_pop_pc():
+    return [
+        'pc = ram[sp] | (ram[sp + 1] << 8)',
+        'sp += 2',
+    ]
+
+
+def core_lxi(item):
+    if item == 'SP':
+        return [
+            'sp = ram[pc] | (ram[pc + 1] << 8)',
+            'pc += 2',
+        ]
+    high, low = PAIR[item]
+    return [
+        f'{low} = ram[pc]',
+        f'{high} = ram[pc + 1]',
+        'pc += 2',
+    ]
+
+
+def core_inx_dcx(item, operator):
+    if item == 'SP':
+        return [f'sp = (sp {operator} 1) & 0xff']
+    high, low = PAIR[item]
+    return [
+        f'val = (({high} << 8) | {low}) {operator} 1',
+        f'{low} = val & 0xff',
+        f'{high} = (val >> 8) & 0xff',
+    ]
+
+
+def core_inr_dcr(item, operator):
+    flag = 'f = (f & CY_FLAG) | INC_DEC_PSW[val & 0xff]'
+    if item == 'M':
+        return [
+            f'adr = {HL}',
+            f'val = ram[adr] {operator} 1',
+            flag,
+            'ram[adr] = val & 0xff',
+        ]
+    reg = REG[item]
+    return [
+        f'val = {reg} {operator} 1',
+        flag,
+        f'{reg} = val & 0xff',
+    ]
+
+
+def core_dad(item):
+    if item == 'SP':
+        code = [f'val = ({HL}) + sp']
+    elif item == 'H':
+        code = [f'val = ({HL}) << 1']
+    else:
+        high, low = PAIR[item]
+        code = [f'val = ({HL}) + (({high} << 8) | {low})']
+    return code + [
+        'f = (f & ~CY_FLAG) | (val >> 16)',
+        'l = val & 0xff',
+        'h = (val >> 8) & 0xff',
+    ]
+
+
+def core_arith(key, operand):
+    code = [f'val = a {ARITH_OPERATORS[key]} {operand}']
+    if key in ('ADC', 'ACI'):
+        code = [f'val = a + {operand} + (f & CY_FLAG)']
+    elif key in ('SBB', 'SBI'):
+        code = [f'val = a - {operand} - (f & CY_FLAG)']
+    code.append('f = ARITH_PSW[val & 0x1ff]')
+    if key not in ('CMP', 'CPI'):
+        code.append('a = val & 0xff')
+    return code
+
+
+def core_logic(key, operand):
+    return [
+        f'a {LOGIC_OPERATORS[key]}= {operand}',
+        'f = LOGIC_PSW[a]',
+    ]
+
+
+def core_conditional(key, condition):
+    test = CONDITION[condition]
+    if key == 'R':
+        return [f'if {test}:'] + \
+            [INDENT + line for line in core_pop_pc()] + \
+            ['else:', f'{INDENT}cycles -= 6']
+    if key == 'J':
+        return [
+            f'if {test}:',
+            f'{INDENT}pc = ram[pc] | (ram[pc + 1] << 8)',
+            'else:',
+            f'{INDENT}pc += 2',
+        ]
+    return [
+        f'if {test}:',
+        f'{INDENT}{READ_ADR}',
+        f'{INDENT}pc += 2',
+    ] + [INDENT + line for line in core_push_pc()] + [
+        f'{INDENT}pc = adr',
+        'else:',
+        f'{INDENT}pc += 2',
+        f'{INDENT}cycles -= 6',
+    ]
+
+
+def to_core_body(desc):
+    key = desc.split(' ')[0]
+    args = desc.split(' ')[1].split(',') if ' ' in desc else []
+    item = args[0] if args else None
+
+    if key == 'NOP':
+        return []
+    if key == 'LXI':
+        return core_lxi(item)
+    if key == 'STAX':
+        high, low = PAIR[item]
+        return [f'ram[({high} << 8) | {low}] = a']
+    if key == 'LDAX':
+        high, low = PAIR[item]
+        return [f'a = ram[({high} << 8) | {low}]']
+    if key == 'INX':
+        return core_inx_dcx(item, '+')
+    if key == 'DCX':
+        return core_inx_dcx(item, '-')
+    if key == 'INR':
+        return core_inr_dcr(item, '+')
+    if key == 'DCR':
+        return core_inr_dcr(item, '-')
+    if key == 'MVI':
+        if item == 'M':
+            return [f'ram[{HL}] = ram[pc]', 'pc += 1']
+        return [f'{REG[item]} = ram[pc]', 'pc += 1']
+    if key == 'DAD':
+        return core_dad(item)
+    if key == 'MOV':
+        dst, src = args
+        if dst == src:
+            return []
+        if dst == 'M':
+            return [f'ram[{HL}] = {REG[src]}']
+        return [f'{REG[dst]} = {core_operand(src)}']
+    if key in ('ADD', 'ADC', 'SUB', 'SBB', 'CMP'):
+        return core_arith(key, core_operand(item))
+    if key in ('ADI', 'ACI', 'SUI', 'SBI', 'CPI'):
+        return core_arith(key, 'ram[pc]') + ['pc += 1']
+    if key in ('ANA', 'XRA', 'ORA'):
+        return core_logic(key, core_operand(item))
+    if key in ('ANI', 'XRI', 'ORI'):
+        return core_logic(key, 'ram[pc]') + ['pc += 1']
+    if key == 'RLC':
+        return [
+            'bit7 = a >> 7',
+            'f = (f & ~CY_FLAG) | bit7',
+            'a = ((a << 1) | bit7) & 0xff',
+        ]
+    if key == 'RRC':
+        return [
+            'bit0 = a & 0x01',
+            'f = (f & ~CY_FLAG) | bit0',
+            'a = (a >> 1) | (bit0 << 7)',
+        ]
+    if key == 'RAL':
+        # Same as I8080Chip.i0x17, A is not written back
+        return [
+            'bit7 = a >> 7',
+            'val = ((a << 1) & 0xff) | (f & CY_FLAG)',
+            'f = (f & ~CY_FLAG) | bit7',
+        ]
+    if key == 'RAR':
+        return [
+            'bit0 = a & 0x01',
+            'a = (a >> 1) | ((f & CY_FLAG) << 7)',
+            'f = (f & ~CY_FLAG) | bit0',
+        ]
+    if key == 'SHLD':
+        return [READ_ADR, 'pc += 2', 'ram[adr] = l', 'ram[adr + 1] = h']
+    if key == 'LHLD':
+        return [READ_ADR, 'pc += 2', 'l = ram[adr]', 'h = ram[adr + 1]']
+    if key == 'STA':
+        return [READ_ADR, 'pc += 2', 'ram[adr] = a']
+    if key == 'LDA':
+        return [READ_ADR, 'pc += 2', 'a = ram[adr]']
+    if key == 'DAA':
+        return [
+            'val = DAA[a | ((f & 0x11) << 8)]',
+            'f = ARITH_PSW[val & 0x1ff]',
+            'a = val & 0xff',
+        ]
+    if key == 'CMA':
+        return ['a ^= 0xff']
+    if key == 'STC':
+        return ['f |= CY_FLAG']
+    if key == 'CMC':
+        return ['f ^= CY_FLAG']
+    if key == 'HLT':
+        return ['halt()']
+    if key == 'POP':
+        if item == 'PSW':
+            return ['f = ram[sp] & All_FLAG', 'a = ram[sp + 1]', 'sp += 2']
+        high, low = PAIR[item]
+        return [f'{low} = ram[sp]', f'{high} = ram[sp + 1]', 'sp += 2']
+    if key == 'PUSH':
+        if item == 'PSW':
+            return ['ram[sp - 2] = f', 'ram[sp - 1] = a', 'sp -= 2']
+        high, low = PAIR[item]
+        return [f'ram[sp - 2] = {low}', f'ram[sp - 1] = {high}', 'sp -= 2']
+    if key == 'RST':
+        return core_push_pc() + [f'pc = {int(item) * 8:#04x}']
+    if key == 'RET':
+        return core_pop_pc()
+    if key == 'JMP':
+        return ['pc = ram[pc] | (ram[pc + 1] << 8)']
+    if key == 'CALL':
+        return [READ_ADR, 'pc += 2'] + core_push_pc() + ['pc = adr']
+    if key[0] in 'RJC' and key[1:] in CONDITION:
+        return core_conditional(key[0], key[1:])
+    if key == 'OUT':
+        return ['port_writers[ram[pc]](a)', 'pc += 1']
+    if key == 'IN':
+        return ['a = port_readers[ram[pc]]()', 'pc += 1']
+    if key == 'XTHL':
+        return [
+            'val = ram[sp]',
+            'ram[sp] = l',
+            'l = val',
+            'val = ram[sp + 1]',
+            'ram[sp + 1] = h',
+            'h = val',
+        ]
+    if key == 'PCHL':
+        return [f'pc = {HL}']
+    if key == 'SPHL':
+        return [f'sp = {HL}']
+    if key == 'XCHG':
+        return ['d, h = h, d', 'e, l = l, e']
+    if key == 'DI':
+        return ['ie = False', "print('Disable interrupt')"]
+    if key == 'EI':
+        # A pending interrupt is taken right away, as step_run would on the
+        # next step
+        return [
+            'ie = True',
+            'index = chip.interrupt_index',
+            'if index is not None:',
+            f'{INDENT}chip.interrupt_index = None',
+        ] + [INDENT + line for line in core_push_pc()] + [
+            f'{INDENT}pc = index * 8',
+            f'{INDENT}cycles += 11',
+        ]
+    raise Exception(f'Not expected in core, {desc}')
+
+
+CORE_HEADER = '''# Auto generated by generate.py from opcode_gen/opcode_data.txt, do not edit.
+# One tuple of source lines per opcode, see fast_core.py, plus the
+# instruction sizes, whether the opcode ends a basic block, the mnemonics
+# and the fused bodies of the hot opcode sequences.
+BODIES = [
+'''
+
+
+OPS_HEADER = '''# Auto generated by generate.py from opcode_gen/opcode_data.txt, do not edit.
+# The method handlers of I8080Chip, its dispatch list by name and the cycle
+# tables. PackedOps and LazyOps only hold the handlers that differ for the
+# packed and lazy flag chips, ProfiledOps the conditional ones counting
+# taken branches while profiling.
+from flag_tables import ARITH_FLAGS, INC_DEC_FLAGS, LOGIC_FLAGS, \\
+    ARITH_PSW, INC_DEC_PSW, LOGIC_PSW, LAZY_INC_DEC, LAZY_LOGIC, DAA, \\
+    Z_FLAG, P_FLAG, S_FLAG, CY_FLAG, All_FLAG
+
+'''
+
+
+def ends_block(desc):
+    key = desc.split(' ')[0]
+    if key in ('JMP', 'CALL', 'RET', 'RST', 'PCHL', 'HLT', 'EI'):
+        return True
+    return key[0] in 'RJC' and key[1:] in CONDITION
+
+
+PC_STEP = re.compile(r'^pc \+= (\d+)$')
+
+
+def core_fuse(descs):
+    # One body for a straight-line sequence: the opcode byte between two
+    # instructions is stepped over and flags overwritten before anything
+    # reads them are not computed.
+    bodies = drop_dead_flags([to_core_body(desc) for desc in descs])
+
+    lines = []
+    for index, body in enumerate(bodies):
+        if index:
+            lines.append('pc += 1')
+        lines += body
+    # Consecutive pc steps become one
+    merged = []
+    for line in lines:
+        step = PC_STEP.match(line)
+        previous = PC_STEP.match(merged[-1]) if merged else None
+        if step and previous:
+            total = int(step.group(1)) + int(previous.group(1))
+            merged[-1] = f'pc += {total}'
+        else:
+            merged.append(line)
+    return merged
+
+
+def to_fused_str(opcodes, descs):
+    buffer = f'{INDENT}# {"; ".join(descs)}\n'
+    buffer += f'{INDENT}(\n'
+    buffer += f'{INDENT * 2}({", ".join(f"{op:#04x}" for op in opcodes)}),\n'
+    buffer += f'{INDENT * 2}(\n'
+    for line in core_fuse(descs):
+        buffer += f'{INDENT * 3}{line!r},\n'
+    buffer += f'{INDENT * 2}),\n'
+    buffer += f'{INDENT}),\n'
+    return buffer
+
+
+def to_core_table(name, values):
+    buffer = f'{name} = [\n'
+    for i in range(0, len(values), 16):
+        row = ', '.join(str(val) for val in values[i:i + 16])
+        buffer += f'{INDENT}{row},\n'
+    buffer += ']\n'
+    return buffer
+
+
+def to_core_strings(name, values):
+    buffer = f'{name} = [\n'
+    for val in values:
+        buffer += f'{INDENT}{val!r},\n'
+    buffer += ']\n'
+    return buffer
+
+
+def to_core_str(data):
+    opcode = data[0]
+    desc = data[1]
+    buffer = f'{INDENT}# {opcode} {desc}\n'
+    if desc == '-':
+        buffer += f"{INDENT}(\"print('Not used instruction')\",),\n"
+        return buffer
+    code = to_core_body(desc)
+    if not code:
+        buffer += f'{INDENT}(),\n'
+        return buffer
+    buffer += f'{INDENT}(\n'
+    for line in code:
+        buffer += f'{INDENT * 2}{line!r},\n'
+    buffer += f'{INDENT}),\n'
+    return buffer
+
+
+core_buffer = CORE_HEADER
+core_sizes = []
+core_ends_block = []
+core_mnemonics = []
+ops_cycles = []
+ops_not_taken = []
+ops_handlers = []
+# Methods per class of i8080_ops.py
+plain_ops = []
+packed_ops = []
+lazy_ops = []
+profiled_ops = []
 with open('opcode_gen//opcode_data.txt', 'r') as f:
     for line in f:
         if line.startswith('//'):
             continue
         sep = line.split('\t')
+        core_buffer += to_core_str(sep)
+        core_sizes.append(int(sep[2]))
+        core_ends_block.append(int(sep[1] != '-' and ends_block(sep[1])))
+        core_mnemonics.append(sep[1])
+        taken, _, not_taken = sep[3].partition('/')
+        ops_cycles.append(int(taken))
+        ops_not_taken.append(int(not_taken or taken))
         if (sep[1] == '-'):
+            ops_handlers.append('_not_used')
             continue
-        result, code = to_function_str(sep)
-        if result:
-            output_buffer += code
-        else:
-            to_implement += code
+        ops_handlers.append(f'i{sep[0]}')
+        backend = PLAIN_BACKEND
+        code = to_function_str(sep)
+        plain_ops.append(code)
+        backend = PACKED_BACKEND
+        packed_code = to_function_str(sep)
+        if packed_code != code:
+            packed_ops.append(packed_code)
+        backend = LAZY_BACKEND
+        lazy_code = to_function_str(sep)
+        if lazy_code != packed_code:
+            lazy_ops.append(lazy_code)
+        backend = PROFILED_BACKEND
+        profiled_code = to_function_str(sep)
+        if profiled_code != code:
+            profiled_ops.append(profiled_code)
 
-with open('opcode_gen//output.py', 'w') as f:
-    f.write(output_buffer)
-with open('opcode_gen//to_implement.py', 'w') as f:
-    f.write(to_implement)
+with open('i8080_ops.py', 'w') as f:
+    f.write(OPS_HEADER)
+    f.write(to_core_table('CYCLES', ops_cycles))
+    f.write(to_core_table('CYCLES_NOT_TAKEN', ops_not_taken))
+    f.write(to_core_strings('HANDLERS', ops_handlers))
+    for name, methods in (('PlainOps', plain_ops),
+                          ('PackedOps', packed_ops),
+                          ('LazyOps', lazy_ops),
+                          ('ProfiledOps', profiled_ops)):
+        f.write(f'\n\nclass {name}:\n')
+        f.write('\n'.join(methods))
+with open('core_ops.py', 'w') as f:
+    f.write(core_buffer + ']\n\n')
+    f.write(to_core_table('SIZES', core_sizes))
+    f.write(to_core_table('ENDS_BLOCK', core_ends_block))
+    f.write(to_core_strings('MNEMONICS', core_mnemonics))
+    # Hot sequences picked by profiler.py --fusion
+    f.write('FUSED = [\n')
+    with open('opcode_gen//fusion.txt', 'r') as fusion:
+        for line in fusion:
+            if line.startswith('//'):
+                continue
+            opcodes = [int(op, 16) for op in line.split('\t')[0].split()]
+            f.write(to_fused_str(
+                opcodes, [core_mnemonics[op] for op in opcodes]))
+    f.write(']\n')
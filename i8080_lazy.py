@@ -0,0 +1,19 @@
+from flag_tables import LAZY_PSW, LAZY_VALUE, CY_FLAG
+from i8080_ops import LazyOps
+from i8080_packed import PackedI8080Chip
+
+
+class LazyI8080Chip(LazyOps, PackedI8080Chip):
+    # ALU handlers only record their result in _lazy, the PSW is looked up
+    # from it when something reads flags.
+    def __init__(self, memory):
+        self._lazy = LAZY_VALUE
+        super().__init__(memory)
+
+    @property
+    def flags(self):
+        return LAZY_PSW[self._lazy & 0xfff]
+
+    @flags.setter
+    def flags(self, val):
+        self._lazy = LAZY_VALUE | val | ((val & CY_FLAG) << 8)
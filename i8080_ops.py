@@ -0,0 +1,3180 @@
+# Auto generated by generate.py from opcode_gen/opcode_data.txt, do not edit.
+# The method handlers of I8080Chip, its dispatch list by name and the cycle
+# tables. PackedOps and LazyOps only hold the handlers that differ for the
+# packed and lazy flag chips, ProfiledOps the conditional ones counting
+# taken branches while profiling.
+from flag_tables import ARITH_FLAGS, INC_DEC_FLAGS, LOGIC_FLAGS, \
+    ARITH_PSW, INC_DEC_PSW, LOGIC_PSW, LAZY_INC_DEC, LAZY_LOGIC, DAA, \
+    Z_FLAG, P_FLAG, S_FLAG, CY_FLAG, All_FLAG
+
+CYCLES = [
+    4, 10, 7, 5, 5, 5, 7, 4, 4, 10, 7, 5, 5, 5, 7, 4,
+    4, 10, 7, 5, 5, 5, 7, 4, 4, 10, 7, 5, 5, 5, 7, 4,
+    4, 10, 16, 5, 5, 5, 7, 4, 4, 10, 16, 5, 5, 5, 7, 4,
+    4, 10, 7, 5, 10, 10, 7, 4, 4, 10, 13, 5, 5, 5, 7, 4,
+    5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5,
+    5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5,
+    5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5,
+    5, 5, 7, 7, 7, 7, 7, 5, 5, 5, 5, 5, 5, 5, 5, 5,
+    4, 4, 4, 4, 4, 4, 7, 4, 4, 4, 4, 4, 4, 4, 7, 4,
+    4, 4, 4, 4, 4, 4, 7, 4, 4, 4, 4, 4, 4, 4, 7, 4,
+    4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 7, 4,
+    4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 7, 4,
+    11, 10, 10, 10, 17, 11, 7, 11, 11, 10, 10, 10, 17, 17, 7, 11,
+    11, 10, 10, 10, 17, 11, 7, 11, 11, 10, 10, 10, 17, 17, 7, 11,
+    11, 10, 10, 18, 17, 11, 7, 11, 11, 5, 10, 5, 17, 17, 7, 11,
+    11, 10, 10, 4, 17, 11, 7, 11, 11, 5, 10, 4, 17, 17, 7, 11,
+]
+CYCLES_NOT_TAKEN = [
+    4, 10, 7, 5, 5, 5, 7, 4, 4, 10, 7, 5, 5, 5, 7, 4,
+    4, 10, 7, 5, 5, 5, 7, 4, 4, 10, 7, 5, 5, 5, 7, 4,
+    4, 10, 16, 5, 5, 5, 7, 4, 4, 10, 16, 5, 5, 5, 7, 4,
+    4, 10, 7, 5, 10, 10, 7, 4, 4, 10, 13, 5, 5, 5, 7, 4,
+    5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5,
+    5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5,
+    5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5,
+    5, 5, 7, 7, 7, 7, 7, 5, 5, 5, 5, 5, 5, 5, 5, 5,
+    4, 4, 4, 4, 4, 4, 7, 4, 4, 4, 4, 4, 4, 4, 7, 4,
+    4, 4, 4, 4, 4, 4, 7, 4, 4, 4, 4, 4, 4, 4, 7, 4,
+    4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 7, 4,
+    4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 7, 4,
+    5, 10, 10, 10, 11, 11, 7, 11, 5, 10, 10, 10, 11, 17, 7, 11,
+    5, 10, 10, 10, 11, 11, 7, 11, 5, 10, 10, 10, 11, 17, 7, 11,
+    5, 10, 10, 18, 11, 11, 7, 11, 5, 5, 10, 5, 11, 17, 7, 11,
+    5, 10, 10, 4, 11, 11, 7, 11, 5, 5, 10, 4, 11, 17, 7, 11,
+]
+HANDLERS = [
+    'i0x00',
+    'i0x01',
+    'i0x02',
+    'i0x03',
+    'i0x04',
+    'i0x05',
+    'i0x06',
+    'i0x07',
+    '_not_used',
+    'i0x09',
+    'i0x0a',
+    'i0x0b',
+    'i0x0c',
+    'i0x0d',
+    'i0x0e',
+    'i0x0f',
+    '_not_used',
+    'i0x11',
+    'i0x12',
+    'i0x13',
+    'i0x14',
+    'i0x15',
+    'i0x16',
+    'i0x17',
+    '_not_used',
+    'i0x19',
+    'i0x1a',
+    'i0x1b',
+    'i0x1c',
+    'i0x1d',
+    'i0x1e',
+    'i0x1f',
+    '_not_used',
+    'i0x21',
+    'i0x22',
+    'i0x23',
+    'i0x24',
+    'i0x25',
+    'i0x26',
+    'i0x27',
+    '_not_used',
+    'i0x29',
+    'i0x2a',
+    'i0x2b',
+    'i0x2c',
+    'i0x2d',
+    'i0x2e',
+    'i0x2f',
+    '_not_used',
+    'i0x31',
+    'i0x32',
+    'i0x33',
+    'i0x34',
+    'i0x35',
+    'i0x36',
+    'i0x37',
+    '_not_used',
+    'i0x39',
+    'i0x3a',
+    'i0x3b',
+    'i0x3c',
+    'i0x3d',
+    'i0x3e',
+    'i0x3f',
+    'i0x40',
+    'i0x41',
+    'i0x42',
+    'i0x43',
+    'i0x44',
+    'i0x45',
+    'i0x46',
+    'i0x47',
+    'i0x48',
+    'i0x49',
+    'i0x4a',
+    'i0x4b',
+    'i0x4c',
+    'i0x4d',
+    'i0x4e',
+    'i0x4f',
+    'i0x50',
+    'i0x51',
+    'i0x52',
+    'i0x53',
+    'i0x54',
+    'i0x55',
+    'i0x56',
+    'i0x57',
+    'i0x58',
+    'i0x59',
+    'i0x5a',
+    'i0x5b',
+    'i0x5c',
+    'i0x5d',
+    'i0x5e',
+    'i0x5f',
+    'i0x60',
+    'i0x61',
+    'i0x62',
+    'i0x63',
+    'i0x64',
+    'i0x65',
+    'i0x66',
+    'i0x67',
+    'i0x68',
+    'i0x69',
+    'i0x6a',
+    'i0x6b',
+    'i0x6c',
+    'i0x6d',
+    'i0x6e',
+    'i0x6f',
+    'i0x70',
+    'i0x71',
+    'i0x72',
+    'i0x73',
+    'i0x74',
+    'i0x75',
+    'i0x76',
+    'i0x77',
+    'i0x78',
+    'i0x79',
+    'i0x7a',
+    'i0x7b',
+    'i0x7c',
+    'i0x7d',
+    'i0x7e',
+    'i0x7f',
+    'i0x80',
+    'i0x81',
+    'i0x82',
+    'i0x83',
+    'i0x84',
+    'i0x85',
+    'i0x86',
+    'i0x87',
+    'i0x88',
+    'i0x89',
+    'i0x8a',
+    'i0x8b',
+    'i0x8c',
+    'i0x8d',
+    'i0x8e',
+    'i0x8f',
+    'i0x90',
+    'i0x91',
+    'i0x92',
+    'i0x93',
+    'i0x94',
+    'i0x95',
+    'i0x96',
+    'i0x97',
+    'i0x98',
+    'i0x99',
+    'i0x9a',
+    'i0x9b',
+    'i0x9c',
+    'i0x9d',
+    'i0x9e',
+    'i0x9f',
+    'i0xa0',
+    'i0xa1',
+    'i0xa2',
+    'i0xa3',
+    'i0xa4',
+    'i0xa5',
+    'i0xa6',
+    'i0xa7',
+    'i0xa8',
+    'i0xa9',
+    'i0xaa',
+    'i0xab',
+    'i0xac',
+    'i0xad',
+    'i0xae',
+    'i0xaf',
+    'i0xb0',
+    'i0xb1',
+    'i0xb2',
+    'i0xb3',
+    'i0xb4',
+    'i0xb5',
+    'i0xb6',
+    'i0xb7',
+    'i0xb8',
+    'i0xb9',
+    'i0xba',
+    'i0xbb',
+    'i0xbc',
+    'i0xbd',
+    'i0xbe',
+    'i0xbf',
+    'i0xc0',
+    'i0xc1',
+    'i0xc2',
+    'i0xc3',
+    'i0xc4',
+    'i0xc5',
+    'i0xc6',
+    'i0xc7',
+    'i0xc8',
+    'i0xc9',
+    'i0xca',
+    '_not_used',
+    'i0xcc',
+    'i0xcd',
+    'i0xce',
+    'i0xcf',
+    'i0xd0',
+    'i0xd1',
+    'i0xd2',
+    'i0xd3',
+    'i0xd4',
+    'i0xd5',
+    'i0xd6',
+    'i0xd7',
+    'i0xd8',
+    '_not_used',
+    'i0xda',
+    'i0xdb',
+    'i0xdc',
+    '_not_used',
+    'i0xde',
+    'i0xdf',
+    'i0xe0',
+    'i0xe1',
+    'i0xe2',
+    'i0xe3',
+    'i0xe4',
+    'i0xe5',
+    'i0xe6',
+    'i0xe7',
+    'i0xe8',
+    'i0xe9',
+    'i0xea',
+    'i0xeb',
+    'i0xec',
+    '_not_used',
+    'i0xee',
+    'i0xef',
+    'i0xf0',
+    'i0xf1',
+    'i0xf2',
+    'i0xf3',
+    'i0xf4',
+    'i0xf5',
+    'i0xf6',
+    'i0xf7',
+    'i0xf8',
+    'i0xf9',
+    'i0xfa',
+    'i0xfb',
+    'i0xfc',
+    '_not_used',
+    'i0xfe',
+    'i0xff',
+]
+
+
+class PlainOps:
+    # NOP
+    def i0x00(self):
+        pass
+
+    # LXI B,D16
+    def i0x01(self):
+        self.c = self._read()
+        self.b = self._read()
+
+    # STAX B
+    def i0x02(self):
+        ptr = (self.b << 8) | self.c
+        self.ram[ptr] = self.a
+
+    # INX B
+    def i0x03(self):
+        val = (self.b << 8) | self.c
+        val += 1
+        self.c = val & 0xff
+        self.b = (val >> 8) & 0xff
+
+    # INR B
+    def i0x04(self):
+        val = self.b + 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.b = val & 0xff
+
+    # DCR B
+    def i0x05(self):
+        val = self.b - 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.b = val & 0xff
+
+    # MVI B,D8
+    def i0x06(self):
+        self.b = self._read()
+
+    # RLC
+    def i0x07(self):
+        bit7 = self.a >> 7
+        self.CY = bit7 == 1
+        self.a = (self.a << 1 | bit7) & 0xff
+
+    # DAD B
+    def i0x09(self):
+        val = (self.high << 8) + self.low
+        val += (self.b << 8) | self.c
+        self.CY = val > 0xffff
+        self.low = val & 0xff
+        self.high = (val >> 8) & 0xff
+
+    # LDAX B
+    def i0x0a(self):
+        ptr = (self.b << 8) | self.c
+        self.a = self.ram[ptr]
+
+    # DCX B
+    def i0x0b(self):
+        val = (self.b << 8) | self.c
+        val -= 1
+        self.c = val & 0xff
+        self.b = (val >> 8) & 0xff
+
+    # INR C
+    def i0x0c(self):
+        val = self.c + 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.c = val & 0xff
+
+    # DCR C
+    def i0x0d(self):
+        val = self.c - 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.c = val & 0xff
+
+    # MVI C,D8
+    def i0x0e(self):
+        self.c = self._read()
+
+    # RRC
+    def i0x0f(self):
+        bit0 = self.a & 0x01
+        self.CY = bit0 == 1
+        self.a = (self.a >> 1 | (bit0 << 7)) & 0xff
+
+    # LXI D,D16
+    def i0x11(self):
+        self.e = self._read()
+        self.d = self._read()
+
+    # STAX D
+    def i0x12(self):
+        ptr = (self.d << 8) | self.e
+        self.ram[ptr] = self.a
+
+    # INX D
+    def i0x13(self):
+        val = (self.d << 8) | self.e
+        val += 1
+        self.e = val & 0xff
+        self.d = (val >> 8) & 0xff
+
+    # INR D
+    def i0x14(self):
+        val = self.d + 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.d = val & 0xff
+
+    # DCR D
+    def i0x15(self):
+        val = self.d - 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.d = val & 0xff
+
+    # MVI D,D8
+    def i0x16(self):
+        self.d = self._read()
+
+    # RAL
+    def i0x17(self):
+        bit7 = self.a >> 7
+        val = (self.a << 1) & 0xff
+        if self.CY:
+            val |= 0x01
+        self.CY = bit7 == 1
+
+    # DAD D
+    def i0x19(self):
+        val = (self.high << 8) + self.low
+        val += (self.d << 8) | self.e
+        self.CY = val > 0xffff
+        self.low = val & 0xff
+        self.high = (val >> 8) & 0xff
+
+    # LDAX D
+    def i0x1a(self):
+        ptr = (self.d << 8) | self.e
+        self.a = self.ram[ptr]
+
+    # DCX D
+    def i0x1b(self):
+        val = (self.d << 8) | self.e
+        val -= 1
+        self.e = val & 0xff
+        self.d = (val >> 8) & 0xff
+
+    # INR E
+    def i0x1c(self):
+        val = self.e + 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.e = val & 0xff
+
+    # DCR E
+    def i0x1d(self):
+        val = self.e - 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.e = val & 0xff
+
+    # MVI E,D8
+    def i0x1e(self):
+        self.e = self._read()
+
+    # RAR
+    def i0x1f(self):
+        bit0 = self.a & 0x01
+        self.a = self.a >> 1
+        if self.CY:
+            self.a |= 0x80
+        self.CY = bit0 == 1
+
+    # LXI H,D16
+    def i0x21(self):
+        self.low = self._read()
+        self.high = self._read()
+
+    # SHLD adr
+    def i0x22(self):
+        address = self._get_address16()
+        self.ram[address] = self.low
+        self.ram[address + 1] = self.high
+
+    # INX H
+    def i0x23(self):
+        val = (self.high << 8) | self.low
+        val += 1
+        self.low = val & 0xff
+        self.high = (val >> 8) & 0xff
+
+    # INR H
+    def i0x24(self):
+        val = self.high + 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.high = val & 0xff
+
+    # DCR H
+    def i0x25(self):
+        val = self.high - 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.high = val & 0xff
+
+    # MVI H,D8
+    def i0x26(self):
+        self.high = self._read()
+
+    # DAA
+    def i0x27(self):
+        val = DAA[self.a | (self.CY << 8) | (self.AC << 12)]
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # DAD H
+    def i0x29(self):
+        val = (self.high << 8) + self.low
+        val *= 2
+        self.CY = val > 0xffff
+        self.low = val & 0xff
+        self.high = (val >> 8) & 0xff
+
+    # LHLD adr
+    def i0x2a(self):
+        address = self._get_address16()
+        self.low = self.ram[address]
+        self.high = self.ram[address + 1]
+
+    # DCX H
+    def i0x2b(self):
+        val = (self.high << 8) | self.low
+        val -= 1
+        self.low = val & 0xff
+        self.high = (val >> 8) & 0xff
+
+    # INR L
+    def i0x2c(self):
+        val = self.low + 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.low = val & 0xff
+
+    # DCR L
+    def i0x2d(self):
+        val = self.low - 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.low = val & 0xff
+
+    # MVI L,D8
+    def i0x2e(self):
+        self.low = self._read()
+
+    # CMA
+    def i0x2f(self):
+        self.a ^= 0xff
+
+    # LXI SP,D16
+    def i0x31(self):
+        low = self._read()
+        high = self._read()
+        val = (high << 8) | low
+        self.sp = val
+
+    # STA adr
+    def i0x32(self):
+        address = self._get_address16()
+        self.ram[address] = self.a
+
+    # INX SP
+    def i0x33(self):
+        self.sp = (self.sp + 1) & 0xff
+
+    # INR M
+    def i0x34(self):
+        ptr = (self.high << 8) | self.low
+        val = self.ram[ptr] + 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.ram[ptr] = val & 0xff
+
+    # DCR M
+    def i0x35(self):
+        ptr = (self.high << 8) | self.low
+        val = self.ram[ptr] - 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.ram[ptr] = val & 0xff
+
+    # MVI M,D8
+    def i0x36(self):
+        ptr = (self.high << 8) | self.low
+        self.ram[ptr] = self._read()
+
+    # STC
+    def i0x37(self):
+        self.CY = True
+
+    # DAD SP
+    def i0x39(self):
+        val = (self.high << 8) + self.low
+        val += self.sp
+        self.CY = val > 0xffff
+        self.low = val & 0xff
+        self.high = (val >> 8) & 0xff
+
+    # LDA adr
+    def i0x3a(self):
+        address = self._get_address16()
+        self.a = self.ram[address]
+
+    # DCX SP
+    def i0x3b(self):
+        self.sp = (self.sp - 1) & 0xff
+
+    # INR A
+    def i0x3c(self):
+        val = self.a + 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.a = val & 0xff
+
+    # DCR A
+    def i0x3d(self):
+        val = self.a - 1
+        self.S, self.Z, self.AC, self.P = INC_DEC_FLAGS[val & 0xff]
+        self.a = val & 0xff
+
+    # MVI A,D8
+    def i0x3e(self):
+        self.a = self._read()
+
+    # CMC
+    def i0x3f(self):
+        self.CY = not self.CY
+
+    # MOV B,B
+    def i0x40(self):
+        self.b = self.b
+
+    # MOV B,C
+    def i0x41(self):
+        self.b = self.c
+
+    # MOV B,D
+    def i0x42(self):
+        self.b = self.d
+
+    # MOV B,E
+    def i0x43(self):
+        self.b = self.e
+
+    # MOV B,H
+    def i0x44(self):
+        self.b = self.high
+
+    # MOV B,L
+    def i0x45(self):
+        self.b = self.low
+
+    # MOV B,M
+    def i0x46(self):
+        ptr = (self.high << 8) | self.low
+        self.b = self.ram[ptr]
+
+    # MOV B,A
+    def i0x47(self):
+        self.b = self.a
+
+    # MOV C,B
+    def i0x48(self):
+        self.c = self.b
+
+    # MOV C,C
+    def i0x49(self):
+        self.c = self.c
+
+    # MOV C,D
+    def i0x4a(self):
+        self.c = self.d
+
+    # MOV C,E
+    def i0x4b(self):
+        self.c = self.e
+
+    # MOV C,H
+    def i0x4c(self):
+        self.c = self.high
+
+    # MOV C,L
+    def i0x4d(self):
+        self.c = self.low
+
+    # MOV C,M
+    def i0x4e(self):
+        ptr = (self.high << 8) | self.low
+        self.c = self.ram[ptr]
+
+    # MOV C,A
+    def i0x4f(self):
+        self.c = self.a
+
+    # MOV D,B
+    def i0x50(self):
+        self.d = self.b
+
+    # MOV D,C
+    def i0x51(self):
+        self.d = self.c
+
+    # MOV D,D
+    def i0x52(self):
+        self.d = self.d
+
+    # MOV D,E
+    def i0x53(self):
+        self.d = self.e
+
+    # MOV D,H
+    def i0x54(self):
+        self.d = self.high
+
+    # MOV D,L
+    def i0x55(self):
+        self.d = self.low
+
+    # MOV D,M
+    def i0x56(self):
+        ptr = (self.high << 8) | self.low
+        self.d = self.ram[ptr]
+
+    # MOV D,A
+    def i0x57(self):
+        self.d = self.a
+
+    # MOV E,B
+    def i0x58(self):
+        self.e = self.b
+
+    # MOV E,C
+    def i0x59(self):
+        self.e = self.c
+
+    # MOV E,D
+    def i0x5a(self):
+        self.e = self.d
+
+    # MOV E,E
+    def i0x5b(self):
+        self.e = self.e
+
+    # MOV E,H
+    def i0x5c(self):
+        self.e = self.high
+
+    # MOV E,L
+    def i0x5d(self):
+        self.e = self.low
+
+    # MOV E,M
+    def i0x5e(self):
+        ptr = (self.high << 8) | self.low
+        self.e = self.ram[ptr]
+
+    # MOV E,A
+    def i0x5f(self):
+        self.e = self.a
+
+    # MOV H,B
+    def i0x60(self):
+        self.high = self.b
+
+    # MOV H,C
+    def i0x61(self):
+        self.high = self.c
+
+    # MOV H,D
+    def i0x62(self):
+        self.high = self.d
+
+    # MOV H,E
+    def i0x63(self):
+        self.high = self.e
+
+    # MOV H,H
+    def i0x64(self):
+        self.high = self.high
+
+    # MOV H,L
+    def i0x65(self):
+        self.high = self.low
+
+    # MOV H,M
+    def i0x66(self):
+        ptr = (self.high << 8) | self.low
+        self.high = self.ram[ptr]
+
+    # MOV H,A
+    def i0x67(self):
+        self.high = self.a
+
+    # MOV L,B
+    def i0x68(self):
+        self.low = self.b
+
+    # MOV L,C
+    def i0x69(self):
+        self.low = self.c
+
+    # MOV L,D
+    def i0x6a(self):
+        self.low = self.d
+
+    # MOV L,E
+    def i0x6b(self):
+        self.low = self.e
+
+    # MOV L,H
+    def i0x6c(self):
+        self.low = self.high
+
+    # MOV L,L
+    def i0x6d(self):
+        self.low = self.low
+
+    # MOV L,M
+    def i0x6e(self):
+        ptr = (self.high << 8) | self.low
+        self.low = self.ram[ptr]
+
+    # MOV L,A
+    def i0x6f(self):
+        self.low = self.a
+
+    # MOV M,B
+    def i0x70(self):
+        ptr = (self.high << 8) | self.low
+        self.ram[ptr] = self.b
+
+    # MOV M,C
+    def i0x71(self):
+        ptr = (self.high << 8) | self.low
+        self.ram[ptr] = self.c
+
+    # MOV M,D
+    def i0x72(self):
+        ptr = (self.high << 8) | self.low
+        self.ram[ptr] = self.d
+
+    # MOV M,E
+    def i0x73(self):
+        ptr = (self.high << 8) | self.low
+        self.ram[ptr] = self.e
+
+    # MOV M,H
+    def i0x74(self):
+        ptr = (self.high << 8) | self.low
+        self.ram[ptr] = self.high
+
+    # MOV M,L
+    def i0x75(self):
+        ptr = (self.high << 8) | self.low
+        self.ram[ptr] = self.low
+
+    # HLT
+    def i0x76(self):
+        self.halted = True
+
+    # MOV M,A
+    def i0x77(self):
+        ptr = (self.high << 8) | self.low
+        self.ram[ptr] = self.a
+
+    # MOV A,B
+    def i0x78(self):
+        self.a = self.b
+
+    # MOV A,C
+    def i0x79(self):
+        self.a = self.c
+
+    # MOV A,D
+    def i0x7a(self):
+        self.a = self.d
+
+    # MOV A,E
+    def i0x7b(self):
+        self.a = self.e
+
+    # MOV A,H
+    def i0x7c(self):
+        self.a = self.high
+
+    # MOV A,L
+    def i0x7d(self):
+        self.a = self.low
+
+    # MOV A,M
+    def i0x7e(self):
+        ptr = (self.high << 8) | self.low
+        self.a = self.ram[ptr]
+
+    # MOV A,A
+    def i0x7f(self):
+        self.a = self.a
+
+    # ADD B
+    def i0x80(self):
+        val = self.a + self.b
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD C
+    def i0x81(self):
+        val = self.a + self.c
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD D
+    def i0x82(self):
+        val = self.a + self.d
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD E
+    def i0x83(self):
+        val = self.a + self.e
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD H
+    def i0x84(self):
+        val = self.a + self.high
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD L
+    def i0x85(self):
+        val = self.a + self.low
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD M
+    def i0x86(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a + self.ram[ptr]
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD A
+    def i0x87(self):
+        val = self.a + self.a
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC B
+    def i0x88(self):
+        val = self.a + self.b + self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC C
+    def i0x89(self):
+        val = self.a + self.c + self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC D
+    def i0x8a(self):
+        val = self.a + self.d + self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC E
+    def i0x8b(self):
+        val = self.a + self.e + self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC H
+    def i0x8c(self):
+        val = self.a + self.high + self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC L
+    def i0x8d(self):
+        val = self.a + self.low + self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC M
+    def i0x8e(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a + self.ram[ptr] + self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC A
+    def i0x8f(self):
+        val = self.a + self.a + self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB B
+    def i0x90(self):
+        val = self.a - self.b
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB C
+    def i0x91(self):
+        val = self.a - self.c
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB D
+    def i0x92(self):
+        val = self.a - self.d
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB E
+    def i0x93(self):
+        val = self.a - self.e
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB H
+    def i0x94(self):
+        val = self.a - self.high
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB L
+    def i0x95(self):
+        val = self.a - self.low
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB M
+    def i0x96(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a - self.ram[ptr]
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB A
+    def i0x97(self):
+        val = self.a - self.a
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB B
+    def i0x98(self):
+        val = self.a - self.b - self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB C
+    def i0x99(self):
+        val = self.a - self.c - self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB D
+    def i0x9a(self):
+        val = self.a - self.d - self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB E
+    def i0x9b(self):
+        val = self.a - self.e - self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB H
+    def i0x9c(self):
+        val = self.a - self.high - self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB L
+    def i0x9d(self):
+        val = self.a - self.low - self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB M
+    def i0x9e(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a - self.ram[ptr] - self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB A
+    def i0x9f(self):
+        val = self.a - self.a - self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ANA B
+    def i0xa0(self):
+        val = self.a & self.b
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ANA C
+    def i0xa1(self):
+        val = self.a & self.c
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ANA D
+    def i0xa2(self):
+        val = self.a & self.d
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ANA E
+    def i0xa3(self):
+        val = self.a & self.e
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ANA H
+    def i0xa4(self):
+        val = self.a & self.high
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ANA L
+    def i0xa5(self):
+        val = self.a & self.low
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ANA M
+    def i0xa6(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a & self.ram[ptr]
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ANA A
+    def i0xa7(self):
+        val = self.a & self.a
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # XRA B
+    def i0xa8(self):
+        val = self.a ^ self.b
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # XRA C
+    def i0xa9(self):
+        val = self.a ^ self.c
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # XRA D
+    def i0xaa(self):
+        val = self.a ^ self.d
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # XRA E
+    def i0xab(self):
+        val = self.a ^ self.e
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # XRA H
+    def i0xac(self):
+        val = self.a ^ self.high
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # XRA L
+    def i0xad(self):
+        val = self.a ^ self.low
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # XRA M
+    def i0xae(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a ^ self.ram[ptr]
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # XRA A
+    def i0xaf(self):
+        val = self.a ^ self.a
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ORA B
+    def i0xb0(self):
+        val = self.a | self.b
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ORA C
+    def i0xb1(self):
+        val = self.a | self.c
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ORA D
+    def i0xb2(self):
+        val = self.a | self.d
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ORA E
+    def i0xb3(self):
+        val = self.a | self.e
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ORA H
+    def i0xb4(self):
+        val = self.a | self.high
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ORA L
+    def i0xb5(self):
+        val = self.a | self.low
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ORA M
+    def i0xb6(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a | self.ram[ptr]
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # ORA A
+    def i0xb7(self):
+        val = self.a | self.a
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # CMP B
+    def i0xb8(self):
+        val = self.a - self.b
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+
+    # CMP C
+    def i0xb9(self):
+        val = self.a - self.c
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+
+    # CMP D
+    def i0xba(self):
+        val = self.a - self.d
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+
+    # CMP E
+    def i0xbb(self):
+        val = self.a - self.e
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+
+    # CMP H
+    def i0xbc(self):
+        val = self.a - self.high
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+
+    # CMP L
+    def i0xbd(self):
+        val = self.a - self.low
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+
+    # CMP M
+    def i0xbe(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a - self.ram[ptr]
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+
+    # CMP A
+    def i0xbf(self):
+        val = self.a - self.a
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+
+    # RNZ
+    def i0xc0(self):
+        if not self.Z:
+            self._ret()
+        else:
+            return False
+
+    # POP B
+    def i0xc1(self):
+        self.c = self.ram[self.sp]
+        self.b = self.ram[self.sp + 1]
+        self.sp += 2
+
+    # JNZ adr
+    def i0xc2(self):
+        address = self._get_address16()
+        if not self.Z:
+            self.pc = address
+
+    # JMP adr
+    def i0xc3(self):
+        self.pc = self._get_address16()
+
+    # CNZ adr
+    def i0xc4(self):
+        address = self._get_address16()
+        if not self.Z:
+            self._call(address)
+        else:
+            return False
+
+    # PUSH B
+    def i0xc5(self):
+        self.ram[self.sp - 2] = self.c
+        self.ram[self.sp - 1] = self.b
+        self.sp -= 2
+
+    # ADI D8
+    def i0xc6(self):
+        val = self.a + self._read()
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # RST 0
+    def i0xc7(self):
+        self._call(0x00)
+
+    # RZ
+    def i0xc8(self):
+        if self.Z:
+            self._ret()
+        else:
+            return False
+
+    # RET
+    def i0xc9(self):
+        self._ret()
+
+    # JZ adr
+    def i0xca(self):
+        address = self._get_address16()
+        if self.Z:
+            self.pc = address
+
+    # CZ adr
+    def i0xcc(self):
+        address = self._get_address16()
+        if self.Z:
+            self._call(address)
+        else:
+            return False
+
+    # CALL adr
+    def i0xcd(self):
+        self._call(self._get_address16())
+
+    # ACI D8
+    def i0xce(self):
+        val = self.a + self._read() + self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # RST 1
+    def i0xcf(self):
+        self._call(0x08)
+
+    # RNC
+    def i0xd0(self):
+        if not self.CY:
+            self._ret()
+        else:
+            return False
+
+    # POP D
+    def i0xd1(self):
+        self.e = self.ram[self.sp]
+        self.d = self.ram[self.sp + 1]
+        self.sp += 2
+
+    # JNC adr
+    def i0xd2(self):
+        address = self._get_address16()
+        if not self.CY:
+            self.pc = address
+
+    # OUT D8
+    def i0xd3(self):
+        self.ports.writers[self._read()](self.a)
+
+    # CNC adr
+    def i0xd4(self):
+        address = self._get_address16()
+        if not self.CY:
+            self._call(address)
+        else:
+            return False
+
+    # PUSH D
+    def i0xd5(self):
+        self.ram[self.sp - 2] = self.e
+        self.ram[self.sp - 1] = self.d
+        self.sp -= 2
+
+    # SUI D8
+    def i0xd6(self):
+        val = self.a - self._read()
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # RST 2
+    def i0xd7(self):
+        self._call(0x10)
+
+    # RC
+    def i0xd8(self):
+        if self.CY:
+            self._ret()
+        else:
+            return False
+
+    # JC adr
+    def i0xda(self):
+        address = self._get_address16()
+        if self.CY:
+            self.pc = address
+
+    # IN D8
+    def i0xdb(self):
+        self.a = self.ports.readers[self._read()]()
+
+    # CC adr
+    def i0xdc(self):
+        address = self._get_address16()
+        if self.CY:
+            self._call(address)
+        else:
+            return False
+
+    # SBI D8
+    def i0xde(self):
+        val = self.a - self._read() - self.CY
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+        self.a = val & 0xff
+
+    # RST 3
+    def i0xdf(self):
+        self._call(0x18)
+
+    # RPO
+    def i0xe0(self):
+        if not self.P:
+            self._ret()
+        else:
+            return False
+
+    # POP H
+    def i0xe1(self):
+        self.low = self.ram[self.sp]
+        self.high = self.ram[self.sp + 1]
+        self.sp += 2
+
+    # JPO adr
+    def i0xe2(self):
+        address = self._get_address16()
+        if not self.P:
+            self.pc = address
+
+    # XTHL
+    def i0xe3(self):
+        val = self.ram[self.sp]
+        self.ram[self.sp] = self.low
+        self.low = val
+        val = self.ram[self.sp + 1]
+        self.ram[self.sp + 1] = self.high
+        self.high = val
+
+    # CPO adr
+    def i0xe4(self):
+        address = self._get_address16()
+        if not self.P:
+            self._call(address)
+        else:
+            return False
+
+    # PUSH H
+    def i0xe5(self):
+        self.ram[self.sp - 2] = self.low
+        self.ram[self.sp - 1] = self.high
+        self.sp -= 2
+
+    # ANI D8
+    def i0xe6(self):
+        val = self.a & self._read()
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # RST 4
+    def i0xe7(self):
+        self._call(0x20)
+
+    # RPE
+    def i0xe8(self):
+        if self.P:
+            self._ret()
+        else:
+            return False
+
+    # PCHL
+    def i0xe9(self):
+        self.pc = (self.high << 8) | self.low
+
+    # JPE adr
+    def i0xea(self):
+        address = self._get_address16()
+        if self.P:
+            self.pc = address
+
+    # XCHG
+    def i0xeb(self):
+        self.d, self.high = self.high, self.d
+        self.e, self.low = self.low, self.e
+
+    # CPE adr
+    def i0xec(self):
+        address = self._get_address16()
+        if self.P:
+            self._call(address)
+        else:
+            return False
+
+    # XRI D8
+    def i0xee(self):
+        val = self.a ^ self._read()
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # RST 5
+    def i0xef(self):
+        self._call(0x28)
+
+    # RP
+    def i0xf0(self):
+        if not self.S:
+            self._ret()
+        else:
+            return False
+
+    # POP PSW
+    def i0xf1(self):
+        self._unpack_flags(self.ram[self.sp])
+        self.a = self.ram[self.sp + 1]
+        self.sp += 2
+
+    # JP adr
+    def i0xf2(self):
+        address = self._get_address16()
+        if not self.S:
+            self.pc = address
+
+    # DI
+    def i0xf3(self):
+        self.interrupt_enable = False
+        print('Disable interrupt')
+
+    # CP adr
+    def i0xf4(self):
+        address = self._get_address16()
+        if not self.S:
+            self._call(address)
+        else:
+            return False
+
+    # PUSH PSW
+    def i0xf5(self):
+        self.ram[self.sp - 2] = self._pack_flags()
+        self.ram[self.sp - 1] = self.a
+        self.sp -= 2
+
+    # ORI D8
+    def i0xf6(self):
+        val = self.a | self._read()
+        self.S, self.Z, self.AC, self.P, self.CY = LOGIC_FLAGS[val]
+        self.a = val & 0xff
+
+    # RST 6
+    def i0xf7(self):
+        self._call(0x30)
+
+    # RM
+    def i0xf8(self):
+        if self.S:
+            self._ret()
+        else:
+            return False
+
+    # SPHL
+    def i0xf9(self):
+        self.sp = (self.high << 8) | self.low
+
+    # JM adr
+    def i0xfa(self):
+        address = self._get_address16()
+        if self.S:
+            self.pc = address
+
+    # EI
+    def i0xfb(self):
+        self.interrupt_enable = True
+
+    # CM adr
+    def i0xfc(self):
+        address = self._get_address16()
+        if self.S:
+            self._call(address)
+        else:
+            return False
+
+    # CPI D8
+    def i0xfe(self):
+        val = self.a - self._read()
+        self.S, self.Z, self.AC, self.P, self.CY = ARITH_FLAGS[val & 0x1ff]
+
+    # RST 7
+    def i0xff(self):
+        self._call(0x38)
+
+
+class PackedOps:
+    # INR B
+    def i0x04(self):
+        val = self.b + 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.b = val & 0xff
+
+    # DCR B
+    def i0x05(self):
+        val = self.b - 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.b = val & 0xff
+
+    # RLC
+    def i0x07(self):
+        bit7 = self.a >> 7
+        self.flags = (self.flags & ~CY_FLAG) | bit7
+        self.a = (self.a << 1 | bit7) & 0xff
+
+    # DAD B
+    def i0x09(self):
+        val = (self.high << 8) + self.low
+        val += (self.b << 8) | self.c
+        self.flags = (self.flags & ~CY_FLAG) | (val >> 16)
+        self.low = val & 0xff
+        self.high = (val >> 8) & 0xff
+
+    # INR C
+    def i0x0c(self):
+        val = self.c + 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.c = val & 0xff
+
+    # DCR C
+    def i0x0d(self):
+        val = self.c - 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.c = val & 0xff
+
+    # RRC
+    def i0x0f(self):
+        bit0 = self.a & 0x01
+        self.flags = (self.flags & ~CY_FLAG) | bit0
+        self.a = (self.a >> 1 | (bit0 << 7)) & 0xff
+
+    # INR D
+    def i0x14(self):
+        val = self.d + 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.d = val & 0xff
+
+    # DCR D
+    def i0x15(self):
+        val = self.d - 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.d = val & 0xff
+
+    # RAL
+    def i0x17(self):
+        bit7 = self.a >> 7
+        val = (self.a << 1) & 0xff
+        if self.flags & CY_FLAG:
+            val |= 0x01
+        self.flags = (self.flags & ~CY_FLAG) | bit7
+
+    # DAD D
+    def i0x19(self):
+        val = (self.high << 8) + self.low
+        val += (self.d << 8) | self.e
+        self.flags = (self.flags & ~CY_FLAG) | (val >> 16)
+        self.low = val & 0xff
+        self.high = (val >> 8) & 0xff
+
+    # INR E
+    def i0x1c(self):
+        val = self.e + 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.e = val & 0xff
+
+    # DCR E
+    def i0x1d(self):
+        val = self.e - 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.e = val & 0xff
+
+    # RAR
+    def i0x1f(self):
+        bit0 = self.a & 0x01
+        self.a = self.a >> 1
+        if self.flags & CY_FLAG:
+            self.a |= 0x80
+        self.flags = (self.flags & ~CY_FLAG) | bit0
+
+    # INR H
+    def i0x24(self):
+        val = self.high + 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.high = val & 0xff
+
+    # DCR H
+    def i0x25(self):
+        val = self.high - 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.high = val & 0xff
+
+    # DAA
+    def i0x27(self):
+        val = DAA[self.a | ((self.flags & 0x11) << 8)]
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # DAD H
+    def i0x29(self):
+        val = (self.high << 8) + self.low
+        val *= 2
+        self.flags = (self.flags & ~CY_FLAG) | (val >> 16)
+        self.low = val & 0xff
+        self.high = (val >> 8) & 0xff
+
+    # INR L
+    def i0x2c(self):
+        val = self.low + 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.low = val & 0xff
+
+    # DCR L
+    def i0x2d(self):
+        val = self.low - 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.low = val & 0xff
+
+    # INR M
+    def i0x34(self):
+        ptr = (self.high << 8) | self.low
+        val = self.ram[ptr] + 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.ram[ptr] = val & 0xff
+
+    # DCR M
+    def i0x35(self):
+        ptr = (self.high << 8) | self.low
+        val = self.ram[ptr] - 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.ram[ptr] = val & 0xff
+
+    # STC
+    def i0x37(self):
+        self.flags |= CY_FLAG
+
+    # DAD SP
+    def i0x39(self):
+        val = (self.high << 8) + self.low
+        val += self.sp
+        self.flags = (self.flags & ~CY_FLAG) | (val >> 16)
+        self.low = val & 0xff
+        self.high = (val >> 8) & 0xff
+
+    # INR A
+    def i0x3c(self):
+        val = self.a + 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.a = val & 0xff
+
+    # DCR A
+    def i0x3d(self):
+        val = self.a - 1
+        self.flags = (self.flags & CY_FLAG) | INC_DEC_PSW[val & 0xff]
+        self.a = val & 0xff
+
+    # CMC
+    def i0x3f(self):
+        self.flags ^= CY_FLAG
+
+    # ADD B
+    def i0x80(self):
+        val = self.a + self.b
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD C
+    def i0x81(self):
+        val = self.a + self.c
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD D
+    def i0x82(self):
+        val = self.a + self.d
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD E
+    def i0x83(self):
+        val = self.a + self.e
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD H
+    def i0x84(self):
+        val = self.a + self.high
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD L
+    def i0x85(self):
+        val = self.a + self.low
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD M
+    def i0x86(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a + self.ram[ptr]
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADD A
+    def i0x87(self):
+        val = self.a + self.a
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC B
+    def i0x88(self):
+        val = self.a + self.b + (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC C
+    def i0x89(self):
+        val = self.a + self.c + (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC D
+    def i0x8a(self):
+        val = self.a + self.d + (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC E
+    def i0x8b(self):
+        val = self.a + self.e + (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC H
+    def i0x8c(self):
+        val = self.a + self.high + (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC L
+    def i0x8d(self):
+        val = self.a + self.low + (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC M
+    def i0x8e(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a + self.ram[ptr] + (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ADC A
+    def i0x8f(self):
+        val = self.a + self.a + (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB B
+    def i0x90(self):
+        val = self.a - self.b
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB C
+    def i0x91(self):
+        val = self.a - self.c
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB D
+    def i0x92(self):
+        val = self.a - self.d
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB E
+    def i0x93(self):
+        val = self.a - self.e
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB H
+    def i0x94(self):
+        val = self.a - self.high
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB L
+    def i0x95(self):
+        val = self.a - self.low
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB M
+    def i0x96(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a - self.ram[ptr]
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SUB A
+    def i0x97(self):
+        val = self.a - self.a
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB B
+    def i0x98(self):
+        val = self.a - self.b - (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB C
+    def i0x99(self):
+        val = self.a - self.c - (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB D
+    def i0x9a(self):
+        val = self.a - self.d - (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB E
+    def i0x9b(self):
+        val = self.a - self.e - (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB H
+    def i0x9c(self):
+        val = self.a - self.high - (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB L
+    def i0x9d(self):
+        val = self.a - self.low - (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB M
+    def i0x9e(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a - self.ram[ptr] - (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # SBB A
+    def i0x9f(self):
+        val = self.a - self.a - (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # ANA B
+    def i0xa0(self):
+        val = self.a & self.b
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ANA C
+    def i0xa1(self):
+        val = self.a & self.c
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ANA D
+    def i0xa2(self):
+        val = self.a & self.d
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ANA E
+    def i0xa3(self):
+        val = self.a & self.e
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ANA H
+    def i0xa4(self):
+        val = self.a & self.high
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ANA L
+    def i0xa5(self):
+        val = self.a & self.low
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ANA M
+    def i0xa6(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a & self.ram[ptr]
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ANA A
+    def i0xa7(self):
+        val = self.a & self.a
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # XRA B
+    def i0xa8(self):
+        val = self.a ^ self.b
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # XRA C
+    def i0xa9(self):
+        val = self.a ^ self.c
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # XRA D
+    def i0xaa(self):
+        val = self.a ^ self.d
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # XRA E
+    def i0xab(self):
+        val = self.a ^ self.e
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # XRA H
+    def i0xac(self):
+        val = self.a ^ self.high
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # XRA L
+    def i0xad(self):
+        val = self.a ^ self.low
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # XRA M
+    def i0xae(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a ^ self.ram[ptr]
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # XRA A
+    def i0xaf(self):
+        val = self.a ^ self.a
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ORA B
+    def i0xb0(self):
+        val = self.a | self.b
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ORA C
+    def i0xb1(self):
+        val = self.a | self.c
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ORA D
+    def i0xb2(self):
+        val = self.a | self.d
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ORA E
+    def i0xb3(self):
+        val = self.a | self.e
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ORA H
+    def i0xb4(self):
+        val = self.a | self.high
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ORA L
+    def i0xb5(self):
+        val = self.a | self.low
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ORA M
+    def i0xb6(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a | self.ram[ptr]
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # ORA A
+    def i0xb7(self):
+        val = self.a | self.a
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # CMP B
+    def i0xb8(self):
+        val = self.a - self.b
+        self.flags = ARITH_PSW[val & 0x1ff]
+
+    # CMP C
+    def i0xb9(self):
+        val = self.a - self.c
+        self.flags = ARITH_PSW[val & 0x1ff]
+
+    # CMP D
+    def i0xba(self):
+        val = self.a - self.d
+        self.flags = ARITH_PSW[val & 0x1ff]
+
+    # CMP E
+    def i0xbb(self):
+        val = self.a - self.e
+        self.flags = ARITH_PSW[val & 0x1ff]
+
+    # CMP H
+    def i0xbc(self):
+        val = self.a - self.high
+        self.flags = ARITH_PSW[val & 0x1ff]
+
+    # CMP L
+    def i0xbd(self):
+        val = self.a - self.low
+        self.flags = ARITH_PSW[val & 0x1ff]
+
+    # CMP M
+    def i0xbe(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a - self.ram[ptr]
+        self.flags = ARITH_PSW[val & 0x1ff]
+
+    # CMP A
+    def i0xbf(self):
+        val = self.a - self.a
+        self.flags = ARITH_PSW[val & 0x1ff]
+
+    # RNZ
+    def i0xc0(self):
+        if not self.flags & Z_FLAG:
+            self._ret()
+        else:
+            return False
+
+    # JNZ adr
+    def i0xc2(self):
+        address = self._get_address16()
+        if not self.flags & Z_FLAG:
+            self.pc = address
+
+    # CNZ adr
+    def i0xc4(self):
+        address = self._get_address16()
+        if not self.flags & Z_FLAG:
+            self._call(address)
+        else:
+            return False
+
+    # ADI D8
+    def i0xc6(self):
+        val = self.a + self._read()
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # RZ
+    def i0xc8(self):
+        if self.flags & Z_FLAG:
+            self._ret()
+        else:
+            return False
+
+    # JZ adr
+    def i0xca(self):
+        address = self._get_address16()
+        if self.flags & Z_FLAG:
+            self.pc = address
+
+    # CZ adr
+    def i0xcc(self):
+        address = self._get_address16()
+        if self.flags & Z_FLAG:
+            self._call(address)
+        else:
+            return False
+
+    # ACI D8
+    def i0xce(self):
+        val = self.a + self._read() + (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # RNC
+    def i0xd0(self):
+        if not self.flags & CY_FLAG:
+            self._ret()
+        else:
+            return False
+
+    # JNC adr
+    def i0xd2(self):
+        address = self._get_address16()
+        if not self.flags & CY_FLAG:
+            self.pc = address
+
+    # CNC adr
+    def i0xd4(self):
+        address = self._get_address16()
+        if not self.flags & CY_FLAG:
+            self._call(address)
+        else:
+            return False
+
+    # SUI D8
+    def i0xd6(self):
+        val = self.a - self._read()
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # RC
+    def i0xd8(self):
+        if self.flags & CY_FLAG:
+            self._ret()
+        else:
+            return False
+
+    # JC adr
+    def i0xda(self):
+        address = self._get_address16()
+        if self.flags & CY_FLAG:
+            self.pc = address
+
+    # CC adr
+    def i0xdc(self):
+        address = self._get_address16()
+        if self.flags & CY_FLAG:
+            self._call(address)
+        else:
+            return False
+
+    # SBI D8
+    def i0xde(self):
+        val = self.a - self._read() - (self.flags & CY_FLAG)
+        self.flags = ARITH_PSW[val & 0x1ff]
+        self.a = val & 0xff
+
+    # RPO
+    def i0xe0(self):
+        if not self.flags & P_FLAG:
+            self._ret()
+        else:
+            return False
+
+    # JPO adr
+    def i0xe2(self):
+        address = self._get_address16()
+        if not self.flags & P_FLAG:
+            self.pc = address
+
+    # CPO adr
+    def i0xe4(self):
+        address = self._get_address16()
+        if not self.flags & P_FLAG:
+            self._call(address)
+        else:
+            return False
+
+    # ANI D8
+    def i0xe6(self):
+        val = self.a & self._read()
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # RPE
+    def i0xe8(self):
+        if self.flags & P_FLAG:
+            self._ret()
+        else:
+            return False
+
+    # JPE adr
+    def i0xea(self):
+        address = self._get_address16()
+        if self.flags & P_FLAG:
+            self.pc = address
+
+    # CPE adr
+    def i0xec(self):
+        address = self._get_address16()
+        if self.flags & P_FLAG:
+            self._call(address)
+        else:
+            return False
+
+    # XRI D8
+    def i0xee(self):
+        val = self.a ^ self._read()
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # RP
+    def i0xf0(self):
+        if not self.flags & S_FLAG:
+            self._ret()
+        else:
+            return False
+
+    # POP PSW
+    def i0xf1(self):
+        self.flags = self.ram[self.sp] & All_FLAG
+        self.a = self.ram[self.sp + 1]
+        self.sp += 2
+
+    # JP adr
+    def i0xf2(self):
+        address = self._get_address16()
+        if not self.flags & S_FLAG:
+            self.pc = address
+
+    # CP adr
+    def i0xf4(self):
+        address = self._get_address16()
+        if not self.flags & S_FLAG:
+            self._call(address)
+        else:
+            return False
+
+    # PUSH PSW
+    def i0xf5(self):
+        self.ram[self.sp - 2] = self.flags
+        self.ram[self.sp - 1] = self.a
+        self.sp -= 2
+
+    # ORI D8
+    def i0xf6(self):
+        val = self.a | self._read()
+        self.flags = LOGIC_PSW[val]
+        self.a = val & 0xff
+
+    # RM
+    def i0xf8(self):
+        if self.flags & S_FLAG:
+            self._ret()
+        else:
+            return False
+
+    # JM adr
+    def i0xfa(self):
+        address = self._get_address16()
+        if self.flags & S_FLAG:
+            self.pc = address
+
+    # CM adr
+    def i0xfc(self):
+        address = self._get_address16()
+        if self.flags & S_FLAG:
+            self._call(address)
+        else:
+            return False
+
+    # CPI D8
+    def i0xfe(self):
+        val = self.a - self._read()
+        self.flags = ARITH_PSW[val & 0x1ff]
+
+
+class LazyOps:
+    # INR B
+    def i0x04(self):
+        val = self.b + 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.b = val & 0xff
+
+    # DCR B
+    def i0x05(self):
+        val = self.b - 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.b = val & 0xff
+
+    # INR C
+    def i0x0c(self):
+        val = self.c + 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.c = val & 0xff
+
+    # DCR C
+    def i0x0d(self):
+        val = self.c - 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.c = val & 0xff
+
+    # INR D
+    def i0x14(self):
+        val = self.d + 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.d = val & 0xff
+
+    # DCR D
+    def i0x15(self):
+        val = self.d - 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.d = val & 0xff
+
+    # INR E
+    def i0x1c(self):
+        val = self.e + 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.e = val & 0xff
+
+    # DCR E
+    def i0x1d(self):
+        val = self.e - 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.e = val & 0xff
+
+    # INR H
+    def i0x24(self):
+        val = self.high + 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.high = val & 0xff
+
+    # DCR H
+    def i0x25(self):
+        val = self.high - 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.high = val & 0xff
+
+    # DAA
+    def i0x27(self):
+        val = DAA[self.a | ((self.flags & 0x11) << 8)]
+        self._lazy = val
+        self.a = val & 0xff
+
+    # INR L
+    def i0x2c(self):
+        val = self.low + 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.low = val & 0xff
+
+    # DCR L
+    def i0x2d(self):
+        val = self.low - 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.low = val & 0xff
+
+    # INR M
+    def i0x34(self):
+        ptr = (self.high << 8) | self.low
+        val = self.ram[ptr] + 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.ram[ptr] = val & 0xff
+
+    # DCR M
+    def i0x35(self):
+        ptr = (self.high << 8) | self.low
+        val = self.ram[ptr] - 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.ram[ptr] = val & 0xff
+
+    # INR A
+    def i0x3c(self):
+        val = self.a + 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.a = val & 0xff
+
+    # DCR A
+    def i0x3d(self):
+        val = self.a - 1
+        self._lazy = LAZY_INC_DEC | (val & 0xff) | (self._lazy & 0x100)
+        self.a = val & 0xff
+
+    # ADD B
+    def i0x80(self):
+        val = self.a + self.b
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADD C
+    def i0x81(self):
+        val = self.a + self.c
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADD D
+    def i0x82(self):
+        val = self.a + self.d
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADD E
+    def i0x83(self):
+        val = self.a + self.e
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADD H
+    def i0x84(self):
+        val = self.a + self.high
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADD L
+    def i0x85(self):
+        val = self.a + self.low
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADD M
+    def i0x86(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a + self.ram[ptr]
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADD A
+    def i0x87(self):
+        val = self.a + self.a
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADC B
+    def i0x88(self):
+        val = self.a + self.b + (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADC C
+    def i0x89(self):
+        val = self.a + self.c + (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADC D
+    def i0x8a(self):
+        val = self.a + self.d + (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADC E
+    def i0x8b(self):
+        val = self.a + self.e + (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADC H
+    def i0x8c(self):
+        val = self.a + self.high + (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADC L
+    def i0x8d(self):
+        val = self.a + self.low + (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADC M
+    def i0x8e(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a + self.ram[ptr] + (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ADC A
+    def i0x8f(self):
+        val = self.a + self.a + (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SUB B
+    def i0x90(self):
+        val = self.a - self.b
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SUB C
+    def i0x91(self):
+        val = self.a - self.c
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SUB D
+    def i0x92(self):
+        val = self.a - self.d
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SUB E
+    def i0x93(self):
+        val = self.a - self.e
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SUB H
+    def i0x94(self):
+        val = self.a - self.high
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SUB L
+    def i0x95(self):
+        val = self.a - self.low
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SUB M
+    def i0x96(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a - self.ram[ptr]
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SUB A
+    def i0x97(self):
+        val = self.a - self.a
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SBB B
+    def i0x98(self):
+        val = self.a - self.b - (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SBB C
+    def i0x99(self):
+        val = self.a - self.c - (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SBB D
+    def i0x9a(self):
+        val = self.a - self.d - (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SBB E
+    def i0x9b(self):
+        val = self.a - self.e - (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SBB H
+    def i0x9c(self):
+        val = self.a - self.high - (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SBB L
+    def i0x9d(self):
+        val = self.a - self.low - (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SBB M
+    def i0x9e(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a - self.ram[ptr] - (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SBB A
+    def i0x9f(self):
+        val = self.a - self.a - (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ANA B
+    def i0xa0(self):
+        val = self.a & self.b
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ANA C
+    def i0xa1(self):
+        val = self.a & self.c
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ANA D
+    def i0xa2(self):
+        val = self.a & self.d
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ANA E
+    def i0xa3(self):
+        val = self.a & self.e
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ANA H
+    def i0xa4(self):
+        val = self.a & self.high
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ANA L
+    def i0xa5(self):
+        val = self.a & self.low
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ANA M
+    def i0xa6(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a & self.ram[ptr]
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ANA A
+    def i0xa7(self):
+        val = self.a & self.a
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # XRA B
+    def i0xa8(self):
+        val = self.a ^ self.b
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # XRA C
+    def i0xa9(self):
+        val = self.a ^ self.c
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # XRA D
+    def i0xaa(self):
+        val = self.a ^ self.d
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # XRA E
+    def i0xab(self):
+        val = self.a ^ self.e
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # XRA H
+    def i0xac(self):
+        val = self.a ^ self.high
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # XRA L
+    def i0xad(self):
+        val = self.a ^ self.low
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # XRA M
+    def i0xae(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a ^ self.ram[ptr]
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # XRA A
+    def i0xaf(self):
+        val = self.a ^ self.a
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ORA B
+    def i0xb0(self):
+        val = self.a | self.b
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ORA C
+    def i0xb1(self):
+        val = self.a | self.c
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ORA D
+    def i0xb2(self):
+        val = self.a | self.d
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ORA E
+    def i0xb3(self):
+        val = self.a | self.e
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ORA H
+    def i0xb4(self):
+        val = self.a | self.high
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ORA L
+    def i0xb5(self):
+        val = self.a | self.low
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ORA M
+    def i0xb6(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a | self.ram[ptr]
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ORA A
+    def i0xb7(self):
+        val = self.a | self.a
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # CMP B
+    def i0xb8(self):
+        val = self.a - self.b
+        self._lazy = val
+
+    # CMP C
+    def i0xb9(self):
+        val = self.a - self.c
+        self._lazy = val
+
+    # CMP D
+    def i0xba(self):
+        val = self.a - self.d
+        self._lazy = val
+
+    # CMP E
+    def i0xbb(self):
+        val = self.a - self.e
+        self._lazy = val
+
+    # CMP H
+    def i0xbc(self):
+        val = self.a - self.high
+        self._lazy = val
+
+    # CMP L
+    def i0xbd(self):
+        val = self.a - self.low
+        self._lazy = val
+
+    # CMP M
+    def i0xbe(self):
+        ptr = (self.high << 8) | self.low
+        val = self.a - self.ram[ptr]
+        self._lazy = val
+
+    # CMP A
+    def i0xbf(self):
+        val = self.a - self.a
+        self._lazy = val
+
+    # ADI D8
+    def i0xc6(self):
+        val = self.a + self._read()
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ACI D8
+    def i0xce(self):
+        val = self.a + self._read() + (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SUI D8
+    def i0xd6(self):
+        val = self.a - self._read()
+        self._lazy = val
+        self.a = val & 0xff
+
+    # SBI D8
+    def i0xde(self):
+        val = self.a - self._read() - (self.flags & CY_FLAG)
+        self._lazy = val
+        self.a = val & 0xff
+
+    # ANI D8
+    def i0xe6(self):
+        val = self.a & self._read()
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # XRI D8
+    def i0xee(self):
+        val = self.a ^ self._read()
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # ORI D8
+    def i0xf6(self):
+        val = self.a | self._read()
+        self._lazy = LAZY_LOGIC | val
+        self.a = val & 0xff
+
+    # CPI D8
+    def i0xfe(self):
+        val = self.a - self._read()
+        self._lazy = val
+
+
+class ProfiledOps:
+    # RNZ
+    def i0xc0(self):
+        if not self.Z:
+            self._ret()
+            self.profile.taken[0xc0] += 1
+        else:
+            self.profile.not_taken[0xc0] += 1
+            return False
+
+    # JNZ adr
+    def i0xc2(self):
+        address = self._get_address16()
+        if not self.Z:
+            self.pc = address
+            self.profile.taken[0xc2] += 1
+        else:
+            self.profile.not_taken[0xc2] += 1
+
+    # CNZ adr
+    def i0xc4(self):
+        address = self._get_address16()
+        if not self.Z:
+            self._call(address)
+            self.profile.taken[0xc4] += 1
+        else:
+            self.profile.not_taken[0xc4] += 1
+            return False
+
+    # RZ
+    def i0xc8(self):
+        if self.Z:
+            self._ret()
+            self.profile.taken[0xc8] += 1
+        else:
+            self.profile.not_taken[0xc8] += 1
+            return False
+
+    # JZ adr
+    def i0xca(self):
+        address = self._get_address16()
+        if self.Z:
+            self.pc = address
+            self.profile.taken[0xca] += 1
+        else:
+            self.profile.not_taken[0xca] += 1
+
+    # CZ adr
+    def i0xcc(self):
+        address = self._get_address16()
+        if self.Z:
+            self._call(address)
+            self.profile.taken[0xcc] += 1
+        else:
+            self.profile.not_taken[0xcc] += 1
+            return False
+
+    # RNC
+    def i0xd0(self):
+        if not self.CY:
+            self._ret()
+            self.profile.taken[0xd0] += 1
+        else:
+            self.profile.not_taken[0xd0] += 1
+            return False
+
+    # JNC adr
+    def i0xd2(self):
+        address = self._get_address16()
+        if not self.CY:
+            self.pc = address
+            self.profile.taken[0xd2] += 1
+        else:
+            self.profile.not_taken[0xd2] += 1
+
+    # CNC adr
+    def i0xd4(self):
+        address = self._get_address16()
+        if not self.CY:
+            self._call(address)
+            self.profile.taken[0xd4] += 1
+        else:
+            self.profile.not_taken[0xd4] += 1
+            return False
+
+    # RC
+    def i0xd8(self):
+        if self.CY:
+            self._ret()
+            self.profile.taken[0xd8] += 1
+        else:
+            self.profile.not_taken[0xd8] += 1
+            return False
+
+    # JC adr
+    def i0xda(self):
+        address = self._get_address16()
+        if self.CY:
+            self.pc = address
+            self.profile.taken[0xda] += 1
+        else:
+            self.profile.not_taken[0xda] += 1
+
+    # CC adr
+    def i0xdc(self):
+        address = self._get_address16()
+        if self.CY:
+            self._call(address)
+            self.profile.taken[0xdc] += 1
+        else:
+            self.profile.not_taken[0xdc] += 1
+            return False
+
+    # RPO
+    def i0xe0(self):
+        if not self.P:
+            self._ret()
+            self.profile.taken[0xe0] += 1
+        else:
+            self.profile.not_taken[0xe0] += 1
+            return False
+
+    # JPO adr
+    def i0xe2(self):
+        address = self._get_address16()
+        if not self.P:
+            self.pc = address
+            self.profile.taken[0xe2] += 1
+        else:
+            self.profile.not_taken[0xe2] += 1
+
+    # CPO adr
+    def i0xe4(self):
+        address = self._get_address16()
+        if not self.P:
+            self._call(address)
+            self.profile.taken[0xe4] += 1
+        else:
+            self.profile.not_taken[0xe4] += 1
+            return False
+
+    # RPE
+    def i0xe8(self):
+        if self.P:
+            self._ret()
+            self.profile.taken[0xe8] += 1
+        else:
+            self.profile.not_taken[0xe8] += 1
+            return False
+
+    # JPE adr
+    def i0xea(self):
+        address = self._get_address16()
+        if self.P:
+            self.pc = address
+            self.profile.taken[0xea] += 1
+        else:
+            self.profile.not_taken[0xea] += 1
+
+    # CPE adr
+    def i0xec(self):
+        address = self._get_address16()
+        if self.P:
+            self._call(address)
+            self.profile.taken[0xec] += 1
+        else:
+            self.profile.not_taken[0xec] += 1
+            return False
+
+    # RP
+    def i0xf0(self):
+        if not self.S:
+            self._ret()
+            self.profile.taken[0xf0] += 1
+        else:
+            self.profile.not_taken[0xf0] += 1
+            return False
+
+    # JP adr
+    def i0xf2(self):
+        address = self._get_address16()
+        if not self.S:
+            self.pc = address
+            self.profile.taken[0xf2] += 1
+        else:
+            self.profile.not_taken[0xf2] += 1
+
+    # CP adr
+    def i0xf4(self):
+        address = self._get_address16()
+        if not self.S:
+            self._call(address)
+            self.profile.taken[0xf4] += 1
+        else:
+            self.profile.not_taken[0xf4] += 1
+            return False
+
+    # RM
+    def i0xf8(self):
+        if self.S:
+            self._ret()
+            self.profile.taken[0xf8] += 1
+        else:
+            self.profile.not_taken[0xf8] += 1
+            return False
+
+    # JM adr
+    def i0xfa(self):
+        address = self._get_address16()
+        if self.S:
+            self.pc = address
+            self.profile.taken[0xfa] += 1
+        else:
+            self.profile.not_taken[0xfa] += 1
+
+    # CM adr
+    def i0xfc(self):
+        address = self._get_address16()
+        if self.S:
+            self._call(address)
+            self.profile.taken[0xfc] += 1
+        else:
+            self.profile.not_taken[0xfc] += 1
+            return False
@@ -0,0 +1,35 @@
+from flag_tables import S_FLAG, Z_FLAG, AC_FLAG, P_FLAG, CY_FLAG, All_FLAG
+from i8080 import I8080Chip
+from i8080_ops import PackedOps
+
+
+def _flag_property(mask):
+    def getter(self):
+        return (self.flags & mask) == mask
+
+    def setter(self, value):
+        if value:
+            self.flags |= mask
+        else:
+            self.flags &= ~mask
+    return property(getter, setter)
+
+
+class PackedI8080Chip(PackedOps, I8080Chip):
+    # Flags live in a single PSW byte, the boolean attributes of
+    # I8080Chip are kept as properties over it.
+    S = _flag_property(S_FLAG)
+    Z = _flag_property(Z_FLAG)
+    AC = _flag_property(AC_FLAG)
+    P = _flag_property(P_FLAG)
+    CY = _flag_property(CY_FLAG)
+
+    def __init__(self, memory):
+        self.flags = 0
+        super().__init__(memory)
+
+    def _pack_flags(self):
+        return self.flags
+
+    def _unpack_flags(self, val):
+        self.flags = val & All_FLAG
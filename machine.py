@@ -0,0 +1,79 @@
+from i8080 import I8080Chip
+from memory_map import invaders_memory
+
+FILE_PATH = 'rom//invaders'
+RAM_SIZE = 0x10000
+
+CYCLE_PER_SEC = 2 * 1000 * 1000  # 2M
+FPS = 60
+CYCLE_PER_FRAME = CYCLE_PER_SEC // FPS
+CYCLE_PER_HALF_FRAME = CYCLE_PER_FRAME // 2
+
+
+def load_rom(path=FILE_PATH):
+    with open(path, 'rb') as f:
+        rom = f.read()
+
+    memory = bytearray(RAM_SIZE)
+    memory[:len(rom)] = rom
+    return memory
+
+
+def create_chip(path=FILE_PATH, chip_class=I8080Chip, mapped=False):
+    # mapped protects the ROM and mirrors the RAM like the hardware, at the
+    # cost of a slower memory write
+    if mapped:
+        return chip_class(invaders_memory(path))
+    return chip_class(load_rom(path))
+
+
+def step_cycles(chip, n):
+    cycles = 0
+    while cycles < n:
+        cycles += chip.step_run()
+        if chip.halted:
+            # Nothing runs until the next interrupt
+            return max(cycles, n)
+    return cycles
+
+
+ENGINES = {
+    'step': step_cycles,
+    'run': I8080Chip.run,
+    'blocks': I8080Chip.run_blocks,
+}
+
+
+def frame_start(frame):
+    # Exact to the cycle, frames alternate between 33333 and 33334 cycles
+    return frame * CYCLE_PER_SEC // FPS
+
+
+def run_frame(chip, engine='blocks'):
+    # Runs to the end of the frame chip.cycles is in, with the mid-screen
+    # interrupt and the vblank interrupt on their exact cycles. Overshoot
+    # is carried into the next frame.
+    # The last frame whose start is not after chip.cycles
+    frame = ((chip.cycles + 1) * FPS - 1) // CYCLE_PER_SEC
+    end = frame_start(frame + 1)
+    scheduler = chip.scheduler
+    scheduler.schedule((frame_start(frame) + end) // 2,
+                       lambda at: chip.trigger_interrupt(1))
+    scheduler.schedule(end, lambda at: chip.trigger_interrupt(2))
+    start = chip.cycles
+    scheduler.run_until(end, ENGINES[engine])
+    return chip.cycles - start
+
+
+def run_frames(chip, frames, inputs=(), engine='blocks'):
+    # inputs are (frame, port1) pairs sorted by frame, port1 takes the value
+    # before that frame runs.
+    inputs = iter(inputs)
+    pending = next(inputs, None)
+    cycles = 0
+    for frame in range(frames):
+        while pending is not None and pending[0] <= frame:
+            chip.port1 = pending[1]
+            pending = next(inputs, None)
+        cycles += run_frame(chip, engine)
+    return cycles
@@ -1,21 +1,27 @@
+import argparse
+import time
+
 import pygame
 
 from i8080 import I8080Chip
+from machine import FPS, create_chip, run_frame
+from movie import Movie, Player, Recorder
 
-FILE_PATH = 'rom//invaders'
-RAM_SIZE = 0x10000
-
-CYCLE_PER_SEC = 2 * 1000 * 1000  # 2M
-FPS = 60
-CYCLE_PER_FRAME = CYCLE_PER_SEC // FPS
-CYCLE_PER_HALF_FRAME = CYCLE_PER_FRAME // 2
-DRAW_PER_N_FRMAE = 5
+DRAW_PER_N_FRMAE = 1
+ENGINE = 'blocks'
+DIRTY_RECTS = False
+# Turbo runs unthrottled and draws at most every TURBO_DRAW_INTERVAL
+# seconds of wall time unless a fixed frame skip is given
+TURBO_KEY = pygame.K_TAB
+TURBO_DRAW_INTERVAL = 1 / 30
 
 BLACK = (0, 0, 0)
 WHITE = (0xff, 0xff, 0xff)
+PALETTE = [BLACK, WHITE]
 
 
-def key_event_handler(chip):
+def key_event_handler(chip, keys=True):
+    # Returns True when turbo was toggled, keys=False ignores the game keys
     mapping = {
         pygame.K_LEFT: I8080Chip.LEFT_KEY,
         pygame.K_RIGHT: I8080Chip.RIGHT_KEY,
@@ -23,59 +29,162 @@ def key_event_handler(chip):
         pygame.K_SPACE: I8080Chip.SHOOT_KEY,
         pygame.K_1: I8080Chip.D1_KEY,
     }
+    toggle = False
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             exit()
         if event.type == pygame.KEYDOWN:
-            if event.key in mapping:
+            if event.key == TURBO_KEY:
+                toggle = not toggle
+            if keys and event.key in mapping:
                 chip.key_down(mapping[event.key])
         if event.type == pygame.KEYUP:
-            if event.key in mapping:
+            if keys and event.key in mapping:
                 chip.key_up(mapping[event.key])
+    return toggle
+
+
+class Renderer:
+    # Draws the converted frame through an 8-bit palettized surface with a
+    # single blit. With NumPy the surface shares the chip's frame buffer.
+    def __init__(self, chip, screen, dirty_rects=DIRTY_RECTS):
+        self.chip = chip
+        self.screen = screen
+        self.dirty_rects = dirty_rects
+        self.size = (I8080Chip.SCREEN_WIDTH, I8080Chip.SCREEN_HEIGHT)
+        self.surface = None
+        if chip.frame is not None:
+            self.surface = self._make_surface(chip.frame.view('uint8'))
+
+    def _make_surface(self, buffer):
+        surface = pygame.image.frombuffer(buffer, self.size, 'P')
+        surface.set_palette(PALETTE)
+        return surface
+
+    def draw(self):
+        frame = self.chip.convert()
+        surface = self.surface
+        if surface is None:
+            surface = self._make_surface(bytes(frame))
+        self.screen.blit(surface, (0, 0))
+        if self.dirty_rects:
+            pygame.display.update(
+                [pygame.Rect(rect) for rect in self.chip.dirty_rects])
+        else:
+            pygame.display.flip()
 
 
-def run_cycle(chip, cycle_count):
-    cycle = 0
-    while cycle < cycle_count:
-        cycle += chip.step_run()
-
-
-def main():
-    with open(FILE_PATH, 'rb') as f:
-        rom = f.read()
-
-    memory = bytearray(RAM_SIZE)
-    memory[:len(rom)] = rom
-
-    chip = I8080Chip(memory)
+class Turbo:
+    # Frame skip for the unthrottled mode. With draw_every the frame is
+    # drawn every Nth emulated frame, otherwise the skip adapts so a draw
+    # happens every draw_interval of wall time whatever the host speed.
+    def __init__(self, enabled=False, draw_every=0,
+                 draw_interval=TURBO_DRAW_INTERVAL):
+        self.enabled = enabled
+        self.draw_every = draw_every
+        self.draw_interval = draw_interval
+        self.reset()
+
+    def reset(self):
+        now = time.perf_counter()
+        self.skipped = 0
+        self.last_draw = now
+        self.frames = 0
+        self.last_report = now
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.reset()
+        if not self.enabled:
+            pygame.display.set_caption('')
+
+    def frame_done(self):
+        # Counts an emulated frame, returns True when it should be drawn
+        self.frames += 1
+        self.skipped += 1
+        now = time.perf_counter()
+        if now - self.last_report >= 1:
+            self.report(now)
+        if self.draw_every:
+            draw = self.skipped >= self.draw_every
+        else:
+            draw = now - self.last_draw >= self.draw_interval
+        if draw:
+            self.skipped = 0
+            self.last_draw = now
+        return draw
+
+    def report(self, now):
+        speed_up = self.frames / FPS / (now - self.last_report)
+        text = f'turbo {speed_up:.1f}x'
+        print(text)
+        pygame.display.set_caption(text)
+        self.frames = 0
+        self.last_report = now
+
+
+def main(turbo=False, draw_every=0, record=None, replay=None, mapped=False):
+    movie = Movie.load(replay) if replay else None
+    engine = ENGINE
+    if movie is not None:
+        # Played the way it was recorded
+        engine = movie.engine
+        mapped = movie.mapped
+    chip = create_chip(mapped=mapped)
+    recorder = Recorder(chip, engine=engine) if record else None
+    player = Player(chip, movie) if movie is not None else None
 
     pygame.init()
     clock = pygame.time.Clock()
     screen = pygame.display.set_mode(
         (I8080Chip.SCREEN_WIDTH, I8080Chip.SCREEN_HEIGHT))
 
+    renderer = Renderer(chip, screen)
+    turbo = Turbo(turbo, draw_every)
     frame_count = 0
 
-    while True:
-        key_event_handler(chip)
-
-        run_cycle(chip, CYCLE_PER_HALF_FRAME)
-        chip.trigger_interrupt(1)
-        run_cycle(chip, CYCLE_PER_HALF_FRAME)
-        chip.trigger_interrupt(2)
-
-        frame_count += 1
-        if frame_count == DRAW_PER_N_FRMAE:
-            chip.convert()
-            screen.fill(BLACK)
-            for i in range(I8080Chip.SCREEN_HEIGHT):
-                for j in range(I8080Chip.SCREEN_WIDTH):
-                    if chip.screen(i * I8080Chip.SCREEN_WIDTH + j):
-                        screen.set_at((j, i), WHITE)
-            pygame.display.flip()
-            clock.tick(60)
-            frame_count = 0
+    try:
+        while True:
+            # The keyboard takes over once a replay is done
+            replaying = player is not None and not player.done
+            if key_event_handler(chip, not replaying):
+                turbo.toggle()
+            if replaying:
+                player.apply()
+            if recorder is not None:
+                recorder.sample()
+
+            run_frame(chip, engine)
+
+            if turbo.enabled:
+                if turbo.frame_done():
+                    renderer.draw()
+                continue
+
+            frame_count += 1
+            if frame_count == DRAW_PER_N_FRMAE:
+                renderer.draw()
+                clock.tick(FPS)
+                frame_count = 0
+    finally:
+        if recorder is not None:
+            recorder.movie.save(record)
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Space Invaders')
+    parser.add_argument('--turbo', action='store_true',
+                        help=f'run unthrottled, '
+                             f'{pygame.key.name(TURBO_KEY)} toggles it')
+    parser.add_argument('--draw-every', type=int, default=0, metavar='N',
+                        help='in turbo draw every Nth frame instead of '
+                             'adapting to the host speed')
+    parser.add_argument('--record', metavar='PATH',
+                        help='record the input movie to PATH on exit')
+    parser.add_argument('--replay', metavar='PATH',
+                        help='play back an input movie')
+    parser.add_argument('--mapped', action='store_true',
+                        help='use the memory map with ROM protection and '
+                             'RAM mirrors, replays take it from the movie')
+    args = parser.parse_args()
+    main(args.turbo, args.draw_every, args.record, args.replay, args.mapped)
@@ -0,0 +1,71 @@
+import mmap
+
+PAGE_SHIFT = 8
+PAGE_SIZE = 1 << PAGE_SHIFT
+
+_store = bytearray.__setitem__
+
+
+class MappedMemory(bytearray):
+    # Still one flat bytearray, so every core keeps reading it with a plain
+    # index. Writes go through a page table instead: each mapped 256-byte
+    # page lists all the pages aliasing it, a mirror write lands in every
+    # copy and a ROM page lists none. Unmapped pages are None and stored
+    # directly.
+    def __init__(self, size=0x10000):
+        super().__init__(size)
+        # Base addresses of the pages each page is written to
+        self.pages = [None] * (size >> PAGE_SHIFT)
+
+    def load_rom(self, path, start=0):
+        # The file is mapped rather than read into an intermediate buffer
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as rom:
+                end = start + len(rom)
+                _store(self, slice(start, end), rom)
+        self.protect(start, end)
+        return end
+
+    def protect(self, start, end):
+        for page in range(start >> PAGE_SHIFT, end >> PAGE_SHIFT):
+            self.pages[page] = ()
+
+    def mirror(self, start, end, target, size):
+        # [start, end) repeats [target, target + size)
+        groups = {}
+        for page in range(target >> PAGE_SHIFT, (target + size) >> PAGE_SHIFT):
+            groups[page] = [page]
+        for address in range(start, end, PAGE_SIZE):
+            page = (target + (address - start) % size) >> PAGE_SHIFT
+            groups[page].append(address >> PAGE_SHIFT)
+        for aliases in groups.values():
+            bases = tuple(page << PAGE_SHIFT for page in aliases)
+            for page in aliases:
+                self.pages[page] = bases
+            # Bring the mirrors in line with what is there now
+            data = self[bases[0]:bases[0] + PAGE_SIZE]
+            for base in bases[1:]:
+                _store(self, slice(base, base + PAGE_SIZE), data)
+
+    def __setitem__(self, index, val):
+        if index.__class__ is not int:
+            # Whole ranges come from save states and snapshots, which were
+            # taken from memory that was consistent already
+            _store(self, index, val)
+            return
+        bases = self.pages[(index & 0xffff) >> 8]
+        if bases is None:
+            _store(self, index, val)
+            return
+        offset = index & 0xff
+        for base in bases:
+            _store(self, base | offset, val)
+
+
+def invaders_memory(path):
+    # 8 KB ROM, 8 KB RAM from 0x2000 with the video RAM at 0x2400, the
+    # address decoding repeats the RAM from 0x4000 up
+    memory = MappedMemory()
+    memory.load_rom(path)
+    memory.mirror(0x4000, 0x10000, 0x2000, 0x2000)
+    return memory
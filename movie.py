@@ -0,0 +1,152 @@
+import argparse
+import hashlib
+import struct
+import time
+
+from i8080 import I8080Chip
+from machine import FILE_PATH, FPS, ENGINES, create_chip, run_frame
+from memory_map import MappedMemory
+
+# magic, version, frame count, ROM md5, start state size, input count,
+# engine, memory map, then the start state (a save_state() blob, may be
+# empty) and the inputs
+HEADER = struct.Struct('<7sBI16sII8s?')
+INPUT = struct.Struct('<IB')
+MAGIC = b'I8080MV'
+VERSION = 2
+
+
+class Movie:
+    # port1 transitions keyed by the frame they take effect before. engine
+    # and mapped are how the frames were run, a replay runs them the same.
+    def __init__(self, rom_md5, state=b'', inputs=None, frames=0,
+                 engine='blocks', mapped=False):
+        self.rom_md5 = rom_md5
+        self.state = state
+        self.inputs = inputs if inputs is not None else []
+        self.frames = frames
+        self.engine = engine
+        self.mapped = mapped
+
+    def to_bytes(self):
+        buffer = HEADER.pack(MAGIC, VERSION, self.frames, self.rom_md5,
+                             len(self.state), len(self.inputs),
+                             self.engine.encode(), self.mapped)
+        buffer += self.state
+        for frame, port1 in self.inputs:
+            buffer += INPUT.pack(frame, port1)
+        return buffer
+
+    @staticmethod
+    def from_bytes(data):
+        magic, version, frames, rom_md5, state_size, count, engine, \
+            mapped = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError('Not an input movie')
+        if version != VERSION:
+            raise ValueError(f'Unsupported movie version {version}')
+        engine = engine.rstrip(b'\0').decode()
+        if engine not in ENGINES:
+            raise ValueError(f'Unknown engine {engine}')
+        offset = HEADER.size
+        state = data[offset:offset + state_size]
+        offset += state_size
+        inputs = [INPUT.unpack_from(data, offset + i * INPUT.size)
+                  for i in range(count)]
+        return Movie(rom_md5, state, inputs, frames, engine, mapped)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as f:
+            return Movie.from_bytes(f.read())
+
+
+def rom_md5(chip):
+    return hashlib.md5(chip.ram[:I8080Chip.ROM_SIZE]).digest()
+
+
+def is_mapped(chip):
+    return isinstance(chip.ram, MappedMemory)
+
+
+class Recorder:
+    # sample() once per frame, before the frame runs on engine
+    def __init__(self, chip, from_state=False, engine='blocks'):
+        self.chip = chip
+        state = chip.save_state() if from_state else b''
+        self.movie = Movie(rom_md5(chip), state, engine=engine,
+                           mapped=is_mapped(chip))
+        self.port1 = None
+
+    def sample(self):
+        port1 = self.chip.port1 & 0xff
+        if port1 != self.port1:
+            self.movie.inputs.append((self.movie.frames, port1))
+            self.port1 = port1
+        self.movie.frames += 1
+
+
+class Player:
+    # Feeds a movie into a chip frame by frame, apply() before each frame.
+    # The frames have to run on movie.engine to come out the same.
+    def __init__(self, chip, movie):
+        if movie.rom_md5 != rom_md5(chip):
+            raise ValueError('Movie was recorded with another ROM')
+        if movie.mapped != is_mapped(chip):
+            raise ValueError('Movie was recorded with the memory map '
+                             if movie.mapped else
+                             'Movie was recorded without the memory map')
+        self.chip = chip
+        self.movie = movie
+        self.frame = 0
+        self.index = 0
+        if movie.state:
+            chip.load_state(movie.state)
+
+    @property
+    def done(self):
+        return self.frame >= self.movie.frames
+
+    def apply(self):
+        inputs = self.movie.inputs
+        while self.index < len(inputs) and \
+                inputs[self.index][0] <= self.frame:
+            self.chip.port1 = inputs[self.index][1]
+            self.index += 1
+        self.frame += 1
+
+
+def replay(movie, path=FILE_PATH):
+    # Headless and as fast as the engine goes, on the engine and memory the
+    # movie was recorded with. Returns the chip at the end.
+    chip = create_chip(path, mapped=movie.mapped)
+    player = Player(chip, movie)
+    while not player.done:
+        player.apply()
+        run_frame(chip, movie.engine)
+    return chip
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay an input movie')
+    parser.add_argument('movie')
+    parser.add_argument('--rom', default=FILE_PATH)
+    args = parser.parse_args()
+
+    movie = Movie.load(args.movie)
+    start = time.perf_counter()
+    chip = replay(movie, args.rom)
+    elapsed = time.perf_counter() - start
+    print(f'{movie.frames} frames on {movie.engine}'
+          f'{" with the memory map" if movie.mapped else ""}, '
+          f'{len(movie.inputs)} inputs in '
+          f'{elapsed:.2f}s ({movie.frames / FPS / elapsed:.1f}x real time)')
+    print(f'ram md5 {hashlib.md5(chip.ram).hexdigest()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+class PortBus:
+    # One read and one write handler per port. The cores index the tables
+    # directly, so handlers are swapped in place and never the tables.
+    def __init__(self):
+        self.readers = [self.open_bus] * 0x100
+        self.writers = [self.ignore] * 0x100
+
+    def map_read(self, port, handler):
+        self.readers[port] = handler
+
+    def map_write(self, port, handler):
+        self.writers[port] = handler
+
+    def read(self, port):
+        return self.readers[port]()
+
+    def write(self, port, val):
+        self.writers[port](val)
+
+    @staticmethod
+    def open_bus():
+        return 0
+
+    @staticmethod
+    def ignore(val):
+        pass
+
+
+class Latch:
+    # Keeps the last value written, e.g. the sound ports
+    def __init__(self):
+        self.value = 0
+
+    def write(self, val):
+        self.value = val
@@ -0,0 +1,254 @@
+import argparse
+import sys
+from array import array
+
+from core_ops import ENDS_BLOCK, MNEMONICS, SIZES
+
+CONDITIONAL_JUMP = 0xc2
+CONDITIONAL = (0xc0, CONDITIONAL_JUMP, 0xc4)
+
+
+def is_conditional(opcode):
+    return (opcode & 0xc7) in CONDITIONAL
+
+
+def is_conditional_jump(opcode):
+    return (opcode & 0xc7) == CONDITIONAL_JUMP
+
+
+class OpcodeProfile:
+    # Filled by I8080Chip._step_run_profiled, taken branches by the
+    # ProfiledOps handlers. Times are in nanoseconds.
+    def __init__(self):
+        self.counts = [0] * 0x100
+        self.times = [0] * 0x100
+        self.taken = [0] * 0x100
+        self.not_taken = [0] * 0x100
+
+    def clear(self):
+        self.__init__()
+
+    def by_handler(self, handlers):
+        # Opcodes sharing a handler are summed under its name
+        result = {}
+        for opcode, handler in enumerate(handlers):
+            name = handler.__name__
+            count, time = result.get(name, (0, 0))
+            result[name] = (count + self.counts[opcode],
+                            time + self.times[opcode])
+        return result
+
+    def report(self, handlers, top=None, file=sys.stdout):
+        total = sum(self.times) or 1
+        opcodes = sorted(
+            (opcode for opcode in range(0x100) if self.counts[opcode]),
+            key=lambda opcode: self.times[opcode], reverse=True)
+        print(f'{"op":>4} {"handler":<12} {"count":>12} {"ms":>10} '
+              f'{"ns/op":>8} {"share":>7} {"taken":>10} {"not taken":>10}',
+              file=file)
+        for opcode in opcodes[:top]:
+            count = self.counts[opcode]
+            time = self.times[opcode]
+            line = (f'{opcode:#04x} {handlers[opcode].__name__:<12} '
+                    f'{count:>12,} {time / 1e6:>10.2f} {time / count:>8.0f} '
+                    f'{time / total:>7.1%}')
+            if is_conditional(opcode):
+                line += (f' {self.taken[opcode]:>10,}'
+                         f' {self.not_taken[opcode]:>10,}')
+            print(line, file=file)
+
+        print(file=file)
+        print(f'{"handler":<17} {"count":>12} {"ms":>10} {"share":>7}',
+              file=file)
+        rows = sorted(self.by_handler(handlers).items(),
+                      key=lambda item: item[1][1], reverse=True)
+        for name, (count, time) in rows[:top]:
+            if count:
+                print(f'{name:<17} {count:>12,} {time / 1e6:>10.2f} '
+                      f'{time / total:>7.1%}', file=file)
+
+
+class AddressProfile:
+    # Per-address counters over the 64K address space. Reads include the
+    # opcode and operand fetches.
+    def __init__(self):
+        self.executed = array('I', [0]) * 0x10000
+        self.reads = array('I', [0]) * 0x10000
+        self.writes = array('I', [0]) * 0x10000
+
+    def save(self, path):
+        # executed, reads and writes as three native uint32 arrays, e.g.
+        # numpy.fromfile(path, 'uint32').reshape(3, 0x10000)
+        with open(path, 'wb') as f:
+            for counts in (self.executed, self.reads, self.writes):
+                counts.tofile(f)
+
+    def hottest(self, counts, top=20):
+        return sorted(
+            (address for address in range(0x10000) if counts[address]),
+            key=lambda address: counts[address], reverse=True)[:top]
+
+    def listing(self, ram, start=0, end=0x2000, executed_only=False):
+        # Linear disassembly annotated with the execution count and share
+        # of each instruction, and the traffic on its direct address.
+        total = sum(self.executed) or 1
+        lines = []
+        pc = start
+        while pc < end:
+            opcode = ram[pc]
+            size = SIZES[opcode]
+            count = self.executed[pc]
+            if count or not executed_only:
+                line = f'{pc:04x}  {disassemble(ram, pc):<16}'
+                if count:
+                    line += f' {count:>10,} {count / total:>7.2%}'
+                if 'adr' in MNEMONICS[opcode]:
+                    address = ram[pc + 1] | (ram[pc + 2] << 8)
+                    line += (f'  [{address:04x}] r {self.reads[address]:,}'
+                             f' w {self.writes[address]:,}')
+                lines.append(line.rstrip())
+            pc += size
+        return lines
+
+
+def fusion_candidates(executed, ram, top=16, max_length=6):
+    # Straight-line opcode sequences weighted by the dispatches fusing them
+    # would save, from the per-pc execution counts
+    scores = {}
+    for address in range(0x10000):
+        count = executed[address]
+        if not count:
+            continue
+        sequence = []
+        pc = address
+        while len(sequence) < max_length and pc < 0x10000:
+            opcode = ram[pc]
+            if MNEMONICS[opcode] == '-':
+                break
+            sequence.append(opcode)
+            pc += SIZES[opcode]
+            if ENDS_BLOCK[opcode]:
+                break
+        for length in range(2, len(sequence) + 1):
+            key = tuple(sequence[:length])
+            scores[key] = scores.get(key, 0) + count * (length - 1)
+    chosen = []
+    for sequence in sorted(scores, key=scores.get, reverse=True):
+        # The head or tail of a chosen sequence mostly runs inside it
+        if any(sequence == other[:len(sequence)] or
+               sequence == other[-len(sequence):] for other in chosen):
+            continue
+        chosen.append(sequence)
+        if len(chosen) == top:
+            break
+    return [(sequence, scores[sequence]) for sequence in chosen]
+
+
+def write_fusion(path, candidates, command):
+    # Read by generate.py, command is the run that reproduces the file
+    with open(path, 'w') as f:
+        f.write('// Generated by profiler.py, read by generate.py\n')
+        f.write(f'// {command}\n')
+        f.write('// Opcodes\tMnemonics\tSaved dispatches\n')
+        for sequence, score in candidates:
+            opcodes = ' '.join(f'{opcode:#04x}' for opcode in sequence)
+            names = '; '.join(MNEMONICS[opcode] for opcode in sequence)
+            f.write(f'{opcodes}\t{names}\t{score}\n')
+
+
+class CountingMemory:
+    # Stands in for the chip's ram while address profiling. Everything is
+    # passed on to the memory itself, so a memory map keeps its ROM
+    # protection and mirrors. Slices are not counted.
+    def __init__(self, memory, profile):
+        self.memory = memory
+        self.reads = profile.reads
+        self.writes = profile.writes
+
+    def __len__(self):
+        return len(self.memory)
+
+    def __getitem__(self, index):
+        if index.__class__ is int:
+            self.reads[index & 0xffff] += 1
+        return self.memory[index]
+
+    def __setitem__(self, index, val):
+        if index.__class__ is int:
+            self.writes[index & 0xffff] += 1
+        self.memory[index] = val
+
+
+def disassemble(ram, pc):
+    opcode = ram[pc]
+    text = MNEMONICS[opcode]
+    if text == '-':
+        return f'db ${opcode:02x}'
+    low = ram[(pc + 1) & 0xffff]
+    high = ram[(pc + 2) & 0xffff]
+    if 'D16' in text or 'adr' in text:
+        val = f'${high:02x}{low:02x}'
+        return text.replace('D16', val).replace('adr', val)
+    return text.replace('D8', f'#${low:02x}')
+
+
+def main():
+    from machine import create_chip, run_frame
+
+    parser = argparse.ArgumentParser(
+        description='Per-opcode profile of the ROM under step_run')
+    parser.add_argument('frames', type=int, nargs='?', default=600)
+    parser.add_argument('--movie', metavar='PATH',
+                        help='play the inputs of a movie while profiling')
+    parser.add_argument('--top', type=int, default=None)
+    parser.add_argument('--heatmap', metavar='PATH',
+                        help='save the per-address counters')
+    parser.add_argument('--listing', metavar='PATH',
+                        help='write the annotated disassembly of the ROM')
+    parser.add_argument('--fusion', metavar='PATH',
+                        help='write the hot opcode sequences for generate.py')
+    args = parser.parse_args()
+
+    addresses = bool(args.heatmap or args.listing or args.fusion)
+    movie = None
+    if args.movie:
+        from movie import Movie, Player
+        movie = Movie.load(args.movie)
+    chip = create_chip(mapped=movie is not None and movie.mapped)
+    player = Player(chip, movie) if movie is not None else None
+    chip.enable_profiling(addresses)
+    for _ in range(args.frames):
+        if player:
+            player.apply()
+        run_frame(chip, 'step')
+    chip.profile.report(chip.opcode_handlers, args.top)
+
+    if addresses:
+        # Back to the plain ram so the listing does not count its own reads
+        chip.disable_profiling()
+        profile = chip.address_profile
+        print()
+        print('hottest pc ' + ' '.join(
+            f'{address:04x}' for address in profile.hottest(profile.executed)))
+        print('most read  ' + ' '.join(
+            f'{address:04x}' for address in profile.hottest(profile.reads)))
+        print('most write ' + ' '.join(
+            f'{address:04x}' for address in profile.hottest(profile.writes)))
+        if args.heatmap:
+            profile.save(args.heatmap)
+        if args.listing:
+            with open(args.listing, 'w') as f:
+                for line in profile.listing(chip.ram):
+                    f.write(line + '\n')
+        if args.fusion:
+            command = f'python profiler.py {args.frames}'
+            if args.movie:
+                command += f' --movie {args.movie}'
+            command += f' --fusion {args.fusion}'
+            write_fusion(args.fusion,
+                         fusion_candidates(profile.executed, chip.ram),
+                         command)
+
+
+if __name__ == '__main__':
+    main()
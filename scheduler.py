@@ -0,0 +1,33 @@
+from heapq import heappop, heappush
+from itertools import count
+
+
+class Scheduler:
+    # Events are (cycle, order, callback) on a min-heap, keyed by the chip's
+    # absolute cycle counter. The engine runs up to each event in one call,
+    # what it overshoots is simply taken off the next slice.
+    def __init__(self, chip):
+        self.chip = chip
+        self.events = []
+        self._order = count()
+
+    def schedule(self, cycle, callback):
+        # callback(cycle) fires once the chip has reached cycle
+        heappush(self.events, (cycle, next(self._order), callback))
+
+    def schedule_in(self, cycles, callback):
+        self.schedule(self.chip.cycles + cycles, callback)
+
+    def run_until(self, cycle, run):
+        # run(chip, budget) is one of the engines and returns the cycles
+        # it spent, the events due by cycle fire in order
+        chip = self.chip
+        events = self.events
+        while events and events[0][0] <= cycle:
+            at = events[0][0]
+            if chip.cycles < at:
+                chip.cycles += run(chip, at - chip.cycles)
+            _, _, callback = heappop(events)
+            callback(at)
+        if chip.cycles < cycle:
+            chip.cycles += run(chip, cycle - chip.cycles)
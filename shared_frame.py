@@ -0,0 +1,118 @@
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+from i8080 import I8080Chip, np
+
+# sequence, frame size, video RAM size. The sequence is odd while a frame is
+# being written, a read is good if it saw the same even value before and
+# after copying.
+HEADER = struct.Struct('<QII')
+FRAME_SIZE = I8080Chip.SCREEN_WIDTH * I8080Chip.SCREEN_HEIGHT
+VIDEO_START = 0x2400
+VIDEO_END = 0x4000
+
+
+class FrameExporter:
+    # Moves the chip's converted frame into shared memory, convert() then
+    # writes straight into it. One byte per pixel, 0 or 1, row major.
+    def __init__(self, chip, name=None, video=False):
+        self.chip = chip
+        video_size = VIDEO_END - VIDEO_START if video else 0
+        self.shm = shared_memory.SharedMemory(
+            name, create=True, size=HEADER.size + FRAME_SIZE + video_size)
+        self.name = self.shm.name
+        self.sequence = 0
+        HEADER.pack_into(self.shm.buf, 0, 0, FRAME_SIZE, video_size)
+        self.video = None
+        if video:
+            start = HEADER.size + FRAME_SIZE
+            self.video = self.shm.buf[start:start + video_size]
+
+        pixels = self.shm.buf[HEADER.size:HEADER.size + FRAME_SIZE]
+        if np is not None:
+            chip.frame = np.ndarray(
+                (I8080Chip.SCREEN_HEIGHT, I8080Chip.SCREEN_WIDTH),
+                dtype=bool, buffer=pixels)
+            chip.video_ram = chip.frame.reshape(-1)
+        else:
+            chip.video_ram = pixels
+        self._pixels = pixels
+        # Everything is drawn again into the new buffer
+        chip._video_shadow = None
+
+    def publish(self):
+        buf = self.shm.buf
+        self.sequence += 1
+        struct.pack_into('<Q', buf, 0, self.sequence)
+        self.chip.convert()
+        if self.video is not None:
+            self.video[:] = self.chip.ram[VIDEO_START:VIDEO_END]
+        self.sequence += 1
+        struct.pack_into('<Q', buf, 0, self.sequence)
+        return self.sequence
+
+    def close(self):
+        # The chip gets private buffers back, then the block is freed
+        chip = self.chip
+        if np is not None:
+            chip.frame = chip.frame.copy()
+            chip.video_ram = chip.frame.reshape(-1)
+        else:
+            chip.video_ram = list(chip.video_ram)
+        if self.video is not None:
+            self.video.release()
+        self._pixels.release()
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _attach(name):
+    # Before 3.13 every attach registers the block with this process's
+    # resource tracker, which unlinks it when the process exits although
+    # the exporter still owns it
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+class FrameReader:
+    def __init__(self, name):
+        self.shm = _attach(name)
+        _, self.frame_size, self.video_size = HEADER.unpack_from(self.shm.buf)
+
+    @property
+    def sequence(self):
+        return struct.unpack_from('<Q', self.shm.buf)[0]
+
+    def pixels(self):
+        # Zero-copy view, compare sequence before and after using it
+        return self.shm.buf[HEADER.size:HEADER.size + self.frame_size]
+
+    def read(self, retries=100):
+        # Returns (sequence, pixels, video RAM or None) copied out of a
+        # frame that was not being written meanwhile.
+        buf = self.shm.buf
+        start = HEADER.size
+        end = start + self.frame_size
+        for _ in range(retries):
+            before = self.sequence
+            if before & 1:
+                time.sleep(0)
+                continue
+            pixels = bytes(buf[start:end])
+            video = None
+            if self.video_size:
+                video = bytes(buf[end:end + self.video_size])
+            if self.sequence == before:
+                return before, pixels, video
+        raise TimeoutError('Frame kept changing while reading')
+
+    def close(self):
+        self.shm.close()
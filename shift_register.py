@@ -4,6 +4,11 @@ class ShiftRegister:
         self.high = 0
         self.offset = 0
 
+    def attach(self, bus, offset_port=2, data_port=4, result_port=3):
+        bus.map_write(offset_port, self.set_offset)
+        bus.map_write(data_port, self.write)
+        bus.map_read(result_port, self.get_result)
+
     def set_offset(self, offset):
         self.offset = offset & 0x07
 
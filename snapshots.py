@@ -0,0 +1,67 @@
+from collections import deque
+
+from i8080 import I8080Chip
+
+PAGE_SIZE = 0x400
+
+
+class Snapshot:
+    # The pages are immutable bytes shared with the snapshots before it
+    # for as long as they stay unchanged.
+    __slots__ = ('registers', 'pages')
+
+    def __init__(self, registers, pages):
+        self.registers = registers
+        self.pages = pages
+
+
+class SnapshotRing:
+    # Keeps the last capacity snapshots of a chip. A capture only copies
+    # the RAM pages that differ from the previous snapshot, the ROM pages
+    # are never stored.
+    def __init__(self, chip, capacity=600):
+        self.chip = chip
+        self.snapshots = deque(maxlen=capacity)
+        self.starts = range(I8080Chip.ROM_SIZE, len(chip.ram), PAGE_SIZE)
+        self._pages = [None] * len(self.starts)
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def capture(self):
+        ram = self.chip.ram
+        pages = self._pages
+        for index, start in enumerate(self.starts):
+            page = ram[start:start + PAGE_SIZE]
+            if page != pages[index]:
+                pages[index] = bytes(page)
+        snapshot = Snapshot(self.chip._pack_registers(), tuple(pages))
+        self.snapshots.append(snapshot)
+        return snapshot
+
+    def restore(self, snapshot):
+        # Any snapshot, also one no longer in the ring, can be restored
+        chip = self.chip
+        ram = chip.ram
+        for start, page in zip(self.starts, snapshot.pages):
+            ram[start:start + PAGE_SIZE] = page
+        self._pages = list(snapshot.pages)
+        chip._unpack_registers(snapshot.registers)
+        chip._memory_restored()
+
+    def rewind(self, count=1):
+        # Restores the snapshot count captures back and forgets the newer
+        # ones, count=0 goes back to the latest.
+        if count >= len(self.snapshots):
+            raise IndexError('Not enough snapshots to rewind')
+        for _ in range(count):
+            self.snapshots.pop()
+        snapshot = self.snapshots[-1]
+        self.restore(snapshot)
+        return snapshot
+
+    def stored_bytes(self):
+        # Page bytes held by the ring, shared pages are counted once
+        unique = {id(page): len(page)
+                  for snapshot in self.snapshots for page in snapshot.pages}
+        return sum(unique.values())
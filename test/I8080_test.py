@@ -1,6 +1,23 @@
+import os
+import random
+import subprocess
+import sys
 import unittest
 
-from i8080 import I8080Chip
+from batch import Scenario, run_batch
+from block_core import BlockTranslator
+from i8080 import I8080Chip, Z_FLAG, AC_FLAG, P_FLAG, CY_FLAG, np
+from i8080_lazy import LazyI8080Chip
+from i8080_packed import PackedI8080Chip
+from machine import load_rom, run_frame, run_frames, step_cycles
+from memory_map import invaders_memory
+from movie import Movie, Player, Recorder, replay
+from shared_frame import FrameExporter, FrameReader
+from snapshots import SnapshotRing
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+ROM_PATH = os.path.join(ROOT, 'rom', 'invaders')
+
 
 class TestI8080Chip(unittest.TestCase):
     def test_parity(self):
@@ -8,4 +25,559 @@ class TestI8080Chip(unittest.TestCase):
         self.assertTrue(I8080Chip.parity(0b1010))
         self.assertFalse(I8080Chip.parity(0b100))
         self.assertFalse(I8080Chip.parity(0b010))
-        self.assertFalse(I8080Chip.parity(0b001))
\ No newline at end of file
+        self.assertFalse(I8080Chip.parity(0b001))
+
+    def test_sub_flags(self):
+        chip = I8080Chip(bytearray(0x10000))
+        chip.a = 0x01
+        chip.b = 0x02
+        chip.i0x90()
+        self.assertEqual(chip.a, 0xff)
+        self.assertTrue(chip.CY)
+        self.assertTrue(chip.S)
+        self.assertFalse(chip.Z)
+        self.assertTrue(chip.P)
+        chip.i0x3c()
+        self.assertEqual(chip.a, 0x00)
+        self.assertTrue(chip.Z)
+        self.assertTrue(chip.CY)
+
+    def test_packed_flags(self):
+        chip = PackedI8080Chip(bytearray(0x10000))
+        chip.sp = 0x2400
+        chip.a = 0x80
+        chip.b = 0x80
+        chip.i0x80()
+        self.assertEqual(chip.flags, Z_FLAG | P_FLAG | CY_FLAG)
+        self.assertTrue(chip.Z)
+        self.assertTrue(chip.CY)
+        chip.i0xf5()
+        chip.CY = False
+        self.assertEqual(chip.flags, Z_FLAG | P_FLAG)
+        chip.i0xf1()
+        self.assertEqual(chip.flags, Z_FLAG | P_FLAG | CY_FLAG)
+
+    def test_run_matches_step_run(self):
+        chips = [I8080Chip(load_rom(ROM_PATH)) for _ in range(2)]
+        stepped, fast = chips
+        for index in (1, 2) * 20:
+            cycle = 0
+            while cycle < 16666:
+                cycle += stepped.step_run()
+            self.assertEqual(fast.run(16666), cycle)
+            stepped.trigger_interrupt(index)
+            fast.trigger_interrupt(index)
+        self.assertEqual(fast.ram, stepped.ram)
+        self.assertEqual(fast.pc, stepped.pc)
+        self.assertEqual(fast._pack_flags(), stepped._pack_flags())
+        self.assertEqual(fast.count, stepped.count)
+
+    def test_run_blocks_matches_step_run(self):
+        chips = [I8080Chip(load_rom(ROM_PATH)) for _ in range(2)]
+        stepped, blocks = chips
+        for i in range(3000):
+            spent = blocks.run_blocks(1)
+            cycle = 0
+            while cycle < spent:
+                cycle += stepped.step_run()
+            self.assertEqual(cycle, spent)
+            if i % 100 == 99:
+                stepped.trigger_interrupt(i // 100 % 2 + 1)
+                blocks.trigger_interrupt(i // 100 % 2 + 1)
+        self.assertEqual(blocks.ram, stepped.ram)
+        self.assertEqual(blocks.pc, stepped.pc)
+        self.assertEqual(blocks.sp, stepped.sp)
+        self.assertEqual(blocks._pack_flags(), stepped._pack_flags())
+        self.assertEqual(blocks.count, stepped.count)
+
+    def test_frames_match_across_engines(self):
+        # Events fire on the same instruction whatever the engine
+        start = 0x04
+        inputs = ((60, 8 | I8080Chip.COIN_KEY), (70, 8), (200, 8 | start),
+                  (210, 8), (260, 8 | I8080Chip.SHOOT_KEY), (300, 8))
+        chips = []
+        for engine in ('run', 'blocks'):
+            chip = I8080Chip(load_rom(ROM_PATH))
+            run_frames(chip, 360, inputs, engine)
+            chips.append(chip)
+        fast, blocks = chips
+        self.assertEqual(blocks.ram, fast.ram)
+        self.assertEqual(blocks.cycles, fast.cycles)
+        self.assertEqual(blocks.count, fast.count)
+
+    def test_run_blocks_self_modifying_code(self):
+        program = bytes([
+            0x3e, 0x05,        # MVI A,5
+            0x3c,              # INR A
+            0x32, 0x01, 0x00,  # STA 0x0001
+            0xc3, 0x00, 0x00,  # JMP 0x0000
+        ])
+        memory = bytearray(0x10000)
+        memory[:len(program)] = program
+        chip = I8080Chip(memory)
+        # One pass through the loop per call
+        cycles = sum(chip.CYCLES[opcode]
+                     for opcode in (0x3e, 0x3c, 0x32, 0xc3))
+        for _ in range(10):
+            self.assertEqual(chip.run_blocks(cycles), cycles)
+        self.assertEqual(chip.ram[1], 15)
+        self.assertEqual(chip.a, 15)
+
+    def test_run_blocks_sees_writes_from_other_engines(self):
+        memory = bytearray(0x10000)
+        memory[0x0000:0x0006] = bytes([
+            0x3e, 0x22,        # MVI A,22
+            0x32, 0x01, 0x01,  # STA 0x0101
+            0x76,              # HLT
+        ])
+        memory[0x0008] = 0x76                               # HLT
+        memory[0x0100:0x0103] = bytes([0x3e, 0x11, 0x76])  # MVI A,11; HLT
+        chip = I8080Chip(memory)
+        chip.pc = 0x0100
+        chip.run_blocks(100)
+        self.assertEqual(chip.a, 0x11)
+        block = chip._translator.blocks[0x0100]
+        chip.count = 0
+        chip.pc = 0x0100
+        chip.halted = False
+        chip.run_blocks(100)
+        self.assertIs(chip._translator.blocks[0x0100], block)
+
+        # A store stepped outside the translated code
+        chip.pc = 0x0000
+        chip.halted = False
+        chip.step_run()
+        chip.step_run()
+        chip.pc = 0x0100
+        chip.a = 0
+        chip.run_blocks(100)
+        self.assertEqual(chip.a, 0x22)
+
+        # The interrupt pushes pc 0x333e over the block
+        chip.pc = 0x333e
+        chip.sp = 0x0102
+        chip.halted = False
+        chip.interrupt_enable = True
+        chip.trigger_interrupt(1)
+        chip.run_blocks(100)
+        chip.pc = 0x0100
+        chip.halted = False
+        chip.run_blocks(100)
+        self.assertEqual(chip.a, 0x33)
+
+        # Written from outside any engine
+        chip.ram[0x0101] = 0x44
+        chip.code_stale = True
+        chip.pc = 0x0100
+        chip.halted = False
+        chip.run_blocks(100)
+        self.assertEqual(chip.a, 0x44)
+
+    def test_profiling(self):
+        program = bytes([
+            0x06, 0x03,        # MVI B,3
+            0x05,              # DCR B
+            0xc2, 0x02, 0x00,  # JNZ 0x0002
+            0xc8,              # RZ
+        ])
+        memory = bytearray(0x10000)
+        memory[:len(program)] = program
+        chip = I8080Chip(memory)
+        chip.enable_profiling()
+        cycles = sum(chip.step_run() for _ in range(8))
+        self.assertEqual(cycles, 7 + 3 * (5 + 10) + 11)
+        profile = chip.profile
+        self.assertEqual(sum(profile.counts), chip.count)
+        self.assertEqual(profile.counts[0x05], 3)
+        self.assertEqual(profile.taken[0xc2], 2)
+        self.assertEqual(profile.not_taken[0xc2], 1)
+        self.assertEqual(profile.taken[0xc8], 1)
+        chip.disable_profiling()
+        self.assertEqual(chip.opcode_handlers[0xc2].__func__,
+                         I8080Chip.i0xc2)
+        chip.pc = 0
+        chip.step_run()
+        self.assertEqual(sum(profile.counts), 8)
+
+    def test_address_profiling(self):
+        program = bytes([
+            0x3a, 0x00, 0x20,  # LDA 0x2000
+            0x32, 0x01, 0x20,  # STA 0x2001
+            0xc3, 0x00, 0x00,  # JMP 0x0000
+        ])
+        memory = bytearray(0x10000)
+        memory[:len(program)] = program
+        chip = I8080Chip(memory)
+        chip.enable_profiling(addresses=True)
+        for _ in range(9):
+            chip.step_run()
+        profile = chip.address_profile
+        self.assertEqual(profile.executed[0x0000], 3)
+        self.assertEqual(profile.executed[0x0006], 3)
+        self.assertEqual(profile.reads[0x2000], 3)
+        self.assertEqual(profile.writes[0x2001], 3)
+        chip.disable_profiling()
+        self.assertIs(chip.ram, memory)
+        listing = profile.listing(memory, 0, len(program))
+        self.assertEqual(listing[0].split()[:3], ['0000', 'LDA', '$2000'])
+
+        # A second session goes on counting everything, a session without
+        # addresses counts nothing
+        chip.enable_profiling(addresses=True)
+        for _ in range(3):
+            chip.step_run()
+        self.assertEqual(profile.executed[0x0000], 4)
+        self.assertEqual(profile.reads[0x2000], 4)
+        self.assertEqual(profile.writes[0x2001], 4)
+        chip.disable_profiling()
+        chip.enable_profiling()
+        for _ in range(3):
+            chip.step_run()
+        self.assertIs(chip.ram, memory)
+        self.assertEqual(profile.executed[0x0000], 4)
+
+    def test_address_profiling_keeps_blocks_in_sync(self):
+        chips = [I8080Chip(invaders_memory(ROM_PATH)) for _ in range(2)]
+        for chip in chips:
+            run_frames(chip, 30)
+        profiled, plain = chips
+        memory = profiled.ram
+        profiled.enable_profiling(addresses=True)
+        for chip in chips:
+            run_frames(chip, 30)
+        profiled.disable_profiling()
+        self.assertIs(profiled.ram, memory)
+        self.assertEqual(profiled.ram, plain.ram)
+        self.assertEqual(sum(profiled.address_profile.writes), 810)
+
+    def test_save_state_round_trip(self):
+        chips = [I8080Chip(load_rom(ROM_PATH)) for _ in range(2)]
+        chip, restored = chips
+        for index in (1, 2) * 30:
+            chip.run(16666)
+            chip.trigger_interrupt(index)
+        chip.key_down(I8080Chip.COIN_KEY)
+        for compress in (True, False):
+            state = chip.save_state(compress)
+            restored.load_state(state)
+            self.assertEqual(restored.save_state(compress), state)
+        for index in (1, 2) * 30:
+            chip.run(16666)
+            chip.trigger_interrupt(index)
+            restored.run(16666)
+            restored.trigger_interrupt(index)
+        self.assertEqual(restored.ram, chip.ram)
+        with self.assertRaises(ValueError):
+            restored.load_state(b'X' * len(state))
+        before = restored.save_state(False)
+        chip.run(16666)
+        compressed = chip.save_state(True)
+        for bad in (compressed[:40], compressed[:-1],
+                    compressed[:-8] + bytes(8), chip.save_state(False)[:-1]):
+            with self.assertRaises(ValueError):
+                restored.load_state(bad)
+            self.assertEqual(restored.save_state(False), before)
+
+    def test_save_state_wraps_sp(self):
+        # The handlers leave sp unmasked, PUSH at 0 takes it to -2
+        memory = bytearray(0x10000)
+        memory[0] = 0xc5  # PUSH B
+        chip = I8080Chip(memory)
+        chip.b, chip.c = 0x12, 0x34
+        chip.step_run()
+        SnapshotRing(chip).capture()
+        restored = I8080Chip(bytearray(0x10000))
+        restored.load_state(chip.save_state(ram_only=False))
+        self.assertEqual(restored.sp, 0xfffe)
+        self.assertEqual(restored.ram[0xfffe:], b'\x34\x12')
+
+    def test_snapshot_ring_rewind(self):
+        chip = I8080Chip(load_rom(ROM_PATH))
+        ring = SnapshotRing(chip, capacity=4)
+        states = []
+        for index in (1, 2) * 5:
+            chip.run(16666)
+            chip.trigger_interrupt(index)
+            ring.capture()
+            states.append(chip.save_state(ram_only=False))
+        self.assertEqual(len(ring), 4)
+        first = ring.snapshots[0]
+        self.assertIs(first.pages[-1], ring.snapshots[-1].pages[-1])
+        ring.rewind(2)
+        self.assertEqual(chip.save_state(ram_only=False), states[-3])
+        self.assertEqual(len(ring), 2)
+        ring.restore(first)
+        self.assertEqual(chip.save_state(ram_only=False), states[-4])
+        with self.assertRaises(IndexError):
+            ring.rewind(2)
+
+    def test_batch_matches_direct_run(self):
+        inputs = ((10, 9), (15, 8))
+        chip = I8080Chip(load_rom(ROM_PATH))
+        run_frames(chip, 30)
+        state = chip.save_state()
+        run_frames(chip, 30, inputs)
+        scenarios = [
+            Scenario('boot', ROM_PATH, 60),
+            Scenario('coin', ROM_PATH, 30, inputs, state),
+        ]
+        results = {result['name']: result
+                   for result in run_batch(scenarios, workers=2)}
+        self.assertEqual(results['coin']['video_ram'],
+                         bytes(chip.ram[0x2400:0x4000]))
+        self.assertEqual(results['coin']['pc'], chip.pc)
+        self.assertNotEqual(results['boot']['ram_md5'],
+                            results['coin']['ram_md5'])
+
+    def test_shared_frame(self):
+        chip = I8080Chip(load_rom(ROM_PATH))
+        exporter = FrameExporter(chip, video=True)
+        reader = FrameReader(exporter.name)
+        try:
+            run_frames(chip, 120)
+            self.assertEqual(exporter.publish(), 2)
+            sequence, pixels, video = reader.read()
+            self.assertEqual(sequence, 2)
+            self.assertEqual(video, bytes(chip.ram[0x2400:0x4000]))
+            fresh = I8080Chip(bytearray(chip.ram))
+            fresh.convert()
+            self.assertEqual(list(pixels),
+                             [int(pixel) for pixel in fresh.video_ram])
+            self.assertTrue(any(pixels))
+        finally:
+            reader.close()
+            exporter.close()
+        self.assertEqual(list(chip.video_ram), list(fresh.video_ram))
+
+    def test_shared_frame_other_process(self):
+        chip = I8080Chip(load_rom(ROM_PATH))
+        exporter = FrameExporter(chip)
+        run_frames(chip, 60)
+        exporter.publish()
+        code = ('import sys\n'
+                'from shared_frame import FrameReader\n'
+                'reader = FrameReader(sys.argv[1])\n'
+                'print(reader.read()[0])\n'
+                'reader.close()\n')
+        try:
+            # The reader exiting must leave the block to the exporter
+            result = subprocess.run(
+                [sys.executable, '-c', code, exporter.name], cwd=ROOT,
+                capture_output=True, text=True, check=True)
+            self.assertEqual(result.stdout.strip(), '2')
+            self.assertEqual(result.stderr, '')
+            reader = FrameReader(exporter.name)
+            self.assertEqual(reader.read()[0], 2)
+            reader.close()
+        finally:
+            exporter.close()
+
+    def test_movie_replay_is_exact(self):
+        for engine in ('run', 'blocks'):
+            chip = I8080Chip(load_rom(ROM_PATH))
+            run_frames(chip, 20)
+            recorder = Recorder(chip, from_state=True, engine=engine)
+            for frame in range(60):
+                if frame == 10:
+                    chip.key_down(I8080Chip.COIN_KEY)
+                if frame == 14:
+                    chip.key_up(I8080Chip.COIN_KEY)
+                recorder.sample()
+                run_frame(chip, engine)
+            movie = Movie.from_bytes(recorder.movie.to_bytes())
+            self.assertEqual(movie.frames, 60)
+            self.assertEqual(movie.inputs, [(0, 8), (10, 9), (14, 8)])
+            self.assertEqual(movie.engine, engine)
+            self.assertFalse(movie.mapped)
+            self.assertEqual(replay(movie, ROM_PATH).ram, chip.ram)
+        with self.assertRaises(ValueError):
+            Player(I8080Chip(invaders_memory(ROM_PATH)), movie)
+
+    def test_memory_map(self):
+        memory = invaders_memory(ROM_PATH)
+        self.assertEqual(memory, load_rom(ROM_PATH)[:0x2000] +
+                         bytes(0x10000 - 0x2000))
+        chip = I8080Chip(memory)
+        chip.a = 0x5a
+        chip.high, chip.low = 0x00, 0x10
+        chip.i0x77()  # MOV M,A into the ROM
+        self.assertEqual(memory[0x0010], load_rom(ROM_PATH)[0x0010])
+        chip.low = 0x00
+        chip.high = 0x63
+        chip.i0x77()  # MOV M,A into a mirror of 0x2300
+        self.assertEqual(memory[0x2300], 0x5a)
+        self.assertEqual(memory[0xe300], 0x5a)
+        chip.sp = 0
+        chip.b, chip.c = 0x12, 0x34
+        chip.i0xc5()  # PUSH B wraps to 0xfffe
+        self.assertEqual(memory[0x3ffe], chip.c)
+        self.assertEqual(memory[0x3fff], chip.b)
+
+    def test_port_bus(self):
+        chip = I8080Chip(bytearray(0x10000))
+        chip.ram[:6] = bytes([
+            0xd3, 0x04,  # OUT 4
+            0xd3, 0x05,  # OUT 5
+            0xdb, 0x07,  # IN 7
+        ])
+        chip.a = 0xa5
+        chip.step_run()
+        self.assertEqual(chip.shift_register.high, 0xa5)
+        chip.step_run()
+        self.assertEqual(chip.sound_latches[1].value, 0xa5)
+        chip.ports.map_read(7, lambda: 0x42)
+        chip.step_run()
+        self.assertEqual(chip.a, 0x42)
+
+    def test_halt_waits_for_interrupt(self):
+        program = bytes([
+            0xfb,              # EI
+            0x76,              # HLT
+            0x3c,              # INR A
+            0xc3, 0x01, 0x00,  # JMP 0x0001
+        ])
+        isr = bytes([0x04, 0xfb, 0xc9])  # INR B, EI, RET at 0x0008
+        for run in (step_cycles, I8080Chip.run, I8080Chip.run_blocks):
+            memory = bytearray(0x10000)
+            memory[:len(program)] = program
+            memory[0x08:0x08 + len(isr)] = isr
+            chip = I8080Chip(memory)
+            chip.sp = 0x2400
+            self.assertEqual(run(chip, 1000), 1000)
+            self.assertTrue(chip.halted)
+            self.assertEqual(chip.pc, 2)
+            self.assertEqual(run(chip, 1000), 1000)
+            for _ in range(3):
+                chip.trigger_interrupt(1)
+                run(chip, 1000)
+            self.assertTrue(chip.halted)
+            self.assertEqual((chip.a, chip.b), (3, 3))
+            state = chip.save_state(ram_only=False)
+            chip.halted = False
+            chip.load_state(state)
+            self.assertTrue(chip.halted)
+
+    def test_scheduler_carries_overshoot(self):
+        chip = I8080Chip(load_rom(ROM_PATH))
+        fired = []
+        chip.scheduler.schedule(
+            1000, lambda at: fired.append((at, chip.cycles)))
+        chip.scheduler.schedule(
+            10, lambda at: fired.append((at, chip.cycles)))
+        chip.scheduler.run_until(2000, I8080Chip.run)
+        self.assertEqual([at for at, _ in fired], [10, 1000])
+        for at, cycles in fired:
+            self.assertTrue(at <= cycles < at + 18)
+        self.assertTrue(2000 <= chip.cycles < 2018)
+
+        for _ in range(60):
+            run_frame(chip, 'run')
+        self.assertTrue(2000000 <= chip.cycles < 2000018)
+        state = chip.save_state()
+        chip.cycles = 0
+        chip.load_state(state)
+        self.assertTrue(2000000 <= chip.cycles < 2000018)
+
+    def test_idle_skip_is_exact(self):
+        chips = []
+        for idle_skip in (True, False):
+            chip = I8080Chip(load_rom(ROM_PATH))
+            chip._translator = BlockTranslator(chip)
+            chip._translator.idle_skip = idle_skip
+            run_frames(chip, 300)
+            chips.append(chip)
+        skipped, looped = chips
+        self.assertEqual(skipped.ram, looped.ram)
+        self.assertEqual(skipped.cycles, looped.cycles)
+        self.assertEqual(skipped.count, looped.count)
+        source = skipped._translator.block_source(
+            skipped.ram, [(0x0ada, 0x3a), (0x0add, 0xa7), (0x0ade, 0xc2)],
+            0x0ae1)
+        self.assertIn('skip', source)
+
+    def test_fused_sequences_stop_at_budget(self):
+        program = bytes([
+            0x11, 0x00, 0x01,              # LXI D,0x0100
+            0x21, 0x00, 0x24,              # LXI H,0x2400
+            0x06, 0x40,                    # MVI B,0x40
+            0x1a, 0x77, 0x23, 0x13, 0x05,  # LDAX D; MOV M,A; INX H; INX D
+            0xc2, 0x08, 0x00,              # DCR B; JNZ 0x0008
+            0xc3, 0x00, 0x00,              # JMP 0x0000
+        ])
+        chips = []
+        for _ in range(2):
+            memory = bytearray(0x10000)
+            memory[:len(program)] = program
+            memory[0x100:0x140] = bytes(range(0x40))
+            chips.append(I8080Chip(memory))
+        stepped, fused = chips
+        budgets = random.Random(8080)
+        for _ in range(200):
+            budget = budgets.randrange(1, 120)
+            self.assertEqual(step_cycles(stepped, budget),
+                             I8080Chip.run(fused, budget))
+            self.assertEqual((stepped.pc, stepped.count),
+                             (fused.pc, fused.count))
+        self.assertEqual(stepped.ram, fused.ram)
+
+    def test_lazy_flags_match_plain(self):
+        rng = random.Random(8080)
+        opcodes = list(range(0x80, 0xc0)) + [0x04, 0x05, 0x0c, 0x0d, 0x27]
+        plain = I8080Chip(bytearray(0x10000))
+        lazy = LazyI8080Chip(bytearray(0x10000))
+        for _ in range(2000):
+            opcode = rng.choice(opcodes)
+            for reg in ('a', 'b', 'c', 'd', 'e', 'high', 'low'):
+                val = rng.randrange(0x100)
+                setattr(plain, reg, val)
+                setattr(lazy, reg, val)
+            getattr(plain, f'i0x{opcode:02x}')()
+            getattr(lazy, f'i0x{opcode:02x}')()
+            self.assertEqual(lazy.a, plain.a)
+            self.assertEqual(lazy._pack_flags(), plain._pack_flags())
+
+    def test_daa_table_matches_all_chips(self):
+        chips = [cls(bytearray(0x10000))
+                 for cls in (I8080Chip, PackedI8080Chip, LazyI8080Chip)]
+        for a in range(0x100):
+            for psw in (0, CY_FLAG, AC_FLAG, AC_FLAG | CY_FLAG):
+                results = set()
+                for chip in chips:
+                    chip.a = a
+                    chip._unpack_flags(psw)
+                    chip.i0x27()
+                    results.add((chip.a, chip._pack_flags()))
+                self.assertEqual(len(results), 1)
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_convert_numpy_matches_bits(self):
+        rng = random.Random(0x2400)
+        memory = bytearray(0x10000)
+        for i in range(0x2400, 0x4000):
+            memory[i] = rng.randrange(0x100)
+        chip = I8080Chip(memory)
+        frame = chip.convert()
+        self.assertEqual(frame.shape, (256, 224))
+        expected = list(chip.video_ram)
+        chip._convert_bits(chip.ram[0x2400:0x4000], 0, 224)
+        self.assertEqual(list(chip.video_ram), expected)
+
+    def test_convert_dirty_columns(self):
+        rng = random.Random(0x3fff)
+        memory = bytearray(0x10000)
+        for i in range(0x2400, 0x4000):
+            memory[i] = rng.randrange(0x100)
+        chip = I8080Chip(memory)
+        chip.convert()
+        self.assertEqual(chip.dirty_rects, [(0, 0, 224, 256)])
+        chip.convert()
+        self.assertEqual(chip.dirty_rects, [])
+        memory[0x2400 + 5 * 32 + 7] ^= 0xff
+        memory[0x2400 + 6 * 32] ^= 0x01
+        memory[0x2400 + 100 * 32 + 31] ^= 0x80
+        chip.convert()
+        self.assertEqual(chip.dirty_rects,
+                         [(5, 0, 2, 256), (100, 0, 1, 256)])
+        fresh = I8080Chip(bytearray(memory))
+        fresh.convert()
+        self.assertEqual(list(chip.video_ram), list(fresh.video_ram))